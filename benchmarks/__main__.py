@@ -0,0 +1,69 @@
+"""Runs the benchmarks, saves the results and compares them with the saved ones.
+
+    python -m benchmarks --save .benchmarks/0.6.4.json --allow-skips
+    python -m benchmarks --compare .benchmarks/0.6.4.json --tolerance 0.25
+
+Exits with 1 when a benchmark got slower than the baseline by more than the tolerance or fails
+to run. Benchmarks failing with the baseline version are skipped only with --allow-skips.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import pkgutil
+import sys
+from pathlib import Path
+
+from benchmarks.runner import compare, load, run, save
+
+
+def _import_benchmarks(allow_skips: bool) -> None:
+    for module in pkgutil.iter_modules([str(Path(__file__).parent)], prefix="benchmarks."):
+        if not module.name.startswith("benchmarks.bench_"):
+            continue
+        try:
+            importlib.import_module(module.name)
+        except ImportError as error:
+            if not allow_skips:
+                raise
+            # benchmarks of features missing in the baseline version
+            print(f"{module.name}: skipped ({error!r})", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("-k", dest="pattern", help="runs only benchmarks with the substring")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats (best is taken)")
+    parser.add_argument("--save", help="file the results are saved to")
+    parser.add_argument("--compare", help="file with the baseline results")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio")
+    parser.add_argument(
+        "--allow-skips", action="store_true", help="skips failing benchmarks (of the baseline)"
+    )
+    args = parser.parse_args(argv)
+
+    _import_benchmarks(args.allow_skips)
+    results = run(args.pattern, args.repeat, args.allow_skips)
+    if args.save:
+        save(results, args.save)
+    if not args.compare:
+        return 0
+    baseline = load(args.compare)
+    if args.pattern:
+        baseline["results"] = {
+            name: result for name, result in baseline["results"].items() if args.pattern in name
+        }
+    lines, regressions = compare(baseline, results, args.tolerance)
+    print("\n".join(lines))
+    if regressions:
+        print(
+            f"Slower by over {args.tolerance:.0%} or missing: {', '.join(regressions)}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Authentication and authorization - JWT decoding and policy checks."""
+
+from __future__ import annotations
+
+import json
+import time
+
+from benchmarks.runner import Timed, benchmark
+from lbz.authz.authorizer import Authorizer
+from lbz.jwt_utils import decode_jwt
+from tests.fixtures.rsa_pair import SAMPLE_PRIVATE_KEY, SAMPLE_PUBLIC_KEY
+
+AUDIENCES = [f"audience-{idx}" for idx in range(5)]
+# the matching key and audience are the last ones - the worst case of the lookups
+PUBLIC_KEYS = [{**SAMPLE_PUBLIC_KEY, "kid": f"key-{idx}"} for idx in range(4)] + [
+    SAMPLE_PUBLIC_KEY
+]
+
+
+@benchmark(
+    "jwt.decode[5 keys, 5 audiences]",
+    env={
+        "ALLOWED_PUBLIC_KEYS": json.dumps({"keys": PUBLIC_KEYS}),
+        "ALLOWED_AUDIENCES": ",".join(AUDIENCES),
+        "ALLOWED_ISS": "benchmarks",
+    },
+)
+def jwt_decode() -> Timed:
+    token = Authorizer.sign_authz(
+        {
+            "allow": {"*": "*"},
+            "deny": {},
+            "aud": AUDIENCES[-1],
+            "iss": "benchmarks",
+            "exp": int(time.time()) + 3600,
+        },
+        SAMPLE_PRIVATE_KEY,
+    )
+    return lambda: decode_jwt(token)
+
+
+@benchmark("authz.check_access[1000 resources]")
+def authz_check_access() -> Timed:
+    policy = {
+        "allow": {
+            f"resource-{idx}": {
+                f"permission-{perm}": {"allow": {"ids": ["self"]}} for perm in range(20)
+            }
+            for idx in range(1000)
+        },
+        "deny": {f"resource-{idx}": {"permission-0": {"ids": ["x"]}} for idx in range(1000)},
+    }
+
+    def check() -> None:
+        Authorizer(None, "resource-999", "permission-19", policy).check_access()
+
+    return check
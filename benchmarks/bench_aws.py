@@ -0,0 +1,55 @@
+"""Preparing the calls to AWS - sending events and invoking lambdas (with stubbed clients)."""
+
+from __future__ import annotations
+
+import io
+import json
+from collections.abc import Iterator
+from typing import Any
+
+from benchmarks.runner import Timed, benchmark
+from lbz.aws_boto3 import client
+from lbz.events.api import EventAPI
+from lbz.events.event import Event
+from lbz.lambdas.client import LambdaClient
+
+
+class StubEventBridge:
+    def put_events(self, **_: Any) -> dict:
+        return {"FailedEntryCount": 0, "Entries": []}
+
+
+class StubLambda:
+    RESPONSE = json.dumps({"result": "OK", "data": {"ok": True}}).encode("utf-8")
+
+    def invoke(self, **_: Any) -> dict:
+        return {"StatusCode": 200, "Payload": io.BytesIO(self.RESPONSE)}
+
+
+@benchmark("event_api.send[95 events]", env={"EVENTS_BUS_NAME": "benchmarks-bus"})
+def event_api_send() -> Iterator[Timed]:
+    client.set_client("eventbridge", StubEventBridge())
+    event_api = EventAPI()
+    events = [
+        Event({"id": idx, "name": f"item-{idx}"}, event_type="ItemCreated") for idx in range(95)
+    ]
+
+    def send() -> None:
+        for event in events:
+            event_api.register(event)
+        event_api.send()
+        event_api.clear()
+
+    yield send
+    client.set_client("eventbridge", None)
+    event_api._del()  # type: ignore # pylint: disable=protected-access
+
+
+@benchmark("lambda_client.invoke[large payload]")
+def lambda_client_invoke() -> Iterator[Timed]:
+    client.set_client("lambda_", StubLambda())
+    data = {
+        "items": [{"id": idx, "tags": {"a", "b", "c"}, "price": idx * 1.5} for idx in range(500)]
+    }
+    yield lambda: LambdaClient.invoke("benchmarks", "update", data)
+    client.set_client("lambda_", None)
@@ -0,0 +1,46 @@
+"""Cold imports, measured in fresh interpreters with -X importtime."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from collections.abc import Callable
+
+from benchmarks.runner import benchmark
+
+
+def _import_time(module: str) -> Callable[[], float]:
+    # the bytecode is cached by the first run whatever the environment says, not to compare
+    # the compilation of the sources of both versions
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+
+    def measure() -> float:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=60,
+            env=env,
+        )
+        cumulative_us = next(
+            line.split("|")[1]
+            for line in result.stderr.splitlines()
+            if line.split("|")[-1].strip() == module
+        )
+        return int(cumulative_us) / 1_000_000
+
+    return measure
+
+
+# importing the package itself imports nothing, importing boto3 and jose eagerly used to take
+# ~190 ms for lbz.resource
+@benchmark("import[lbz]", measures=True, budget=0.005)
+def import_lbz() -> Callable[[], float]:
+    return _import_time("lbz")
+
+
+@benchmark("import[lbz.resource]", measures=True, budget=0.150)
+def import_lbz_resource() -> Callable[[], float]:
+    return _import_time("lbz.resource")
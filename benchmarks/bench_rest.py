@@ -0,0 +1,137 @@
+"""Request handling hot paths - resources, requests, responses and CORS."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.runner import Timed, benchmark
+from lbz.request import Request
+from lbz.resource import CORSResource, Resource
+from lbz.response import Response
+from lbz.rest import APIGatewayEvent
+from lbz.router import add_route
+
+SMALL_PAYLOAD = {"id": 1, "name": "item", "tags": ["a", "b"]}
+LARGE_PAYLOAD = {
+    "items": [
+        {"id": idx, "name": f"item-{idx}", "price": idx * 1.5, "tags": ["a", "b", "c"]}
+        for idx in range(1000)
+    ]
+}
+
+
+def _endpoint(idx: int) -> Callable:
+    def endpoint(_: Resource, item_id: str) -> Response:
+        return Response({**SMALL_PAYLOAD, "id": item_id})
+
+    endpoint.__name__ = f"endpoint_{idx}"
+    route: Callable = add_route(f"/items_{idx}/{{item_id}}", method="GET")(endpoint)
+    return route
+
+
+def _resource_with_routes(count: int) -> type[Resource]:
+    endpoints = {f"endpoint_{idx}": _endpoint(idx) for idx in range(count)}
+    return type(f"Resource{count}", (Resource,), endpoints)
+
+
+def _dispatch(count: int) -> Timed:
+    resource_cls = _resource_with_routes(count)
+    event = APIGatewayEvent(
+        method="GET",
+        resource_path=f"/items_{count - 1}/{{item_id}}",
+        path_params={"item_id": "42"},
+        headers={"Content-Type": "application/json", "Accept": "application/json"},
+    )
+
+    def dispatch() -> Response:
+        return resource_cls(event)()
+
+    return dispatch
+
+
+@benchmark("resource.dispatch[10 routes]")
+def resource_dispatch_10() -> Timed:
+    return _dispatch(10)
+
+
+@benchmark("resource.dispatch[500 routes]")
+def resource_dispatch_500() -> Timed:
+    return _dispatch(500)
+
+
+def _json_body(payload: dict) -> Timed:
+    # imported here as the baseline version may be older than Headers, skipping the benchmark
+    from lbz.request import Headers  # pylint: disable=import-outside-toplevel
+
+    body = json.dumps(payload)
+    headers = Headers({"Content-Type": "application/json"})
+
+    def parse() -> Any:
+        return Request(headers, {}, "POST", body, {}, {}, False).json_body
+
+    return parse
+
+
+@benchmark("request.json_body[small]")
+def request_json_body_small() -> Timed:
+    return _json_body(SMALL_PAYLOAD)
+
+
+@benchmark("request.json_body[large]")
+def request_json_body_large() -> Timed:
+    return _json_body(LARGE_PAYLOAD)
+
+
+@benchmark("response.to_dict[small]")
+def response_to_dict_small() -> Timed:
+    return Response(SMALL_PAYLOAD).to_dict
+
+
+@benchmark("response.to_dict[large]")
+def response_to_dict_large() -> Timed:
+    return Response(LARGE_PAYLOAD).to_dict
+
+
+@benchmark("cors.dispatch[50 origins]")
+def cors_origin_matching() -> Timed:
+    origins = [f"https://app-{idx}.*.example.com" for idx in range(50)]
+
+    class Items(CORSResource):
+        @add_route("/items")
+        def list_items(self) -> Response:
+            return Response(SMALL_PAYLOAD)
+
+    event = APIGatewayEvent(
+        method="GET",
+        resource_path="/items",
+        headers={"Origin": "https://app-49.eu.example.com"},
+    )
+
+    def dispatch() -> Response:
+        return Items(event, ["GET"], origins=origins)()
+
+    return dispatch
+
+
+@benchmark("request.headers[43 headers, missing lookups]")
+def request_headers_lookups() -> Timed:
+    # imported here as the baseline version may be older than Headers, skipping the benchmark
+    from lbz.request import Headers  # pylint: disable=import-outside-toplevel
+
+    # requests behind CloudFront carry dozens of headers, the framework looks up a few absent ones
+    event_headers = {f"X-Custom-Header-{idx}": str(idx) for idx in range(40)}
+    event_headers.update({"Host": "api.example.com", "origin": "https://example.com"})
+    event_headers["Content-Type"] = "application/json"
+
+    def lookup() -> tuple:
+        headers = Headers(event_headers)
+        return (
+            headers.get("Authentication"),
+            headers.get("X-Amzn-Trace-Id"),
+            headers.get("Origin"),
+            headers.get("Content-Type"),
+        )
+
+    return lookup
@@ -0,0 +1,206 @@
+"""Registry, runner and comparison of the benchmarks.
+
+A benchmark prepares everything up front and returns (or yields, to clean up afterwards)
+the callable to be timed. Benchmarks marked with measures=True return their own duration,
+e.g. taken from a subprocess. A budget (in seconds) fails the comparison when exceeded,
+whatever the baseline is.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from lbz import _cfg  # pylint: disable=import-private-name
+from lbz.configuration import ConfigValue
+from lbz.router import Router
+
+Timed = Callable[[], Any]
+Setup = Callable[[], "Timed | Iterator[Timed]"]
+
+VERSION_FILE = Path(__file__).parent.parent / "version"
+# Environment every benchmark runs with, extended by the env of the benchmark
+BASE_ENV = {
+    "AWS_DEFAULT_REGION": "us-west-2",
+    "AWS_LAMBDA_FUNCTION_NAME": "benchmarks",
+    "LOGGING_LEVEL": "WARNING",
+}
+
+
+class Benchmark:
+    __slots__ = ("name", "setup", "env", "measures", "budget")
+
+    def __init__(
+        self,
+        name: str,
+        setup: Setup,
+        env: Mapping[str, str],
+        measures: bool = False,
+        budget: float | None = None,
+    ) -> None:
+        self.name = name
+        self.setup = setup
+        self.env = env
+        self.measures = measures
+        self.budget = budget
+
+    def __repr__(self) -> str:
+        return f"<Benchmark {self.name}>"
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str,
+    *,
+    env: Mapping[str, str] | None = None,
+    measures: bool = False,
+    budget: float | None = None,
+) -> Callable[[Setup], Setup]:
+    """Registers the setup of a benchmark under the name."""
+
+    def register(setup: Setup) -> Setup:
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name} is already registered")
+        BENCHMARKS[name] = Benchmark(name, setup, env or {}, measures, budget)
+        return setup
+
+    return register
+
+
+def _reset_configuration() -> None:
+    for value in vars(_cfg).values():
+        if isinstance(value, ConfigValue):
+            value.reset()
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        from lbz.configuration import config_cache
+    except ImportError:
+        # the baseline version may be older than the cache
+        return
+    config_cache.invalidate()
+
+
+@contextmanager
+def prepared(bench: Benchmark) -> Iterator[Timed]:
+    """Runs the setup of the benchmark in its environment and cleans up afterwards."""
+    with patch.dict(os.environ, {**BASE_ENV, **bench.env}):
+        _reset_configuration()
+        Router().clear()
+        try:
+            if isinstance(prepared_callable := bench.setup(), Iterator):
+                # the rest of the generator is the teardown
+                teardown, timed = prepared_callable, next(prepared_callable, None)
+                if timed is None:
+                    raise RuntimeError(f"{bench.name} has not yielded the callable to time")
+                try:
+                    yield timed
+                finally:
+                    next(teardown, None)
+            else:
+                yield prepared_callable
+        finally:
+            Router().clear()
+            _reset_configuration()
+
+
+def run_benchmark(bench: Benchmark, repeat: int = 5) -> dict[str, float]:
+    """Returns the best and the median time of one call (in seconds) out of the repeats."""
+    with prepared(bench) as timed:
+        if bench.measures:
+            durations = [float(timed()) for _ in range(repeat)]
+            number = 1
+        else:
+            timer = timeit.Timer(timed)
+            number, _ = timer.autorange()
+            durations = [total / number for total in timer.repeat(repeat, number)]
+    result = {"min": min(durations), "median": statistics.median(durations), "number": number}
+    if bench.budget is not None:
+        result["budget"] = bench.budget
+    return result
+
+
+def run(pattern: str | None = None, repeat: int = 5, allow_skips: bool = False) -> dict[str, Any]:
+    """Runs the benchmarks with the pattern in their names, a failing one fails the run.
+
+    Failing benchmarks are left out of the results with allow_skips - meant for the baseline
+    version, which may lack the features of newer benchmarks.
+    """
+    results = {}
+    for name, bench in sorted(BENCHMARKS.items()):
+        if pattern and pattern not in name:
+            continue
+        try:
+            results[name] = run_benchmark(bench, repeat)
+        except Exception as error:  # pylint: disable=broad-except
+            if not allow_skips:
+                raise
+            print(f"{name}: skipped ({error!r})", file=sys.stderr)
+            continue
+        print(f"{name}: {format_duration(results[name]['min'])}", file=sys.stderr)
+    return {
+        "lbz": VERSION_FILE.read_text("utf-8").strip() if VERSION_FILE.exists() else None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Mapping[str, Any], current: Mapping[str, Any], tolerance: float
+) -> tuple[list[str], list[str]]:
+    """Returns the report lines and the names of the benchmarks slower by over the tolerance.
+
+    Benchmarks over their budget or missing from the current results (e.g. broken since
+    the baseline) count as regressions as well.
+    """
+    lines = [f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>8}"]
+    regressions = []
+    for name in sorted({**baseline["results"], **current["results"]}):
+        base = baseline["results"].get(name)
+        if (result := current["results"].get(name)) is None:
+            regressions.append(name)
+            lines.append(f"{name:<40} {format_duration(base['min']):>12} {'-':>12} MISSING")
+            continue
+        change = f"{result['min'] / base['min'] - 1:>+8.1%}" if base else f"{'new':>8}"
+        mark = ""
+        if base and result["min"] / base["min"] - 1 > tolerance:
+            mark = " REGRESSION"
+        if result.get("budget") is not None and result["min"] > result["budget"]:
+            mark = f" OVER BUDGET {format_duration(result['budget'])}"
+        if mark:
+            regressions.append(name)
+        lines.append(
+            f"{name:<40} {format_duration(base['min']) if base else '-':>12} "
+            f"{format_duration(result['min']):>12} {change}{mark}"
+        )
+    return lines, regressions
+
+
+def format_duration(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def load(path: str | Path) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        results: dict[str, Any] = json.load(file)
+    return results
+
+
+def save(results: Mapping[str, Any], path: str | Path) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
@@ -0,0 +1,30 @@
+# Nothing is imported here - not even lbz._lazy - to keep importing lbz itself cheap
+
+# typing.TYPE_CHECKING without importing typing, recognized by the type checkers by its name
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pylint: disable=consider-using-assignment-expr
+    from typing import Any
+
+    from lbz.prewarm import warmup
+    from lbz.resource import CORSResource, EventAwareResource, PaginatedCORSResource, Resource
+    from lbz.response import Response
+    from lbz.router import add_route
+
+_EXPORTS = {
+    "CORSResource": "lbz.resource",
+    "EventAwareResource": "lbz.resource",
+    "PaginatedCORSResource": "lbz.resource",
+    "Resource": "lbz.resource",
+    "Response": "lbz.response",
+    "add_route": "lbz.router",
+    "warmup": "lbz.prewarm",
+}
+
+
+def __getattr__(name: "str") -> "Any":
+    """Imports the exported names from their modules on demand, as lbz._lazy.lazy_exports."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(_EXPORTS[name], fromlist=[name]), name)
+    globals()[name] = value
+    return value
@@ -1,14 +1,32 @@
-from lbz.configuration import ConfigParser, EnvValue
+from lbz.configuration import ConfigParser, ConfigValue, EnvValue, config_registry
 
 # LBZ configuration
 LBZ_DEBUG_MODE = EnvValue("LBZ_DEBUG_MODE", default=False, parser=ConfigParser.cast_to_bool)
 LOGGING_LEVEL = EnvValue("LOGGING_LEVEL", default="INFO")
 CORS_HEADERS = EnvValue[list[str]]("CORS_HEADERS", default=[], parser=ConfigParser.split_by_comma)
 CORS_ORIGIN = EnvValue[list[str]]("CORS_ORIGIN", default=[], parser=ConfigParser.split_by_comma)
+PAGINATION_CURSOR_SECRET = EnvValue[str]("PAGINATION_CURSOR_SECRET")
+# Seconds kept at the end of the invocation for sending events and logs
+DEADLINE_RESERVED_TIME = EnvValue("DEADLINE_RESERVED_TIME", default=0.5, parser=float)
 
 # AWS related configuration
 AWS_LAMBDA_FUNCTION_NAME = EnvValue[str]("AWS_LAMBDA_FUNCTION_NAME")
 EVENTS_BUS_NAME = EnvValue[str]("EVENTS_BUS_NAME")
+APPCONFIG_EXTENSION_URL = EnvValue("APPCONFIG_EXTENSION_URL", default="http://localhost:2772")
+
+# Boto3 clients configuration (defaults mirror the botocore ones)
+BOTO3_MAX_POOL_CONNECTIONS = EnvValue[int]("BOTO3_MAX_POOL_CONNECTIONS", default=10, parser=int)
+BOTO3_CONNECT_TIMEOUT = EnvValue[float]("BOTO3_CONNECT_TIMEOUT", default=60.0, parser=float)
+BOTO3_READ_TIMEOUT = EnvValue[float]("BOTO3_READ_TIMEOUT", default=60.0, parser=float)
+BOTO3_TCP_KEEPALIVE = EnvValue[bool](
+    "BOTO3_TCP_KEEPALIVE", default=False, parser=ConfigParser.cast_to_bool
+)
+# Empty values leave retries to botocore (and its AWS_RETRY_MODE/AWS_MAX_ATTEMPTS variables)
+BOTO3_RETRY_MODE = EnvValue[str]("BOTO3_RETRY_MODE", default="")
+BOTO3_MAX_ATTEMPTS = EnvValue[int]("BOTO3_MAX_ATTEMPTS", default=0, parser=int)
+BOTO3_ENDPOINT_URLS = EnvValue[dict[str, str]](
+    "BOTO3_ENDPOINT_URLS", default={}, parser=ConfigParser.split_to_dict
+)
 
 # Authorization configuration
 ALLOWED_PUBLIC_KEYS = EnvValue[list[dict]](
@@ -19,3 +37,8 @@ ALLOWED_ISS = EnvValue("ALLOWED_ISS", default="")
 AUTH_REMOVE_PREFIXES = EnvValue(
     "AUTH_REMOVE_PREFIXES", default=False, parser=ConfigParser.cast_to_bool
 )
+
+# optional settings of lbz itself are read on use, they are not resolved with the application's
+config_registry.mark_internal(
+    value for value in list(globals().values()) if isinstance(value, ConfigValue)
+)
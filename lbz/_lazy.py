@@ -0,0 +1,27 @@
+"""Lazy exports of the packages, free of imports to keep importing lbz itself cheap."""
+
+import sys
+
+# typing.TYPE_CHECKING without importing typing, recognized by the type checkers by its name
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pylint: disable=consider-using-assignment-expr
+    from collections.abc import Callable, Mapping
+    from typing import Any
+
+
+def lazy_exports(package: "str", exports: "Mapping[str, str]") -> "Callable[[str], Any]":
+    """Creates module level __getattr__ importing exported names from their modules on demand.
+
+    Usage:
+        __getattr__ = lazy_exports(__name__, {"Resource": "lbz.resource"})
+    """
+
+    def __getattr__(name: "str") -> "Any":
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        __import__(exports[name])
+        value = getattr(sys.modules[exports[name]], name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
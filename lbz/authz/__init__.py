@@ -1,3 +1,18 @@
-from lbz.authz.authorizer import Authorizer
-from lbz.authz.decorators import authorization
-from lbz.authz.utils import check_permission, has_permission
+from typing import TYPE_CHECKING
+
+from lbz._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from lbz.authz.authorizer import Authorizer
+    from lbz.authz.decorators import authorization
+    from lbz.authz.utils import check_permission, has_permission
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "Authorizer": "lbz.authz.authorizer",
+        "authorization": "lbz.authz.decorators",
+        "check_permission": "lbz.authz.utils",
+        "has_permission": "lbz.authz.utils",
+    },
+)
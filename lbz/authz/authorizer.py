@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from jose import jwt
+from typing import TYPE_CHECKING
 
 from lbz.exceptions import PermissionDenied
 from lbz.jwt_utils import decode_jwt
-from lbz.misc import deep_update, get_logger
+from lbz.misc import LazyModule, deep_update, get_logger
+
+if TYPE_CHECKING:
+    from jose import jwt
+else:
+    jwt = LazyModule("jose.jwt")
 
 logger = get_logger(__name__)
 
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from functools import partial
+from http import HTTPStatus
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+from lbz._cfg import APPCONFIG_EXTENSION_URL
+from lbz.configuration import AppConfigValue, config_cache
+from lbz.snapshot import snapshot_hooks
+
+REQUEST_TIMEOUT = 5
+
+
+class AppConfig:
+    """Client of the AWS AppConfig Lambda extension (or a local stand-in serving the same API).
+
+    https://docs.aws.amazon.com/appconfig/latest/userguide/appconfig-integration-lambda-extensions.html
+    """
+
+    @staticmethod
+    def get_configuration(application: str, environment: str, profile: str) -> str | None:
+        url = (
+            f"{APPCONFIG_EXTENSION_URL.value.rstrip('/')}/applications/{quote(application)}"
+            f"/environments/{quote(environment)}/configurations/{quote(profile)}"
+        )
+        try:
+            with urlopen(url, timeout=REQUEST_TIMEOUT) as response:  # nosec B310
+                content: bytes = response.read()
+        except HTTPError as error:
+            if error.code == HTTPStatus.NOT_FOUND:
+                return None
+            raise
+        return content.decode("utf-8")
+
+
+# the configuration may have been deployed again while the snapshot was kept
+snapshot_hooks.register_after_restore(partial(config_cache.invalidate, AppConfigValue.source))
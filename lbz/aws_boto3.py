@@ -1,61 +1,192 @@
+from __future__ import annotations
+
+import math
 from functools import cached_property
 from os import getenv
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, TypeVar
 
-import boto3
+from lbz._cfg import (
+    BOTO3_CONNECT_TIMEOUT,
+    BOTO3_ENDPOINT_URLS,
+    BOTO3_MAX_ATTEMPTS,
+    BOTO3_MAX_POOL_CONNECTIONS,
+    BOTO3_READ_TIMEOUT,
+    BOTO3_RETRY_MODE,
+    BOTO3_TCP_KEEPALIVE,
+)
+from lbz.exceptions import DeadlineExceeded
+from lbz.misc import LazyModule
+from lbz.snapshot import snapshot_hooks
 
 if TYPE_CHECKING:
+    import boto3
+    from botocore import config as botocore_config
     from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
     from mypy_boto3_dynamodb import DynamoDBClient
     from mypy_boto3_events import EventBridgeClient
     from mypy_boto3_lambda import LambdaClient
     from mypy_boto3_s3 import S3Client
+    from mypy_boto3_secretsmanager import SecretsManagerClient
     from mypy_boto3_sns import SNSClient
     from mypy_boto3_sqs import SQSClient
     from mypy_boto3_ssm import SSMClient
 else:
+    # Importing boto3 takes hundreds of milliseconds, so it is deferred until the first client
+    boto3 = LazyModule("boto3")
+    botocore_config = LazyModule("botocore.config")
+
     CognitoIdentityProviderClient = object
     EventBridgeClient = object
     LambdaClient = object
     S3Client = object
+    SecretsManagerClient = object
     SNSClient = object
     SSMClient = object
     SQSClient = object
     DynamoDBClient = object
 
 
+BoundedClient = TypeVar("BoundedClient", bound="Boto3Client")
+# Shortest read timeout of the bounded clients, calls with less time left are not even started
+MIN_BOUNDED_TIMEOUT = 0.125
+
+
 class Boto3Client:
+    """Lazily created boto3 clients sharing one configuration.
+
+    The configuration comes from the BOTO3_* environment variables, options passed directly
+    (any botocore.config.Config argument, e.g. max_pool_connections) take precedence.
+    """
+
+    def __init__(self, **config_options: Any) -> None:
+        self._config_options = config_options
+        self._bounded_clients: dict[float, Any] = {}
+        self._overrides: dict[str, Any] = {}
+
+    @cached_property
+    def config(self) -> botocore_config.Config:
+        return botocore_config.Config(**self._options())
+
+    def _options(self) -> dict[str, Any]:
+        options: dict[str, Any] = {
+            "max_pool_connections": BOTO3_MAX_POOL_CONNECTIONS.value,
+            "connect_timeout": BOTO3_CONNECT_TIMEOUT.value,
+            "read_timeout": BOTO3_READ_TIMEOUT.value,
+            "tcp_keepalive": BOTO3_TCP_KEEPALIVE.value,
+        }
+        retries: dict[str, Any] = {}
+        if BOTO3_RETRY_MODE.value:
+            retries["mode"] = BOTO3_RETRY_MODE.value
+        if BOTO3_MAX_ATTEMPTS.value:
+            retries["total_max_attempts"] = BOTO3_MAX_ATTEMPTS.value
+        if retries:
+            options["retries"] = retries
+        return {**options, **self._config_options}
+
+    def reset(self) -> None:
+        """Drops the created clients together with their connection pools and the configuration.
+
+        They are created again on the next access.
+        """
+        for cls in type(self).__mro__:
+            for name, attribute in vars(cls).items():
+                if isinstance(attribute, cached_property):
+                    self.__dict__.pop(name, None)
+        self.__dict__.update(self._overrides)
+        self._bounded_clients = {}
+
+    def set_client(self, name: str, service_client: Any) -> None:
+        """Replaces the client (e.g. "lambda_") by the given one, e.g. by a local emulator.
+
+        The bounded clients use it as well, None brings back the boto3 one.
+        """
+        if not isinstance(getattr(type(self), name, None), cached_property):
+            raise ValueError(f"Unknown client: {name}")
+        if service_client is None:
+            self._overrides.pop(name, None)
+            self.__dict__.pop(name, None)
+        else:
+            self._overrides[name] = service_client
+            self.__dict__[name] = service_client
+        self._bounded_clients = {}
+
+    def bounded(self: BoundedClient, timeout: float | None) -> BoundedClient:
+        """Clients whose calls give up within the timeout (seconds left of the invocation).
+
+        The timeout is rounded down to a power of two (fractions of a second included), so only
+        a few clients are ever created. Timeouts under MIN_BOUNDED_TIMEOUT raise DeadlineExceeded
+        right away. Retries are not bounded, every attempt can take up to the returned read
+        timeout.
+        """
+        if timeout is None:
+            return self
+        options = self._options()
+        if timeout >= options["read_timeout"]:
+            return self
+        if timeout < MIN_BOUNDED_TIMEOUT:
+            raise DeadlineExceeded
+        # timeout = mantissa * 2 ** exponent with the mantissa in [0.5, 1)
+        bucket = math.ldexp(0.5, math.frexp(timeout)[1])
+        if (bounded := self._bounded_clients.get(bucket)) is None:
+            bounded = self._bounded_clients[bucket] = type(self)(
+                **{
+                    **self._config_options,
+                    "read_timeout": bucket,
+                    "connect_timeout": min(options["connect_timeout"], bucket),
+                }
+            )
+            for name, service_client in self._overrides.items():
+                bounded.set_client(name, service_client)
+        return bounded
+
+    def endpoint_url(self, service_name: str) -> str | None:
+        if service_name == "dynamodb" and (dynamodb_url := getenv("DYNAMODB_URL")):
+            return dynamodb_url
+        return BOTO3_ENDPOINT_URLS.value.get(service_name)
+
     @cached_property
     def cognito_idp(self) -> CognitoIdentityProviderClient:
-        return boto3.client("cognito-idp")
+        return boto3.client(
+            "cognito-idp", config=self.config, endpoint_url=self.endpoint_url("cognito-idp")
+        )
 
     @cached_property
     def dynamodb(self) -> DynamoDBClient:
-        return boto3.client("dynamodb", endpoint_url=getenv("DYNAMODB_URL"))
+        return boto3.client(
+            "dynamodb", config=self.config, endpoint_url=self.endpoint_url("dynamodb")
+        )
 
     @cached_property
     def eventbridge(self) -> EventBridgeClient:
-        return boto3.client("events")
+        return boto3.client("events", config=self.config, endpoint_url=self.endpoint_url("events"))
 
     @cached_property
     def lambda_(self) -> LambdaClient:
-        return boto3.client("lambda")
+        return boto3.client("lambda", config=self.config, endpoint_url=self.endpoint_url("lambda"))
 
     @cached_property
     def s3(self) -> S3Client:
-        return boto3.client("s3")
+        return boto3.client("s3", config=self.config, endpoint_url=self.endpoint_url("s3"))
+
+    @cached_property
+    def secretsmanager(self) -> SecretsManagerClient:
+        return boto3.client(
+            "secretsmanager", config=self.config, endpoint_url=self.endpoint_url("secretsmanager")
+        )
 
     @cached_property
     def sns(self) -> SNSClient:
-        return boto3.client("sns")
+        return boto3.client("sns", config=self.config, endpoint_url=self.endpoint_url("sns"))
 
     @cached_property
     def ssm(self) -> SSMClient:
-        return boto3.client("ssm")
+        return boto3.client("ssm", config=self.config, endpoint_url=self.endpoint_url("ssm"))
 
     @cached_property
     def sqs(self) -> SQSClient:
-        return boto3.client("sqs")
+        return boto3.client("sqs", config=self.config, endpoint_url=self.endpoint_url("sqs"))
 
 
 client = Boto3Client()
+# connections opened before a snapshot are not usable after restoring it
+snapshot_hooks.register_after_restore(client.reset)
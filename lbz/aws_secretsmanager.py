@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from functools import partial
+
+from lbz.aws_boto3 import client
+from lbz.configuration import SecretsManagerValue, config_cache
+from lbz.snapshot import snapshot_hooks
+
+# https://docs.aws.amazon.com/secretsmanager/latest/apireference/API_BatchGetSecretValue.html
+MAX_SECRETS_TO_GET_AT_ONCE = 20
+
+
+class SecretsManager:
+    @staticmethod
+    def get_secret(secret_id: str) -> str | None:
+        try:
+            return client.secretsmanager.get_secret_value(SecretId=secret_id)["SecretString"]
+        except (KeyError, client.secretsmanager.exceptions.ResourceNotFoundException):
+            return None
+
+    @staticmethod
+    def get_secrets(secret_ids: list[str]) -> dict[str, str]:
+        """Fetches the secrets in batches, the missing ones are left out.
+
+        Secrets are keyed by the requested identifiers (names or ARNs).
+        """
+        secrets = {}
+        requested = set(secret_ids)
+        for idx in range(0, len(secret_ids), MAX_SECRETS_TO_GET_AT_ONCE):
+            batch = secret_ids[idx : idx + MAX_SECRETS_TO_GET_AT_ONCE]
+            response = client.secretsmanager.batch_get_secret_value(SecretIdList=batch)
+            while True:
+                for secret in response["SecretValues"]:
+                    secret_id = secret["Name"] if secret["Name"] in requested else secret["ARN"]
+                    if "SecretString" in secret:
+                        secrets[secret_id] = secret["SecretString"]
+                if not (next_token := response.get("NextToken")):
+                    break
+                response = client.secretsmanager.batch_get_secret_value(
+                    SecretIdList=batch, NextToken=next_token
+                )
+        return secrets
+
+
+# the cached secrets may have been rotated while the snapshot was kept
+snapshot_hooks.register_after_restore(partial(config_cache.invalidate, SecretsManagerValue.source))
@@ -1,12 +1,175 @@
 from __future__ import annotations
 
+import threading
+import time
+import weakref
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
 from lbz.aws_boto3 import client
+from lbz.deadline import io_timeout
+from lbz.misc import get_logger
+from lbz.snapshot import snapshot_hooks
+from lbz.tracing import tracer
+
+if TYPE_CHECKING:
+    from mypy_boto3_ssm import SSMClient
+
+    from lbz.configuration import SSMValue
+
+logger = get_logger(__name__)
+
+# https://docs.aws.amazon.com/systems-manager/latest/APIReference/API_GetParameters.html
+MAX_PARAMETERS_TO_GET_AT_ONCE = 10
+MAX_CONCURRENT_REQUESTS = 5
 
 
 class SSM:
     @staticmethod
     def get_parameter(name: str) -> str | None:
+        ssm = client.bounded(io_timeout()).ssm
+        with tracer.span("ssm.get_parameter", name=name):
+            try:
+                response = ssm.get_parameter(Name=name, WithDecryption=True)
+                return response["Parameter"]["Value"]
+            except (KeyError, ssm.exceptions.ParameterNotFound):
+                return None
+
+    @staticmethod
+    def get_parameters(names: Iterable[str]) -> dict[str, str]:
+        """Fetches the parameters in concurrent batches, the missing ones are left out."""
+        names = list(dict.fromkeys(names))
+        batches = [
+            names[idx : idx + MAX_PARAMETERS_TO_GET_AT_ONCE]
+            for idx in range(0, len(names), MAX_PARAMETERS_TO_GET_AT_ONCE)
+        ]
+        # the deadline is not visible in the worker threads, so the client is picked here
+        get_batch = partial(SSM._get_parameters_batch, client.bounded(io_timeout()).ssm)
+        with tracer.span("ssm.get_parameters", count=len(names)):
+            if len(batches) <= 1:
+                responses = [get_batch(batch) for batch in batches]
+            else:
+                with ThreadPoolExecutor(min(len(batches), MAX_CONCURRENT_REQUESTS)) as executor:
+                    responses = list(executor.map(get_batch, batches))
+        return {name: value for response in responses for name, value in response.items()}
+
+    @staticmethod
+    def get_parameters_by_path(path: str) -> dict[str, str]:
+        """Fetches all the parameters stored under the path (including nested ones)."""
+        paginator = client.bounded(io_timeout()).ssm.get_paginator("get_parameters_by_path")
+        with tracer.span("ssm.get_parameters_by_path", path=path):
+            return {
+                parameter["Name"]: parameter["Value"]
+                for page in paginator.paginate(Path=path, Recursive=True, WithDecryption=True)
+                for parameter in page["Parameters"]
+            }
+
+    @staticmethod
+    def _get_parameters_batch(ssm: SSMClient, names: list[str]) -> dict[str, str]:
+        response = ssm.get_parameters(Names=names, WithDecryption=True)
+        return {parameter["Name"]: parameter["Value"] for parameter in response["Parameters"]}
+
+
+class SSMParameterGroup:
+    """Resolves SSMValues registered in the group together to avoid serial calls to SSM.
+
+    The first value read fetches all the registered values at once (by the path if given).
+    Values with TTL are refreshed in a background thread once they get stale, the stale value
+    is served in the meantime so the request path never waits for SSM.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self._values: weakref.WeakSet[SSMValue] = weakref.WeakSet()
+        self._parameters: dict[str, str | None] = {}
+        self._fetched_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        # held by the thread refreshing the stale values
+        self._refresh_lock = threading.Lock()
+        snapshot_hooks.register_after_restore(self.reset)
+
+    def __repr__(self) -> str:
+        return f"<SSMParameterGroup path={self.path} values={len(self._values)}>"
+
+    def add(self, value: SSMValue) -> None:
+        self._values.add(value)
+
+    def get(self, name: str) -> str | None:
+        if name not in self._parameters:
+            self.prefetch()
+        if name not in self._parameters:
+            self._fetch([name])
+        return self._parameters[name]
+
+    def prefetch(self) -> None:
+        """Fetches all the registered values that were not fetched yet."""
+        with self._lock:
+            names = [value.key for value in self._values if value.key not in self._parameters]
+            if self.path:
+                in_path = [name for name in names if name.startswith(self.path)]
+                self._store(in_path, SSM.get_parameters_by_path(self.path))
+                names = [name for name in names if name not in in_path]
+            if names:
+                self._store(names, SSM.get_parameters(names))
+
+    def is_stale(self, name: str, ttl: float) -> bool:
+        return time.monotonic() - self._fetched_at.get(name, 0.0) > ttl
+
+    def refresh_in_background(self) -> None:
+        """Starts refreshing stale values unless it is already in progress."""
+        if not self._refresh_lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return
         try:
-            return client.ssm.get_parameter(Name=name, WithDecryption=True)["Parameter"]["Value"]
-        except (KeyError, client.ssm.exceptions.ParameterNotFound):
-            return None
+            threading.Thread(target=self._refresh_stale, daemon=True).start()
+        except Exception:
+            self._refresh_lock.release()
+            raise
+
+    def reset(self) -> None:
+        with self._lock:
+            self._parameters = {}
+            self._fetched_at = {}
+        for value in list(self._values):
+            value.reset()
+
+    def _refresh_stale(self) -> None:
+        try:
+            stale_values = [
+                value
+                for value in list(self._values)
+                if value.ttl is not None and self.is_stale(value.key, value.ttl)
+            ]
+            if not stale_values:
+                return
+            fetched = SSM.get_parameters(value.key for value in stale_values)
+            # the values missing in SSM at the moment are kept, they are retried next time
+            with self._lock:
+                self._store([], fetched)
+            for value in stale_values:
+                if value.key in fetched:
+                    value.reset()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Refreshing SSM parameters has failed")
+        finally:
+            self._refresh_lock.release()
+
+    def _fetch(self, names: list[str]) -> None:
+        if names:
+            fetched = SSM.get_parameters(names)
+            with self._lock:
+                self._store(names, fetched)
+
+    def _store(self, names: list[str], fetched: dict[str, str]) -> None:
+        fetched_at = time.monotonic()
+        for name, value in fetched.items():
+            self._parameters[name] = value
+            self._fetched_at[name] = fetched_at
+        for name in names:
+            if name not in fetched:
+                self._parameters[name] = None
+                self._fetched_at[name] = fetched_at
+
+
+ssm_parameters = SSMParameterGroup()
@@ -1,4 +1,5 @@
 from lbz.misc import Singleton
+from lbz.snapshot import snapshot_hooks
 
 
 class AuthzCollector(metaclass=Singleton):
@@ -34,3 +35,4 @@ class AuthzCollector(metaclass=Singleton):
 
 
 authz_collector = AuthzCollector()
+snapshot_hooks.register_before_snapshot(authz_collector.clean)
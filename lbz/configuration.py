@@ -1,17 +1,38 @@
 from __future__ import annotations
 
+import importlib
 import json
+import logging
+import math
+import time
+import weakref
 from abc import ABCMeta, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from functools import partial
 from os import getenv
-from typing import Any, Generic, TypeVar
+from types import MappingProxyType, ModuleType
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, TypeVar
 
-from lbz.aws_ssm import SSM
-from lbz.exceptions import ConfigValueParsingFailed, MissingConfigValue
+from lbz.exceptions import ConfigurationError, ConfigValueParsingFailed, MissingConfigValue
+
+if TYPE_CHECKING:
+    from lbz.aws_ssm import SSMParameterGroup
+
+# lbz.misc.get_logger cannot be used as it depends on the configuration
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
 
+def _aws_module(name: str) -> ModuleType:
+    """Imports the lbz.aws_* module of a remote source when it is used for the first time.
+
+    The AWS modules are configured with the values defined in lbz._cfg, which is built on this
+    module, so they are never imported here by name not to make the modules import each other.
+    """
+    return importlib.import_module(f"lbz.aws_{name}")
+
+
 class ConfigParser:
     @staticmethod
     def split_by_comma(value: str) -> list[str]:
@@ -23,18 +44,96 @@ class ConfigParser:
             return True
         return False
 
+    @staticmethod
+    def split_to_dict(value: str) -> dict[str, str]:
+        """Parses comma-separated key=value pairs."""
+        return dict(pair.split("=", maxsplit=1) for pair in value.split(",") if pair)
+
     @staticmethod
     def load_jwt_keys(value: str) -> list[dict]:
         deserialized_value: dict[str, list[dict]] = json.loads(value)
         return deserialized_value["keys"]
 
 
+class ConfigRegistry:
+    """Keeps track of all created ConfigValues to resolve them together at startup."""
+
+    def __init__(self) -> None:
+        self._values: weakref.WeakSet[ConfigValue] = weakref.WeakSet()
+        self._internal: weakref.WeakSet[ConfigValue] = weakref.WeakSet()
+
+    def __repr__(self) -> str:
+        return f"<ConfigRegistry values={len(self._values)}>"
+
+    def __iter__(self) -> Iterator[ConfigValue]:
+        return iter(list(self._values))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, value: ConfigValue) -> None:
+        self._values.add(value)
+
+    def mark_internal(self, values: Iterable[ConfigValue]) -> None:
+        """Leaves the values out of resolve_all() by default, e.g. optional settings of lbz."""
+        self._internal.update(values)
+
+    def resolve_all(self, values: Iterable[ConfigValue] | None = None) -> Mapping[str, Any]:
+        """Resolves the values (all registered but internal by default) fetching them in bulk.
+
+        Raises ConfigurationError listing every missing or invalid value at once, values of the
+        same source and key resolved differently included. Otherwise returns a read-only mapping
+        of the keys qualified with their sources (e.g. "env:TABLE_NAME") to the resolved values -
+        it is a snapshot, values refreshed later (e.g. after their TTL) are read with .value of
+        the ConfigValue.
+        """
+        if values is None:
+            values = [value for value in self if value not in self._internal]
+        values = list(values)
+        self._prefetch(values)
+        resolved: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+        for value in values:
+            key = value.qualified_key
+            try:
+                resolved_value = value.value
+            except Exception as error:  # pylint: disable=broad-except
+                errors[key] = str(error) or repr(error)
+                continue
+            if key in resolved and resolved[key] != resolved_value:
+                errors[key] = f"{value.key!r} is defined more than once with other values"
+            resolved[key] = resolved_value
+        if errors:
+            raise ConfigurationError(errors)
+        return MappingProxyType(resolved)
+
+    @staticmethod
+    def _prefetch(values: list[ConfigValue]) -> None:
+        values_by_type: dict[type[ConfigValue], list[ConfigValue]] = {}
+        for value in values:
+            values_by_type.setdefault(type(value), []).append(value)
+        for value_type, typed_values in values_by_type.items():
+            try:
+                value_type.prefetch(typed_values)
+            except Exception:  # pylint: disable=broad-except
+                # values left unfetched are read one by one reporting their own errors
+                logger.warning(
+                    "Prefetching %s values has failed", value_type.__name__, exc_info=True
+                )
+
+
+config_registry = ConfigRegistry()
+
+
 class ConfigValue(Generic[T], metaclass=ABCMeta):
     """Mandatory Configuration
 
     This class is not supporting None as outcome value.
     """
 
+    # Name of the source the values are read from, qualifying their keys
+    source: ClassVar[str]
+
     # TODO: There is space for improvement around default str argument
     def __init__(
         self,
@@ -46,11 +145,29 @@ class ConfigValue(Generic[T], metaclass=ABCMeta):
         self._parser = parser
         self._default = default
         self._value: T | None = None
+        config_registry.add(self)
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def qualified_key(self) -> str:
+        """Key prefixed with the source, values of other sources may share the key."""
+        # values of custom sources not naming them are qualified with their class
+        return f"{getattr(self, 'source', type(self).__name__)}:{self._key}"
 
     @abstractmethod
     def getter(self) -> Any:
         pass
 
+    @classmethod
+    def prefetch(cls, values: Sequence[ConfigValue]) -> None:
+        """Fetches the given values of this type in bulk before they are read one by one.
+
+        Sources supporting bulk reads override it, others read each value on its own.
+        """
+
     @property
     def value(self) -> T:
         if self._value is None:
@@ -74,10 +191,208 @@ class ConfigValue(Generic[T], metaclass=ABCMeta):
 
 
 class EnvValue(ConfigValue[T]):
+    source = "env"
+
     def getter(self) -> str | None:
         return getenv(self._key)
 
 
 class SSMValue(ConfigValue[T]):
+    """Configuration stored in SSM Parameter Store.
+
+    Values are fetched together with the rest of their group (by default the shared
+    lbz.aws_ssm.ssm_parameters one). With TTL (in seconds) given, stale values are refreshed
+    in the background while the last known value is still returned.
+    """
+
+    source = "ssm"
+
+    def __init__(
+        self,
+        key: str,
+        parser: Callable[[Any], T] = str,  # type: ignore
+        default: T | None = None,
+        *,
+        ttl: float | None = None,
+        group: SSMParameterGroup | None = None,
+    ):
+        super().__init__(key, parser, default)
+        self.ttl = ttl
+        self.group = group or _aws_module("ssm").ssm_parameters
+        self.group.add(self)
+
+    @classmethod
+    def prefetch(cls, values: Sequence[ConfigValue]) -> None:
+        groups = {id(value.group): value.group for value in values if isinstance(value, SSMValue)}
+        for group in groups.values():
+            group.prefetch()
+
+    @property
+    def value(self) -> T:
+        if (
+            self._value is not None
+            and self.ttl is not None
+            and self.group.is_stale(self._key, self.ttl)
+        ):
+            self.group.refresh_in_background()
+        return super().value
+
     def getter(self) -> str | None:
-        return SSM.get_parameter(self._key)
+        return self.group.get(self._key)
+
+
+class CacheEntry:
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: Any, expires_at: float) -> None:
+        self.value = value
+        self.expires_at = expires_at
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ConfigCache:
+    """TTL cache shared by remote configuration sources, collecting statistics per source.
+
+    Values reading the same item (e.g. different keys of one JSON secret) share one fetch.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, str], CacheEntry] = {}
+        self.stats: dict[str, dict[str, int]] = {}
+
+    def __repr__(self) -> str:
+        return f"<ConfigCache entries={len(self._entries)} stats={self.stats}>"
+
+    def get(
+        self, source: str, key: str, fetch: Callable[[], Any], ttl: float | None = None
+    ) -> CacheEntry:
+        stats = self.stats.setdefault(source, {"hits": 0, "misses": 0, "errors": 0})
+        if (entry := self.current(source, key)) is not None:
+            stats["hits"] += 1
+            return entry
+        stats["misses"] += 1
+        try:
+            value = fetch()
+        except Exception:
+            stats["errors"] += 1
+            raise
+        return self.put(source, key, value, ttl)
+
+    def put(self, source: str, key: str, value: Any, ttl: float | None = None) -> CacheEntry:
+        expires_at = math.inf if ttl is None else time.monotonic() + ttl
+        entry = self._entries[(source, key)] = CacheEntry(value, expires_at)
+        return entry
+
+    def current(self, source: str, key: str) -> CacheEntry | None:
+        """Returns the entry unless it is missing or expired."""
+        entry = self._entries.get((source, key))
+        return entry if entry is not None and entry.is_fresh() else None
+
+    def invalidate(self, source: str | None = None) -> None:
+        self._entries = {
+            entry_key: entry
+            for entry_key, entry in self._entries.items()
+            if source is not None and entry_key[0] != source
+        }
+
+    def reset_stats(self) -> None:
+        self.stats = {}
+
+
+config_cache = ConfigCache()
+
+
+class CachedConfigValue(ConfigValue[T]):
+    """Configuration fetched through the shared ConfigCache.
+
+    The value is parsed again once the cache entry it came from expires or gets replaced.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        parser: Callable[[Any], T] = str,  # type: ignore
+        default: T | None = None,
+        *,
+        json_key: str | None = None,
+        ttl: float | None = None,
+    ):
+        super().__init__(key if json_key is None else f"{key}:{json_key}", parser, default)
+        self.cache_key = key
+        self._json_key = json_key
+        self.ttl = ttl
+        self._entry: CacheEntry | None = None
+
+    @classmethod
+    @abstractmethod
+    def fetch(cls, key: str) -> str | None:
+        """Fetches the raw value from the source."""
+
+    @classmethod
+    def fetch_many(cls, keys: list[str]) -> dict[str, str | None]:
+        return {key: cls.fetch(key) for key in keys}
+
+    @classmethod
+    def prefetch(cls, values: Sequence[ConfigValue]) -> None:
+        # items shared by values with different TTLs are cached for the shortest one
+        ttls: dict[str, float] = {}
+        for value in values:
+            if isinstance(value, CachedConfigValue):
+                ttl = math.inf if value.ttl is None else value.ttl
+                ttls[value.cache_key] = min(ttl, ttls.get(value.cache_key, ttl))
+        if missing := [key for key in ttls if config_cache.current(cls.source, key) is None]:
+            for key, raw_value in cls.fetch_many(missing).items():
+                config_cache.put(cls.source, key, raw_value, ttls[key])
+
+    @property
+    def value(self) -> T:
+        if self._value is not None and self._entry is not config_cache.current(
+            self.source, self.cache_key
+        ):
+            self.reset()
+        return super().value
+
+    def getter(self) -> Any:
+        self._entry = config_cache.get(
+            self.source, self.cache_key, partial(self.fetch, self.cache_key), self.ttl
+        )
+        if self._json_key is None or self._entry.value is None:
+            return self._entry.value
+        return json.loads(self._entry.value).get(self._json_key)
+
+
+class SecretsManagerValue(CachedConfigValue[T]):
+    """Secret stored in AWS Secrets Manager, json_key extracts one field of a JSON secret."""
+
+    source = "secretsmanager"
+
+    @classmethod
+    def fetch(cls, key: str) -> str | None:
+        secret: str | None = _aws_module("secretsmanager").SecretsManager.get_secret(key)
+        return secret
+
+    @classmethod
+    def fetch_many(cls, keys: list[str]) -> dict[str, str | None]:
+        secrets = _aws_module("secretsmanager").SecretsManager.get_secrets(keys)
+        return {key: secrets.get(key) for key in keys}
+
+
+class AppConfigValue(CachedConfigValue[T]):
+    """Configuration profile served by the AWS AppConfig Lambda extension.
+
+    Usage:
+        FLAGS = AppConfigValue("my-app/prod/flags", parser=json.loads, ttl=60)
+        LIMIT = AppConfigValue("my-app/prod/settings", parser=int, json_key="limit", ttl=60)
+    """
+
+    source = "appconfig"
+
+    @classmethod
+    def fetch(cls, key: str) -> str | None:
+        application, environment, profile = key.split("/", maxsplit=2)
+        configuration: str | None = _aws_module("appconfig").AppConfig.get_configuration(
+            application, environment, profile
+        )
+        return configuration
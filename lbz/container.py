@@ -0,0 +1,98 @@
+"""Statistics of the Lambda execution environment (container) the function runs in.
+
+They tell cold starts from warm ones and show how well the per-container caches work,
+e.g. to tune provisioned concurrency. Resource and BaseHandler count the invocations,
+the statistics are added to the request metrics and returned by the LambdaBroker
+CONTAINER_STATS_OP operation.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from lbz.configuration import config_cache
+from lbz.misc import Singleton
+from lbz.snapshot import snapshot_hooks
+
+CacheStatsProvider = Callable[[], Mapping[str, int]]
+
+
+def get_max_memory() -> float | None:
+    """Peak memory used by the process so far in megabytes."""
+    if sys.platform == "win32":
+        return None
+    import resource  # pylint: disable=import-outside-toplevel  # not available on Windows
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in kilobytes on Linux and in bytes on macOS
+    return max_rss / 1024**2 if sys.platform == "darwin" else max_rss / 1024
+
+
+class ContainerStats(metaclass=Singleton):
+    """Counts the invocations handled by the container since its initialization."""
+
+    def __init__(self) -> None:
+        # created when the handler module is loaded, so (roughly) at the start of the Lambda init
+        self._initialized_at = time.monotonic()
+        self.invocations = 0
+        self.cold_start = False
+        self.init_duration: float | None = None
+        self._cache_stats: dict[str, CacheStatsProvider] = {}
+
+    def __repr__(self) -> str:
+        return f"<ContainerStats invocations={self.invocations} uptime={self.uptime:.0f}s>"
+
+    @property
+    def uptime(self) -> float:
+        """Seconds since the container was initialized."""
+        return time.monotonic() - self._initialized_at
+
+    def start_invocation(self) -> bool:
+        """Counts the invocation and returns whether it is the first one (a cold start)."""
+        if self.invocations == 0:
+            self.init_duration = (time.monotonic() - self._initialized_at) * 1000
+        self.invocations += 1
+        self.cold_start = self.invocations == 1
+        return self.cold_start
+
+    def reset(self) -> None:
+        """Starts counting from scratch as in a freshly initialized container."""
+        self._initialized_at = time.monotonic()
+        self.invocations = 0
+        self.cold_start = False
+        self.init_duration = None
+
+    def register_cache(self, name: str, provider: CacheStatsProvider) -> None:
+        """Adds the hits and misses returned by the provider to the statistics."""
+        self._cache_stats[name] = provider
+
+    def cache_stats(self) -> dict[str, dict[str, float]]:
+        """Counters and hit ratios of the registered caches and of the config cache sources."""
+        counters: dict[str, Mapping[str, int]] = {
+            f"config.{source}": stats for source, stats in config_cache.stats.items()
+        }
+        counters.update((name, provider()) for name, provider in self._cache_stats.items())
+        return {name: self._with_hit_ratio(stats) for name, stats in counters.items()}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "invocations": self.invocations,
+            "cold_start": self.cold_start,
+            "init_duration": self.init_duration,
+            "uptime": self.uptime,
+            "max_memory": get_max_memory(),
+            "caches": self.cache_stats(),
+        }
+
+    @staticmethod
+    def _with_hit_ratio(stats: Mapping[str, int]) -> dict[str, float]:
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        return {**stats, "hit_ratio": stats.get("hits", 0) / lookups if lookups else 0.0}
+
+
+container_stats = ContainerStats()
+# a container restored from a snapshot is a new one, its next invocation is a cold start
+snapshot_hooks.register_after_restore(container_stats.reset)
@@ -0,0 +1,122 @@
+"""Time budget of the Lambda invocation respected by the I/O done by lbz.
+
+The deadline comes from LambdaContext.get_remaining_time_in_millis and ends DEADLINE_RESERVED_TIME
+before Lambda stops the invocation, the reserved time is left for sending events and logs.
+Calls made past the deadline fail fast with DeadlineExceeded (503 / SERVER_ERROR) instead of
+letting the invocation time out with no response. BaseHandler sets it automatically,
+functions handling API Gateway events with Resource can be decorated:
+
+    @deadline_aware
+    def handle(event, context):
+        return MyResource(event)()
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import TypeVar
+
+from lbz._cfg import DEADLINE_RESERVED_TIME
+from lbz.exceptions import DeadlineExceeded
+from lbz.type_defs import LambdaContext
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """Monotonic point in time the invocation has to be completed by."""
+
+    __slots__ = ("expires_at", "reserved")
+
+    def __init__(self, remaining: float, reserved: float | None = None) -> None:
+        self.expires_at = time.monotonic() + remaining
+        self.reserved = DEADLINE_RESERVED_TIME.value if reserved is None else reserved
+
+    def __repr__(self) -> str:
+        return f"<Deadline remaining={self.remaining:.3f}s reserved={self.reserved}s>"
+
+    @classmethod
+    def from_context(cls, context: LambdaContext | None) -> Deadline | None:
+        try:
+            remaining_ms = context.get_remaining_time_in_millis()  # type: ignore[union-attr]
+        except (AttributeError, NotImplementedError):
+            return None
+        if not isinstance(remaining_ms, (int, float)):
+            return None
+        return cls(remaining_ms / 1000)
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left until Lambda stops the invocation."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def available(self) -> float:
+        """Seconds left for the work before the reserved time."""
+        return max(self.remaining - self.reserved, 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.available <= 0
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceeded
+
+    def timeout(self, *, use_reserve: bool = False) -> float:
+        """Seconds a call may take, the reserved time is used only by the final flushes."""
+        if (budget := self.remaining if use_reserve else self.available) <= 0:
+            raise DeadlineExceeded
+        return budget
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar("lbz_deadline", default=None)
+
+
+def get_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+def set_deadline(deadline: Deadline | None) -> Token[Deadline | None]:
+    """Sets the deadline of the invocation, the returned token restores the previous one."""
+    return _current_deadline.set(deadline)
+
+
+def reset_deadline(token: Token[Deadline | None]) -> None:
+    _current_deadline.reset(token)
+
+
+def check_deadline() -> None:
+    """Raises DeadlineExceeded if the invocation has no time left for more work."""
+    if (deadline := _current_deadline.get()) is not None:
+        deadline.check()
+
+
+def deadline_expired() -> bool:
+    return (deadline := _current_deadline.get()) is not None and deadline.expired
+
+
+def io_timeout(*, use_reserve: bool = False) -> float | None:
+    """Seconds an I/O call may take, None when no deadline is set."""
+    if (deadline := _current_deadline.get()) is None:
+        return None
+    return deadline.timeout(use_reserve=use_reserve)
+
+
+def deadline_aware(
+    handler: Callable[[dict, LambdaContext], T],
+) -> Callable[[dict, LambdaContext], T]:
+    """Sets the deadline of the invocation for the time the handler runs."""
+
+    @wraps(handler)
+    def wrapped(event: dict, context: LambdaContext) -> T:
+        token = set_deadline(Deadline.from_context(context))
+        try:
+            return handler(event, context)
+        finally:
+            reset_deadline(token)
+
+    return wrapped
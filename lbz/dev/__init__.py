@@ -1,2 +1,22 @@
-from lbz.dev.server import MyDevServer, MyLambdaDevHandler
-from lbz.dev.test import Client
+from typing import TYPE_CHECKING
+
+from lbz._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from lbz.dev.emulator import LambdaEmulator
+    from lbz.dev.load import LoadTest
+    from lbz.dev.replay import Replayer
+    from lbz.dev.server import MyDevServer, MyLambdaDevHandler
+    from lbz.dev.test import Client
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "LambdaEmulator": "lbz.dev.emulator",
+        "LoadTest": "lbz.dev.load",
+        "Replayer": "lbz.dev.replay",
+        "MyDevServer": "lbz.dev.server",
+        "MyLambdaDevHandler": "lbz.dev.server",
+        "Client": "lbz.dev.test",
+    },
+)
@@ -0,0 +1,368 @@
+"""Local emulator of Lambda and EventBridge running several lbz functions in one process.
+
+Invocations made with LambdaClient and events sent with EventAPI are routed to the functions
+hosted by the emulator instead of AWS while it is installed:
+
+    emulator = LambdaEmulator()
+    emulator.add_function("orders", orders.handle)
+    emulator.add_function("emails", emails.handle)
+    emulator.add_rule("emails", {"source": ["orders"], "detail-type": ["OrderPlaced"]})
+    with emulator:
+        LambdaClient.invoke("orders", "place_order", {"id": 1})
+        emulator.drain()  # waits until the events and async invocations are handled
+    print(emulator.stats())
+
+The functions share the lbz singletons (EventAPI, Router, configuration) as they run in one
+process, so invocations are run one at a time - nested synchronous invocations run inline.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import json
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from lbz.aws_boto3 import Boto3Client, client
+from lbz.metrics import summarize
+from lbz.misc import get_logger
+from lbz.type_defs import LambdaClientContext, LambdaContext
+
+logger = get_logger(__name__)
+
+LambdaHandler = Callable[[dict, LambdaContext], Any]
+
+ACCOUNT_ID = "123456789012"
+REGION = "local"
+DEFAULT_BUS_NAME = "default"  # used when the entry does not name the bus
+
+
+class LocalClientContext(LambdaClientContext):
+    """Client context passed by the caller of an emulated synchronous invocation."""
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        self.custom = data.get("custom") or {}
+        self.env = data.get("env") or {}
+
+
+class LocalLambdaContext(LambdaContext):
+    """Context of an emulated invocation, its remaining time is counted from its start."""
+
+    def __init__(
+        self, function: LocalFunction, client_context: LocalClientContext | None = None
+    ) -> None:
+        self.function_name = function.name
+        self.function_version = "$LATEST"
+        self.invoked_function_arn = function.arn
+        self.memory_limit_in_mb = function.memory_size
+        self.aws_request_id = str(uuid.uuid4())
+        self.log_group_name = f"/aws/lambda/{function.name}"
+        self.log_stream_name = f"local/{self.aws_request_id}"
+        self.client_context = client_context  # type: ignore[assignment]
+        self._deadline = time.monotonic() + function.timeout
+
+    def get_remaining_time_in_millis(  # type: ignore[override]  # pylint: disable=arguments-differ
+        self,
+    ) -> int:
+        return max(int((self._deadline - time.monotonic()) * 1000), 0)
+
+
+class LocalFunction:
+    """Function hosted by the emulator together with the statistics of its invocations."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: LambdaHandler,
+        *,
+        timeout: float = 3.0,
+        memory_size: int = 128,
+        async_retries: int = 2,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.timeout = timeout
+        self.memory_size = memory_size
+        self.async_retries = async_retries
+        self.arn = f"arn:aws:lambda:{REGION}:{ACCOUNT_ID}:function:{name}"
+        self.durations: list[float] = []
+        self.errors = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<LocalFunction {self.name} invocations={len(self.durations)}>"
+
+    def run(self, event: dict, client_context: LocalClientContext | None = None) -> Any:
+        """Calls the handler as Lambda would, errors are counted and raised."""
+        started = time.perf_counter()
+        try:
+            return self.handler(event, LocalLambdaContext(self, client_context))
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            with self._lock:
+                self.durations.append(duration * 1000)
+                # Lambda would have stopped the invocation, here it is only reported
+                if duration > self.timeout:
+                    self.timeouts += 1
+                    logger.warning("%s has run %.3fs over its timeout", self.name, duration)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            durations = list(self.durations)
+            errors, timeouts = self.errors, self.timeouts
+        return {
+            "invocations": len(durations),
+            "errors": errors,
+            "timeouts": timeouts,
+            "duration": summarize(durations) if durations else {},
+        }
+
+
+class EventRule:
+    """EventBridge rule delivering the events matching the pattern to a function.
+
+    Only the exact matching of values is supported, e.g.
+    {"source": ["orders"], "detail": {"status": ["PLACED", "PAID"]}}.
+    """
+
+    def __init__(
+        self, function_name: str, pattern: Mapping[str, Any], bus_name: str | None = None
+    ) -> None:
+        self.function_name = function_name
+        self.pattern = pattern
+        self.bus_name = bus_name
+
+    def __repr__(self) -> str:
+        return f"<EventRule {self.bus_name} -> {self.function_name} {self.pattern}>"
+
+    def matches(self, bus_name: str, event: Mapping[str, Any]) -> bool:
+        return self.bus_name in (None, bus_name) and self._matches(self.pattern, event)
+
+    @classmethod
+    def _matches(cls, pattern: Mapping[str, Any], event: Mapping[str, Any]) -> bool:
+        return all(
+            key in event and cls._matches_value(expected, event[key])
+            for key, expected in pattern.items()
+        )
+
+    @classmethod
+    def _matches_value(cls, expected: Any, value: Any) -> bool:
+        if isinstance(expected, Mapping):
+            return isinstance(value, Mapping) and cls._matches(expected, value)
+        if isinstance(value, list):
+            return any(item in expected for item in value)
+        return value in expected
+
+
+class LambdaEmulator:
+    """Hosts lbz functions and routes Lambda invocations and EventBridge events to them."""
+
+    def __init__(self, async_workers: int = 1) -> None:
+        self.functions: dict[str, LocalFunction] = {}
+        self.rules: list[EventRule] = []
+        self.async_workers = async_workers
+        self.undelivered_events: list[dict] = []
+        self._queue: queue.Queue[tuple[LocalFunction, dict, int] | None] = queue.Queue()
+        self._workers: list[threading.Thread] = []
+        # the functions share the lbz singletons, so only one of them runs at a time
+        self._runtime_lock = threading.RLock()
+        self._boto3_client: Boto3Client | None = None
+
+    def __repr__(self) -> str:
+        return f"<LambdaEmulator functions={list(self.functions)} rules={len(self.rules)}>"
+
+    def __enter__(self) -> LambdaEmulator:
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.uninstall()
+
+    def add_function(
+        self,
+        name: str,
+        handler: LambdaHandler,
+        *,
+        timeout: float = 3.0,
+        memory_size: int = 128,
+        async_retries: int = 2,
+    ) -> LocalFunction:
+        """Hosts the Lambda handler (the function configured in Lambda) under the name."""
+        function = LocalFunction(
+            name, handler, timeout=timeout, memory_size=memory_size, async_retries=async_retries
+        )
+        self.functions[name] = function
+        return function
+
+    def add_rule(
+        self, function_name: str, pattern: Mapping[str, Any], bus_name: str | None = None
+    ) -> EventRule:
+        """Delivers the events matching the pattern to the function, from any bus if not given."""
+        if function_name not in self.functions:
+            raise ValueError(f"Unknown function: {function_name}")
+        rule = EventRule(function_name, pattern, bus_name)
+        self.rules.append(rule)
+        return rule
+
+    def install(self, boto3_client: Boto3Client = client) -> None:
+        """Routes the Lambda and EventBridge calls of the boto3 client to the emulator."""
+        boto3_client.set_client("lambda_", EmulatedLambdaClient(self))
+        boto3_client.set_client("eventbridge", EmulatedEventBridgeClient(self))
+        self._boto3_client = boto3_client
+
+    def uninstall(self) -> None:
+        if self._boto3_client is not None:
+            self._boto3_client.set_client("lambda_", None)
+            self._boto3_client.set_client("eventbridge", None)
+            self._boto3_client = None
+
+    def invoke(
+        self, function_name: str, event: dict, client_context: LocalClientContext | None = None
+    ) -> Any:
+        """Invokes the function synchronously, its errors are raised."""
+        function = self._get_function(function_name)
+        with self._runtime_lock:
+            return function.run(event, client_context)
+
+    def invoke_async(self, function_name: str, event: dict) -> None:
+        """Queues the invocation, failed ones are retried as configured for the function."""
+        self._enqueue(self._get_function(function_name), event)
+
+    def put_event(self, bus_name: str, event: dict) -> None:
+        """Delivers the EventBridge event to the functions of the matching rules."""
+        if not (rules := [rule for rule in self.rules if rule.matches(bus_name, event)]):
+            self.undelivered_events.append(event)
+        for rule in rules:
+            self._enqueue(self.functions[rule.function_name], event)
+
+    def drain(self, timeout: float | None = None) -> None:
+        """Waits until all the queued invocations (and the ones they trigger) are done."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Queued invocations were not handled in time")
+                self._queue.all_tasks_done.wait(remaining)
+
+    def shutdown(self) -> None:
+        """Stops the workers handling the queued invocations, the ones queued are dropped."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Invocations, errors, timeouts and durations (in milliseconds) per function."""
+        return {name: function.stats() for name, function in self.functions.items()}
+
+    def _get_function(self, function_name: str) -> LocalFunction:
+        # function names may be given as ARNs as well
+        name = function_name.rsplit(":function:", 1)[-1]
+        try:
+            return self.functions[name]
+        except KeyError:
+            raise ValueError(f"Function not found: {function_name}") from None
+
+    def _enqueue(self, function: LocalFunction, event: dict, attempt: int = 0) -> None:
+        if not self._workers:
+            self._workers = [
+                threading.Thread(
+                    target=self._handle_queue, name=f"lbz-emulator-{idx}", daemon=True
+                )
+                for idx in range(self.async_workers)
+            ]
+            for worker in self._workers:
+                worker.start()
+        self._queue.put((function, event, attempt))
+
+    def _handle_queue(self) -> None:
+        while (item := self._queue.get()) is not None:
+            function, event, attempt = item
+            try:
+                with self._runtime_lock:
+                    function.run(event)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Async invocation of %s has failed", function.name)
+                if attempt < function.async_retries:
+                    self._queue.put((function, event, attempt + 1))
+            finally:
+                self._queue.task_done()
+        self._queue.task_done()
+
+
+class EmulatedLambdaClient:
+    """Stands in for the boto3 Lambda client, supports the calls made by LambdaClient."""
+
+    def __init__(self, emulator: LambdaEmulator) -> None:
+        self.emulator = emulator
+
+    def invoke(
+        self,
+        *,
+        FunctionName: str,
+        Payload: bytes | str = b"{}",
+        InvocationType: str = "",
+        ClientContext: str | None = None,
+        **_: Any,
+    ) -> dict[str, Any]:
+        event = json.loads(Payload)
+        if InvocationType == "Event":
+            self.emulator.invoke_async(FunctionName, event)
+            return {"StatusCode": 202, "Payload": io.BytesIO(b"")}
+        client_context = (
+            None
+            if ClientContext is None
+            else LocalClientContext(json.loads(base64.b64decode(ClientContext)))
+        )
+        try:
+            result = self.emulator.invoke(FunctionName, event, client_context)
+        except Exception as error:  # pylint: disable=broad-except
+            # Lambda reports unhandled errors in the payload
+            payload = {"errorMessage": str(error), "errorType": type(error).__name__}
+            return {
+                "StatusCode": 200,
+                "FunctionError": "Unhandled",
+                "Payload": io.BytesIO(json.dumps(payload).encode("utf-8")),
+            }
+        return {
+            "StatusCode": 200,
+            "Payload": io.BytesIO(json.dumps(result, default=str).encode("utf-8")),
+        }
+
+
+class EmulatedEventBridgeClient:
+    """Stands in for the boto3 EventBridge client, supports the calls made by EventAPI."""
+
+    def __init__(self, emulator: LambdaEmulator) -> None:
+        self.emulator = emulator
+
+    def put_events(self, *, Entries: Sequence[Mapping[str, Any]], **_: Any) -> dict[str, Any]:
+        results = []
+        for entry in Entries:
+            event = {
+                "version": "0",
+                "id": str(uuid.uuid4()),
+                "detail-type": entry["DetailType"],
+                "source": entry["Source"],
+                "account": ACCOUNT_ID,
+                "time": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "region": REGION,
+                "resources": list(entry.get("Resources", [])),
+                "detail": json.loads(entry["Detail"]),
+            }
+            self.emulator.put_event(entry.get("EventBusName") or DEFAULT_BUS_NAME, event)
+            results.append({"EventId": event["id"]})
+        return {"FailedEntryCount": 0, "Entries": results}
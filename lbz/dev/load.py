@@ -0,0 +1,320 @@
+"""Load generation driving a Resource in-process with recorded or synthetic API Gateway events.
+
+    events = load_events("traffic.jsonl")  # or weighted_mix([(event, 9), (other_event, 1)], 1000)
+    report = LoadTest(MyResource, events, rate=200, duration=30, concurrency=8).run()
+    print(report)
+
+Events are prepared up front and reused, so only the Resource is measured. With a target rate
+the requests are scheduled at fixed intervals (open model) and their latency counts from the
+scheduled time, so queueing caused by slow requests is not hidden; without it the workers send
+requests one after another (closed model) as fast as they can.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import multiprocessing
+import queue
+import random
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from lbz.metrics import summarize
+from lbz.misc import get_logger
+from lbz.recording import EventRecord
+from lbz.resource import Resource
+
+logger = get_logger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+# How long the results of the processes are awaited beyond the expected duration of the test
+# (seconds) - the duration, or the time the requests take at the rate, zero without both
+RESULTS_GRACE_PERIOD = 30.0
+# How often the processes are checked while their results are awaited (seconds)
+RESULTS_POLL_INTERVAL = 0.5
+
+
+def load_events(path: str | Path) -> list[dict]:
+    """Loads API Gateway events saved as a JSON list or as JSON lines (gzip compressed if .gz).
+
+    Records written by lbz.recording.JSONLinesStore are recognized by their content, the events
+    of the recorded resources are taken from them.
+    """
+    path = Path(path)
+    content = path.read_bytes()
+    text = (gzip.decompress(content) if path.suffix == ".gz" else content).decode("utf-8")
+    if text.lstrip().startswith("["):
+        events: list[dict] = json.loads(text)
+        return events
+    items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if items and set(items[0]) == set(EventRecord.__slots__):
+        return [item["event"] for item in items if item["kind"] == "resource"]
+    return items
+
+
+def weighted_mix(
+    weighted_events: Sequence[tuple[dict, float]], count: int, seed: int = 0
+) -> list[dict]:
+    """Draws the count of events with the given weights, the same seed gives the same mix."""
+    events, weights = zip(*weighted_events)
+    return random.Random(seed).choices(events, weights=weights, k=count)
+
+
+class LoadReport:
+    """Outcome of a load test, latencies are given in milliseconds."""
+
+    def __init__(
+        self,
+        latencies: Sequence[float],
+        statuses: Counter[int],
+        errors: int,
+        duration: float,
+        allocations: dict[str, float] | None = None,
+    ) -> None:
+        self.latencies = latencies
+        self.statuses = statuses
+        self.errors = errors  # requests which have raised instead of responding
+        self.duration = duration
+        self.allocations = allocations or {}
+
+    def __repr__(self) -> str:
+        return f"<LoadReport requests={self.requests} throughput={self.throughput:.1f}/s>"
+
+    def __str__(self) -> str:
+        latency = self.latency
+        lines = [
+            f"Requests:   {self.requests} in {self.duration:.2f}s ({self.throughput:.1f}/s)",
+            f"Statuses:   {dict(sorted(self.statuses.items()))} errors: {self.errors}",
+            "Latency ms: "
+            + " ".join(f"{key}={value:.2f}" for key, value in latency.items() if key != "count"),
+        ]
+        if self.allocations:
+            lines.append(
+                "Allocated:  "
+                + " ".join(f"{key}={value:.0f}" for key, value in self.allocations.items())
+            )
+        return "\n".join(lines)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def latency(self) -> dict[str, float]:
+        return summarize(self.latencies, PERCENTILES) if self.latencies else {}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "duration": self.duration,
+            "throughput": self.throughput,
+            "latency": self.latency,
+            "allocations": self.allocations,
+        }
+
+
+class LoadTest:
+    """Sends the events (cycling through them) to the resource from threads or processes.
+
+    The test ends after the given number of requests (one round of the events by default) or
+    after the duration in seconds. The rate is the target of requests per second of the whole
+    test, the concurrency is the number of threads in each of the processes. Allocations are
+    measured separately, on the first allocation_samples events sent one by one beforehand.
+    Processes still running after the timeout in seconds (by default the expected duration
+    of the test plus RESULTS_GRACE_PERIOD) are killed, their requests count as errors.
+    """
+
+    def __init__(
+        self,
+        resource: type[Resource],
+        events: Sequence[dict],
+        *,
+        requests: int | None = None,
+        duration: float | None = None,
+        rate: float | None = None,
+        concurrency: int = 1,
+        processes: int = 1,
+        allocation_samples: int = 0,
+        timeout: float | None = None,
+    ) -> None:
+        if not events:
+            raise ValueError("At least one event is required")
+        self.resource = resource
+        self.events = events
+        self.requests = requests if requests is not None or duration else len(events)
+        self.duration = duration
+        self.rate = rate
+        self.concurrency = concurrency
+        self.processes = processes
+        self.allocation_samples = allocation_samples
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sent = 0
+
+    def run(self) -> LoadReport:
+        allocations = self._measure_allocations() if self.allocation_samples else None
+        if self.processes > 1:
+            latencies, statuses, errors, duration = self._run_processes()
+        else:
+            latencies, statuses, errors, duration = self._run_threads()
+        return LoadReport(latencies, statuses, errors, duration, allocations)
+
+    def _measure_allocations(self) -> dict[str, float]:
+        peaks, retained = [], []
+        tracemalloc.start()
+        try:
+            for idx in range(self.allocation_samples):
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                self.resource(self.events[idx % len(self.events)])()
+                current, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - before)
+                retained.append(current - before)
+        finally:
+            tracemalloc.stop()
+        return {
+            "peak_bytes": sum(peaks) / len(peaks),
+            "retained_bytes": sum(retained) / len(retained),
+        }
+
+    def _run_threads(self) -> tuple[list[float], Counter[int], int, float]:
+        latencies: list[float] = []
+        statuses: Counter[int] = Counter()
+        errors = self._sent = 0
+        started = time.perf_counter()
+        ends_at = started + self.duration if self.duration else None
+
+        def send() -> None:
+            nonlocal errors
+            while (index := self._next_index(started, ends_at)) is not None:
+                latency, status = self._send(index, started)
+                with self._lock:
+                    latencies.append(latency)
+                    if status is None:
+                        errors += 1
+                    else:
+                        statuses[status] += 1
+
+        workers = [threading.Thread(target=send) for _ in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return latencies, statuses, errors, time.perf_counter() - started
+
+    def _send(self, index: int, started: float) -> tuple[float, int | None]:
+        """Returns the latency (in ms) and the status code, None if the resource has raised."""
+        if self.rate:
+            scheduled = started + index / self.rate
+            time.sleep(max(scheduled - time.perf_counter(), 0))
+        else:
+            scheduled = time.perf_counter()
+        try:
+            status: int | None = self.resource(self.events[index % len(self.events)])().status_code
+        except Exception:  # pylint: disable=broad-except
+            status = None
+        return (time.perf_counter() - scheduled) * 1000, status
+
+    def _next_index(self, started: float, ends_at: float | None) -> int | None:
+        with self._lock:
+            if self.requests is not None and self._sent >= self.requests:
+                return None
+            scheduled = started + self._sent / self.rate if self.rate else time.perf_counter()
+            if ends_at is not None and scheduled >= ends_at:
+                return None
+            self._sent += 1
+            return self._sent - 1
+
+    def _run_processes(self) -> tuple[list[float], Counter[int], int, float]:
+        """Splits the requests and the rate between forked processes and merges their results.
+
+        Processes which have died or not reported in time count their requests as errors.
+        """
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        processes = [
+            context.Process(target=self._run_share, args=(idx, results), daemon=True)
+            for idx in range(self.processes)
+        ]
+        for process in processes:
+            process.start()
+        latencies: list[float] = []
+        statuses: Counter[int] = Counter()
+        errors, duration = 0, 0.0
+        for idx, share in self._collect_results(processes, results):
+            if share is None:
+                errors += self._share_requests(idx) or 1
+                continue
+            share_latencies, share_statuses, share_errors, share_duration = share
+            latencies.extend(share_latencies)
+            statuses.update(share_statuses)
+            errors += share_errors
+            duration = max(duration, share_duration)
+        for process in processes:
+            process.join()
+        return latencies, statuses, errors, duration
+
+    def _collect_results(
+        self, processes: list[Any], results: multiprocessing.Queue
+    ) -> Iterator[tuple[int, Any]]:
+        """Yields the index and the result of each process, None for the ones which failed."""
+        deadline = time.monotonic() + self._timeout()
+        pending = dict(enumerate(processes))
+        exited: set[int] = set()
+        while pending:
+            try:
+                idx, share = results.get(timeout=RESULTS_POLL_INTERVAL)
+            except queue.Empty:
+                # a process which has exited is given one more poll to deliver its result
+                failed = [idx for idx in exited if idx in pending]
+                exited = {idx for idx, process in pending.items() if process.exitcode is not None}
+                if time.monotonic() > deadline:
+                    failed = list(pending)
+                for idx in failed:
+                    process = pending.pop(idx)
+                    process.kill()
+                    logger.error(
+                        "Load test process %d failed (exit code %s)", idx, process.exitcode
+                    )
+                    yield idx, None
+                continue
+            del pending[idx]
+            yield idx, share
+
+    def _timeout(self) -> float:
+        if self.timeout is not None:
+            return self.timeout
+        if self.duration:
+            return self.duration + RESULTS_GRACE_PERIOD
+        if self.rate and self.requests is not None:
+            return self.requests / self.rate + RESULTS_GRACE_PERIOD
+        return RESULTS_GRACE_PERIOD
+
+    def _share_requests(self, idx: int) -> int | None:
+        if self.requests is None:
+            return None
+        return self.requests // self.processes + (idx < self.requests % self.processes)
+
+    def _run_share(self, idx: int, results: multiprocessing.Queue) -> None:
+        share = LoadTest(
+            self.resource,
+            # each process starts at another event not to send the same ones at once
+            [*self.events[idx:], *self.events[:idx]] if idx < len(self.events) else self.events,
+            requests=self._share_requests(idx),
+            duration=self.duration,
+            rate=self.rate / self.processes if self.rate else None,
+            concurrency=self.concurrency,
+        )
+        results.put((idx, share._run_threads()))  # pylint: disable=protected-access
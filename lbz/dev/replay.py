@@ -0,0 +1,266 @@
+"""Replays recorded events (see lbz.recording) and compares the responses and the timings.
+
+    replayer = Replayer(prepare=with_headers({"Authorization": TEST_TOKEN}))
+    replayer.add_resource(Orders)
+    replayer.add_handler(LambdaBroker, MAPPER, name="orders-lambda")
+    report = replayer.replay(read_records("events.jsonl.gz"), ignore=["body.created_at"])
+    print(report)
+
+Handlers are recorded under the names of their Lambda functions. Credentials are redacted in
+the records, so the prepare hook puts test ones back - otherwise the requests replay as 401.
+
+From the command line, the resources and handlers are given by their import paths, handlers
+optionally with the function name and the mapper (an attribute of the same module):
+    python -m lbz.dev.replay events.jsonl.gz orders.resource:Orders \
+        orders-lambda=orders.handler:LambdaBroker:MAPPER \
+        --header "Authorization: $TEST_TOKEN" --ignore body.created_at
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from functools import partial
+from typing import Any
+
+from lbz.dev.emulator import LocalFunction, LocalLambdaContext
+from lbz.handlers import BaseHandler
+from lbz.metrics import summarize
+from lbz.recording import EventRecord, event_recorder, read_records, redact
+from lbz.resource import Resource
+from lbz.type_defs import LambdaContext
+
+HandlerFactory = Callable[..., BaseHandler]
+# Returns the event to replay, e.g. with test credentials in place of the redacted ones
+PrepareHook = Callable[[EventRecord], Any]
+
+
+def as_recorded(value: Any) -> Any:
+    """Returns the value as it is read from the records - redacted, with datetimes as strings."""
+    return json.loads(json.dumps(redact(value, event_recorder.redacted_keys), default=str))
+
+
+def diff(expected: Any, actual: Any, path: str = "") -> list[str]:
+    """Returns the paths (dot separated keys and indexes) of the values which differ."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        differences = []
+        for key in sorted({*expected, *actual}, key=str):
+            differences.extend(
+                diff(expected.get(key), actual.get(key), f"{path}.{key}" if path else str(key))
+            )
+        return differences
+    if isinstance(expected, list) and isinstance(actual, list) and len(expected) == len(actual):
+        differences = []
+        for idx, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            differences.extend(
+                diff(expected_item, actual_item, f"{path}.{idx}" if path else str(idx))
+            )
+        return differences
+    return [] if expected == actual else [path]
+
+
+def with_headers(headers: Mapping[str, str]) -> PrepareHook:
+    """Prepare hook setting the headers (e.g. Authorization) of the events of resources."""
+    replaced = {name.lower() for name in headers}
+
+    def prepare(record: EventRecord) -> Any:
+        if record.kind != "resource":
+            return record.event
+        event = dict(record.event)
+        for key in ("headers", "multiValueHeaders"):
+            if isinstance(event.get(key), dict):
+                event[key] = {
+                    name: value
+                    for name, value in event[key].items()
+                    if name.lower() not in replaced
+                }
+        event["headers"] = {**(event.get("headers") or {}), **headers}
+        return event
+
+    return prepare
+
+
+def _decode_body(response: Any) -> Any:
+    """Resource responses are compared with their JSON bodies decoded."""
+    if isinstance(response, dict) and isinstance(body := response.get("body"), str):
+        try:
+            return {**response, "body": json.loads(body)}
+        except ValueError:
+            pass
+    return response
+
+
+class ReplayReport:
+    """Outcome of a replay, the durations are given in milliseconds."""
+
+    def __init__(self) -> None:
+        self.replayed = 0
+        self.skipped = 0  # records of resources or handlers which were not added
+        self.mismatches: list[dict[str, Any]] = []
+        self.durations: dict[str, dict[str, list[float]]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<ReplayReport replayed={self.replayed} mismatches={len(self.mismatches)} "
+            f"skipped={self.skipped}>"
+        )
+
+    def __str__(self) -> str:
+        lines = [
+            f"Replayed: {self.replayed} mismatches: {len(self.mismatches)} "
+            f"skipped: {self.skipped}"
+        ]
+        for name, timings in self.timings().items():
+            lines.append(
+                f"{name}: p50 {timings['recorded']['p50']:.2f}ms -> "
+                f"{timings['replayed']['p50']:.2f}ms ({timings['change']:+.1%})"
+            )
+        for mismatch in self.mismatches:
+            lines.append(
+                f"#{mismatch['index']} {mismatch['name']} differs at: "
+                + ", ".join(mismatch["differences"])
+            )
+        return "\n".join(lines)
+
+    def add(
+        self, record: EventRecord, duration: float, differences: list[str], index: int
+    ) -> None:
+        self.replayed += 1
+        durations = self.durations.setdefault(record.name, {"recorded": [], "replayed": []})
+        durations["recorded"].append(record.duration)
+        durations["replayed"].append(duration)
+        if differences:
+            self.mismatches.append(
+                {
+                    "index": index,
+                    "kind": record.kind,
+                    "name": record.name,
+                    "differences": differences,
+                }
+            )
+
+    def timings(self) -> dict[str, dict[str, Any]]:
+        """Recorded and replayed durations per resource or handler, with the change of p50."""
+        timings = {}
+        for name, durations in self.durations.items():
+            recorded, replayed = summarize(durations["recorded"]), summarize(durations["replayed"])
+            timings[name] = {
+                "recorded": recorded,
+                "replayed": replayed,
+                "change": replayed["p50"] / recorded["p50"] - 1 if recorded["p50"] else 0.0,
+            }
+        return timings
+
+
+class Replayer:
+    """Runs the recorded events with the added resources and handlers of the current build."""
+
+    def __init__(self, prepare: PrepareHook | None = None) -> None:
+        self._targets: dict[tuple[str, str], Callable[[Any], Any]] = {}
+        self._prepare = prepare
+
+    def __repr__(self) -> str:
+        return f"<Replayer targets={sorted(name for _, name in self._targets)}>"
+
+    def add_resource(self, resource: type[Resource]) -> None:
+        self._targets["resource", resource.get_name()] = lambda event: resource(event)().to_dict()
+
+    def add_handler(
+        self,
+        handler: HandlerFactory,
+        mapper: Mapping[str, Any] | None = None,
+        *,
+        name: str | None = None,
+        timeout: float = 900.0,
+    ) -> None:
+        """Adds the handler class (or a factory of handlers) replaying the records of the name.
+
+        It is called with the event and the context, preceded by the mapper if one is given
+        (e.g. for LambdaBroker or EventBroker). The name is the one of the Lambda function the
+        events were recorded in, the name of the handler by default.
+        """
+        name = name or handler.__name__
+        if mapper is not None:
+            handler = partial(handler, mapper)
+
+        def create(event: dict, context: LambdaContext) -> BaseHandler:
+            return handler(event, context)
+
+        function = LocalFunction(name, create, timeout=timeout)
+        self._targets["handler", name] = lambda event: create(
+            event, LocalLambdaContext(function)
+        ).react()
+
+    def replay(self, records: Iterable[EventRecord], ignore: Sequence[str] = ()) -> ReplayReport:
+        """Re-runs the records one by one, differences at the ignored paths are not reported."""
+        report = ReplayReport()
+        for index, record in enumerate(records):
+            if (target := self._targets.get((record.kind, record.name))) is None:
+                report.skipped += 1
+                continue
+            event = record.event if self._prepare is None else self._prepare(record)
+            started = time.perf_counter()
+            try:
+                response = target(event)
+            except Exception as error:  # pylint: disable=broad-except
+                response = {"errorMessage": str(error), "errorType": type(error).__name__}
+            duration = (time.perf_counter() - started) * 1000
+            differences = [
+                path
+                for path in diff(
+                    _decode_body(record.response), _decode_body(as_recorded(response))
+                )
+                if not any(path == prefix or path.startswith(f"{prefix}.") for prefix in ignore)
+            ]
+            report.add(record, duration, differences, index)
+        return report
+
+
+def _add_target(replayer: Replayer, target: str) -> None:
+    """Adds the target given as [name=]module:attribute[:mapper]."""
+    name, _, path = target.rpartition("=")
+    module_name, _, attribute = path.partition(":")
+    attribute, _, mapper_attribute = attribute.partition(":")
+    module = importlib.import_module(module_name)
+    cls = getattr(module, attribute)
+    if isinstance(cls, type) and issubclass(cls, Resource):
+        replayer.add_resource(cls)
+        return
+    mapper = getattr(module, mapper_attribute) if mapper_attribute else None
+    replayer.add_handler(cls, mapper, name=name or None)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m lbz.dev.replay",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("records", help="file written by JSONLinesStore")
+    parser.add_argument(
+        "targets", nargs="+", help="resources and handlers as [name=]module:Class[:mapper]"
+    )
+    parser.add_argument("--ignore", action="append", default=[], help="path not compared")
+    parser.add_argument(
+        "--header", action="append", default=[], help='header of the resources, "Name: value"'
+    )
+    args = parser.parse_args(argv)
+
+    headers = dict(
+        (name.strip(), value.strip())
+        for name, _, value in (header.partition(":") for header in args.header)
+    )
+    replayer = Replayer(prepare=with_headers(headers) if headers else None)
+    for target in args.targets:
+        _add_target(replayer, target)
+    report = replayer.replay(read_records(args.records), args.ignore)
+    print(report)
+    return 1 if report.mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
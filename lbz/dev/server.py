@@ -1,123 +1,204 @@
+"""Local HTTP server running a resource the way API Gateway and Lambda do.
+
+Connections are kept alive (HTTP/1.1) and served by a thread per connection, or by a pool
+of worker threads, optionally in several pre-forked processes sharing the listening socket.
+With reload=True the server restarts itself whenever a Python file it loaded changes.
+"""
+
 from __future__ import annotations
 
+import base64
 import json
 import logging
+import os
+import signal
+import sys
+import time
 import urllib.parse
 from abc import ABCMeta, abstractmethod
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from os import environ
-from threading import Thread
+from socket import socket
+from threading import Event, Thread
+from typing import Any
 
 from lbz.resource import Resource
 from lbz.rest import APIGatewayEvent
+from lbz.router import Router
 
 if environ.get("LBZ_DEBUG_MODE") is None:
     environ["LBZ_DEBUG_MODE"] = "true"
 
+# Seconds an idle kept-alive connection is held before closing it (and freeing its worker)
+KEEP_ALIVE_TIMEOUT = 5
+# Length of the queue of connections waiting for accept, the socketserver default is only 5
+REQUEST_QUEUE_SIZE = 128
+TEXT_CONTENT_TYPES = frozenset(
+    {"application/json", "application/xml", "application/x-www-form-urlencoded"}
+)
+
+
+def is_text_content(content_type: str | None) -> bool:
+    """Tells whether the body is passed to the resource as text or base64 encoded bytes."""
+    mime_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return (
+        not mime_type
+        or mime_type.startswith("text/")
+        or mime_type.endswith("+json")
+        or mime_type in TEXT_CONTENT_TYPES
+    )
+
+
+class RouteMatcher:
+    """Routes of the router compiled for matching request paths without scanning all of them.
+
+    Static routes are looked up directly, the ones with path parameters only among the routes
+    with the same number of segments.
+    """
+
+    def __init__(self, routes: Iterable[str]) -> None:
+        self._static: set[str] = set()
+        self._dynamic: dict[int, list[tuple[str, list[str]]]] = {}
+        for route in routes:
+            if "{" in route:
+                parts = route.split("/")[1:]
+                self._dynamic.setdefault(len(parts), []).append((route, parts))
+            else:
+                self._static.add(route)
+
+    def match(self, path: str) -> tuple[str | None, dict | None]:
+        if (path := path.split("?", 1)[0]) in self._static:
+            return path, None
+        segments = path.split("/")[1:]
+        for route, parts in self._dynamic.get(len(segments), []):
+            params = {}
+            for part, segment in zip(parts, segments):
+                if part.startswith("{"):
+                    params[part.strip("{}")] = segment
+                elif part != segment:
+                    break
+            else:
+                return route, params
+        return None, None
+
 
 class MyLambdaDevHandler(BaseHTTPRequestHandler, metaclass=ABCMeta):
     """Mimics AWS Lambda behavior."""
 
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+    # responses are small, waiting to fill the TCP packets only adds latency
+    disable_nagle_algorithm = True
+    log_requests = True
     done: bool = False  # TODO: if possible move to __init__
+    _matcher: RouteMatcher | None = None
+    _matcher_version = -1
 
     @property
     @abstractmethod
     def cls(self) -> type[Resource]:
         pass
 
-    def _get_route_params(self, org_path: str) -> tuple[str | None, dict | None]:  # noqa:C901
+    def _get_route_params(self, org_path: str) -> tuple[str | None, dict | None]:
         """Parses route and params.
 
         :param org_path:
         :return: standardised route, url params / None
         """
-        router = self.cls._router  # pylint: disable=protected-access
-        if org_path in router:
-            return org_path, None
-        if org_path.find("?") != -1:
-            org_path = org_path[: org_path.find("?")]
-        path = org_path.split("/")
-        path.remove("")
-        for org_route in router:
-            if org_route == "/":
-                continue
-            route = org_route.split("/")
-            route.remove("")
-            if len(path) == len(route):
-                acc = 0
-                params = {}
-                for i, route_part in enumerate(route):
-                    if route_part.startswith("{"):
-                        acc += 1
-                        param = path[i]
-                        params[route_part.strip("{").strip("}")] = param
-                    if route_part == path[i]:
-                        acc += 1
-                if len(path) == acc:
-                    return org_route, params
-        return None, None
+        return self._route_matcher(self.cls._router).match(  # pylint: disable=protected-access
+            org_path
+        )
 
-    def _send_json(self, code: int, obj: dict, headers: dict | None = None) -> None:
+    @classmethod
+    def _route_matcher(cls, router: Router) -> RouteMatcher:
+        # compiled again only when the routes changed since the last request
+        if cls._matcher is None or cls._matcher_version != router.version:
+            cls._matcher = RouteMatcher(router)
+            cls._matcher_version = router.version
+        return cls._matcher
+
+    def _send(self, code: int, payload: bytes, headers: Mapping[str, str] | None = None) -> None:
         # Make sure only one response is sent
         if self.done:
             return
 
         self.send_response(code, message=None)
-
-        if headers:
-            for key, value in headers.items():
+        for key, value in (headers or {}).items():
+            if key.lower() != "content-length":
                 self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
 
         self.done = True
-        self.wfile.write(json.dumps(obj, indent=4, sort_keys=True).encode("utf-8"))
+        self.wfile.write(payload)
+
+    def _send_json(self, code: int, obj: dict, headers: dict | None = None) -> None:
+        self._send(code, json.dumps(obj).encode("utf-8"), headers)
 
     def _error(self, code: int, message: str) -> None:
         content_type = "application/json;charset=UTF-8"
         self._send_json(code, {"error": message}, headers={"Content-Type": content_type})
 
+    def _read_body(self) -> tuple[str | None, bool]:
+        """Reads the body as API Gateway passes it - text or base64 encoded binary data."""
+        if not (request_size := int(self.headers.get("Content-Length", 0))):
+            return None, False
+        body = self.rfile.read(request_size)
+        if is_text_content(self.headers.get("Content-Type")):
+            try:
+                return body.decode("utf-8"), False
+            except UnicodeDecodeError:
+                pass
+        return base64.b64encode(body).decode("ascii"), True
+
+    def _create_event(self, route: str, params: dict | None) -> APIGatewayEvent:
+        body, is_base64_encoded = self._read_body()
+        headers: dict[str, str] = {}
+        multi_value_headers: dict[str, list[str]] = {}
+        for key, value in self.headers.items():
+            headers[key] = value
+            multi_value_headers.setdefault(key, []).append(value)
+        query = urllib.parse.urlsplit(self.path).query
+        event = APIGatewayEvent(
+            resource_path=route,
+            method=self.command,
+            headers=headers,
+            path_params=params,
+            query_params=urllib.parse.parse_qs(query, keep_blank_values=True),
+            body=body,
+            is_base64_encoded=is_base64_encoded,
+        )
+        event["multiValueHeaders"] = multi_value_headers
+        return event
+
     def handle_request(self) -> None:
         """Main method for handling all incoming requests."""
         try:
+            self.done = False
             if self.path == "/favicon.ico":
+                self._send(404, b"")
                 return
-            self.done = False
 
-            if request_size := int(self.headers.get("Content-Length", 0)):
-                request_body = self.rfile.read(request_size).decode(
-                    encoding="utf_8", errors="strict"
-                )
-                request_obj = json.loads(request_body)
-            else:
-                request_obj = {}
-            parsed_url = urllib.parse.urlparse(self.path)
-            query_params = urllib.parse.parse_qs(parsed_url.query, keep_blank_values=True)
             route, params = self._get_route_params(self.path)
             if route is None:
-                self._error(666, "Path not Found")
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._error(404, "Path not Found")
                 return
-            resource = self.cls(
-                APIGatewayEvent(
-                    resource_path=route,
-                    method=self.command,
-                    headers=self.headers,  # type: ignore
-                    path_params=params,
-                    query_params=query_params,
-                    body=request_obj,
-                )
+            response = self.cls(self._create_event(route, params))().to_dict()
+            body = response.get("body") or ""
+            payload = (
+                base64.b64decode(body) if response.get("isBase64Encoded") else body.encode("utf-8")
             )
-            response = resource()
-            code = response.status_code
-            response_as_dict = response.to_dict()
-            resp_headers = response_as_dict.get("headers", {})
-            if body := response_as_dict.get("body"):
-                response_as_dict = json.loads(body)
-            else:
-                response_as_dict = {}
-            self._send_json(code, response_as_dict, resp_headers)
+            self._send(response["statusCode"], payload, response.get("headers"))
         except Exception:  # pylint: disable=broad-except
             logging.exception("Fail trying to send json")
-        self._error(500, "Server error")
+            self._error(500, "Server error")
+
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        if self.log_requests:
+            super().log_request(code, size)
 
     def do_GET(self) -> None:  # pylint: disable=invalid-name
         self.handle_request()
@@ -138,34 +219,180 @@ class MyLambdaDevHandler(BaseHTTPRequestHandler, metaclass=ABCMeta):
         self.handle_request()
 
 
+class DevThreadingHTTPServer(ThreadingHTTPServer):
+    """Serves every connection in a new thread."""
+
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+class DevThreadPoolHTTPServer(HTTPServer):
+    """Serves the connections by a fixed number of worker threads."""
+
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        workers: int,
+    ) -> None:
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        # the threads are started with the first connections, so after forking the processes
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="lbz-dev-server")
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self._executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request: socket, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:  # pylint: disable=broad-except
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FileWatcher:
+    """Detects changes of the Python modules loaded from the given directories."""
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        self.paths = tuple(os.path.abspath(path) for path in paths)
+        self._mtimes: dict[str, float] = {}
+        self.changed()
+
+    def __repr__(self) -> str:
+        return f"<FileWatcher paths={self.paths} files={len(self._mtimes)}>"
+
+    def files(self) -> set[str]:
+        files = set()
+        for module in list(sys.modules.values()):
+            file = getattr(module, "__file__", None)
+            if file and os.path.abspath(file).startswith(self.paths):
+                files.add(os.path.abspath(file))
+        return files
+
+    def changed(self) -> str | None:
+        """Returns a file modified (or removed) since the previous check, if any."""
+        changed = None
+        for file in self.files() | set(self._mtimes):
+            try:
+                mtime = os.stat(file).st_mtime
+            except OSError:
+                mtime = -1.0
+            if (previous := self._mtimes.get(file)) is not None and previous != mtime:
+                changed = changed or file
+            self._mtimes[file] = mtime
+        return changed
+
+
 class MyDevServer(Thread):
+    """Runs the resource locally.
+
+    :param workers: number of threads serving the connections, a thread per connection if None
+    :param processes: number of pre-forked processes sharing the port (POSIX only)
+    :param reload: restarts the server when a module loaded from reload_paths changes
+    :param reload_paths: directories watched for changes, the current directory by default
+    :param log_requests: prints every request, turn off for load testing
+    """
+
+    reload_interval = 1.0
+
     def __init__(
         self,
         acls: type[Resource],
         address: str = "localhost",
         port: int = 8000,
+        *,
+        workers: int | None = None,
+        processes: int = 1,
+        reload: bool = False,
+        reload_paths: Iterable[str] | None = None,
+        log_requests: bool = True,
     ) -> None:
+        if processes > 1 and not hasattr(os, "fork"):
+            raise ValueError("Worker processes require os.fork, which is not available here")
+
         class MyClassLambdaDevHandler(MyLambdaDevHandler):
             cls: type[Resource] = acls
 
+        MyClassLambdaDevHandler.log_requests = log_requests
         super().__init__()
         self.my_handler = MyClassLambdaDevHandler
         self.address = address
         self.port = port
         self.server_address = (self.address, self.port)
-        self.httpd = ThreadingHTTPServer(self.server_address, self.my_handler)
+        self.workers = workers
+        self.processes = processes
+        self.httpd: HTTPServer = (
+            DevThreadingHTTPServer(self.server_address, self.my_handler)
+            if workers is None
+            else DevThreadPoolHTTPServer(self.server_address, self.my_handler, workers)
+        )
+        self._children: list[int] = []
+        self._stopped = Event()
+        self._watcher = FileWatcher(reload_paths or [os.getcwd()]) if reload else None
         print(f"server bound to port: {self.port}")
 
     def run(self) -> None:
         """Start the server in the foreground."""
         print(f"serving on http://{self.address}:{self.port}")
+        if self._watcher is not None:
+            Thread(target=self._watch_for_changes, daemon=True).start()
+        for _ in range(self.processes - 1):
+            if (pid := os.fork()) == 0:
+                self._serve_in_child(os.getppid())
+            self._children.append(pid)
         self.httpd.serve_forever()
 
     def stop(self) -> None:
+        self._stopped.set()
         self.httpd.shutdown()
         self.httpd.server_close()
+        self._stop_children()
         print(f"Server stopped and port {self.port} released")
 
     def start(self) -> None:  # pylint: disable=useless-super-delegation
         """Start the server in the background"""
         super().start()
+
+    def _serve_in_child(self, parent_pid: int) -> None:
+        def exit_with_parent() -> None:
+            while os.getppid() == parent_pid:
+                time.sleep(1)
+            os._exit(0)
+
+        Thread(target=exit_with_parent, daemon=True).start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            os._exit(0)
+
+    def _stop_children(self) -> None:
+        for pid in self._children:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+        self._children = []
+
+    def _watch_for_changes(self) -> None:
+        while not self._stopped.wait(self.reload_interval):
+            if self._watcher is not None and (changed := self._watcher.changed()):
+                print(f"Detected a change in {changed}, reloading")
+                # the listening socket is not inherited by the new process, so it is released
+                self._stop_children()
+                self._restart()
+
+    @staticmethod
+    def _restart() -> None:
+        """Replaces the process by a new one started the same way."""
+        main_spec = getattr(sys.modules["__main__"], "__spec__", None)
+        if main_spec is not None and main_spec.name:
+            module = main_spec.name.removesuffix(".__main__")
+            args = [sys.executable, "-m", module, *sys.argv[1:]]
+        else:
+            args = [sys.executable, *sys.argv]
+        os.execv(sys.executable, args)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from typing import Any
+
+from lbz.dev.load import LoadReport, LoadTest
 from lbz.resource import Resource
 from lbz.response import Response
 from lbz.rest import APIGatewayEvent
@@ -61,6 +65,32 @@ class Client:
     ) -> Response:
         return self._process(path, "DELETE", params, query_params, body, headers)
 
+    def build_event(
+        self,
+        path: str,
+        method: str = "GET",
+        params: dict | None = None,
+        query_params: dict | None = None,
+        body: dict | None = None,
+        headers: dict | None = None,
+    ) -> APIGatewayEvent:
+        """Builds the event of a request, e.g. once to be sent many times."""
+        return APIGatewayEvent(
+            resource_path=path,
+            method=method,
+            body=body,
+            path_params=params,
+            query_params=query_params,
+            headers=headers,
+        )
+
+    def send(self, event: dict) -> Response:
+        return self.resource(event)()
+
+    def load(self, events: Sequence[dict], **options: Any) -> LoadReport:
+        """Runs a load test with the events, see LoadTest for the options."""
+        return LoadTest(self.resource, events, **options).run()
+
     def _process(
         self,
         path: str,
@@ -70,13 +100,4 @@ class Client:
         body: dict | None,
         headers: dict | None,
     ) -> Response:
-        return self.resource(
-            APIGatewayEvent(
-                resource_path=path,
-                method=method,
-                body=body,
-                path_params=params,
-                query_params=query_params,
-                headers=headers,
-            )
-        )()
+        return self.send(self.build_event(path, method, params, query_params, body, headers))
@@ -1,4 +1,29 @@
-from lbz.events.api import EventAPI, event_emitter
-from lbz.events.broker import BaseEventBroker, CognitoEventBroker, EventBroker
-from lbz.events.enums import CognitoEventType
-from lbz.events.event import Event
+from typing import TYPE_CHECKING
+
+from lbz._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from lbz.events.api import EventAPI, event_emitter
+    from lbz.events.broker import BaseEventBroker, CognitoEventBroker, EventBroker
+    from lbz.events.enums import CognitoEventType
+    from lbz.events.event import Event
+    from lbz.events.outbox import DynamoDBOutbox, EventOutbox, FileOutbox
+    from lbz.events.schema import EventSchemaRegistry, event_schemas
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "EventAPI": "lbz.events.api",
+        "event_emitter": "lbz.events.api",
+        "BaseEventBroker": "lbz.events.broker",
+        "CognitoEventBroker": "lbz.events.broker",
+        "EventBroker": "lbz.events.broker",
+        "CognitoEventType": "lbz.events.enums",
+        "Event": "lbz.events.event",
+        "DynamoDBOutbox": "lbz.events.outbox",
+        "EventOutbox": "lbz.events.outbox",
+        "FileOutbox": "lbz.events.outbox",
+        "EventSchemaRegistry": "lbz.events.schema",
+        "event_schemas": "lbz.events.schema",
+    },
+)
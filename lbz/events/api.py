@@ -1,15 +1,21 @@
-from collections.abc import Callable
-from copy import deepcopy
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Sequence
 from functools import wraps
 from typing import TYPE_CHECKING, Any
 
 from lbz._cfg import AWS_LAMBDA_FUNCTION_NAME, EVENTS_BUS_NAME
 from lbz.aws_boto3 import client
+from lbz.deadline import io_timeout
 from lbz.events.event import Event
 from lbz.misc import Singleton, get_logger
+from lbz.snapshot import snapshot_hooks
+from lbz.tracing import tracer
 
 if TYPE_CHECKING:
     from mypy_boto3_events.type_defs import PutEventsRequestEntryTypeDef
+
+    from lbz.events.outbox import EventOutbox
 else:
     PutEventsRequestEntryTypeDef = dict
 
@@ -23,10 +29,12 @@ class EventAPI(metaclass=Singleton):
     def __init__(self) -> None:
         self._source = AWS_LAMBDA_FUNCTION_NAME.value
         self._resources: list[str] = []
-        self._pending_events: list[Event] = []
+        self._pending_events: dict[Hashable, Event] = {}
         self._sent_events: list[Event] = []
         self._failed_events: list[Event] = []
         self._bus_name = EVENTS_BUS_NAME.value
+        self._outbox: EventOutbox | None = None
+        self._deduplicate = False
 
     def __repr__(self) -> str:
         return (
@@ -43,43 +51,105 @@ class EventAPI(metaclass=Singleton):
     def set_bus_name(self, bus_name: str) -> None:
         self._bus_name = bus_name
 
+    def set_outbox(self, outbox: EventOutbox | None) -> None:
+        """Enables the outbox mode - pending events are stored durably before being sent."""
+        self._outbox = outbox
+
+    def set_deduplication(self, enabled: bool) -> None:
+        """Makes registering an event identical to a pending one replace it instead of adding."""
+        self._deduplicate = enabled
+
     @property
     def bus_name(self) -> str:
         return self._bus_name
 
     @property
-    def sent_events(self) -> list[Event]:
-        return deepcopy(self._sent_events)
+    def outbox(self) -> EventOutbox | None:
+        return self._outbox
 
     @property
-    def pending_events(self) -> list[Event]:
-        return deepcopy(self._pending_events)
+    def sent_events(self) -> tuple[Event, ...]:
+        return tuple(self._sent_events)
 
     @property
-    def failed_events(self) -> list[Event]:
-        return deepcopy(self._failed_events)
+    def pending_events(self) -> tuple[Event, ...]:
+        return tuple(self._pending_events.values())
 
-    def register(self, new_event: Event) -> None:
-        self._pending_events.append(new_event)
+    @property
+    def failed_events(self) -> tuple[Event, ...]:
+        return tuple(self._failed_events)
+
+    def register(self, new_event: Event, *, key: Hashable | None = None) -> None:
+        """Adds the event to the pending ones, validating it against its schema if registered.
+
+        Events sharing the key (explicit one, the entity declared by Event.coalesce_by or, when
+        deduplication is enabled, the event content) collapse into the last registered one.
+        """
+        new_event.validate()
+        if key is not None:
+            key = ("key", key)
+        elif (entity_key := new_event.coalescing_key) is not None:
+            key = ("entity", *entity_key)
+        elif self._deduplicate:
+            key = ("content", *new_event.content_key)
+        else:
+            key = object()
+        self._pending_events.pop(key, None)
+        self._pending_events[key] = new_event
 
     def send(self) -> None:
+        """Sends all pending events, in the outbox mode they are stored durably beforehand."""
+        pending_events = list(self._pending_events.values())
+        record_ids = self._outbox.save(pending_events) if self._outbox else None
+        self._pending_events = {}
+        self._flush(pending_events, record_ids)
+
+    def replay(self) -> None:
+        """Re-drives the events left in the outbox by previous unsuccessful attempts.
+
+        The delivery is at-least-once - events whose records were not removed after being sent
+        are sent again.
+        """
+        if self._outbox is None:
+            raise RuntimeError("Replaying events requires the outbox to be set!")
+        if records := self._outbox.load():
+            record_ids, events = zip(*records)
+            self._flush(list(events), list(record_ids))
+
+    def _flush(self, events: list[Event], record_ids: Sequence[str] | None) -> None:
         success = True
-        while self._pending_events:
-            events = self._pending_events[:MAX_EVENTS_TO_SEND_AT_ONCE]
+        for idx in range(0, len(events), MAX_EVENTS_TO_SEND_AT_ONCE):
+            chunk = slice(idx, idx + MAX_EVENTS_TO_SEND_AT_ONCE)
             try:
-                entries = [self._create_eb_entry(event) for event in events]
-                client.eventbridge.put_events(Entries=entries)
-                self._sent_events.extend(events)
+                with tracer.span("eventbridge.put_events", bus_name=self._bus_name):
+                    trace_header = tracer.trace_header()
+                    entries = [
+                        self._create_eb_entry(event, trace_header) for event in events[chunk]
+                    ]
+                    # events are sent after the request is handled, in the reserved time
+                    eventbridge = client.bounded(io_timeout(use_reserve=True)).eventbridge
+                    eventbridge.put_events(Entries=entries)
+                self._sent_events.extend(events[chunk])
             except Exception as err:  # pylint: disable=broad-except
-                self._failed_events.extend(events)
+                self._failed_events.extend(events[chunk])
                 logger.exception(err)
                 success = False
+                continue
 
-            self._pending_events = self._pending_events[MAX_EVENTS_TO_SEND_AT_ONCE:]
+            if record_ids:
+                self._remove_from_outbox(record_ids[chunk])
 
         if not success:
             raise RuntimeError("Sending events has failed. Check logs for more details!")
 
+    def _remove_from_outbox(self, record_ids: Sequence[str]) -> None:
+        # Events were already sent, so leaving their records only risks sending them again
+        try:
+            if self._outbox:
+                self._outbox.remove(record_ids)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Removing sent events from the outbox has failed")
+
     def clear(self) -> None:
         self.clear_sent()
         self.clear_pending()
@@ -89,19 +159,32 @@ class EventAPI(metaclass=Singleton):
         self._sent_events = []
 
     def clear_pending(self) -> None:
-        self._pending_events = []
+        self._pending_events = {}
 
     def clear_failed(self) -> None:
         self._failed_events = []
 
-    def _create_eb_entry(self, new_event: Event) -> PutEventsRequestEntryTypeDef:
-        return {
+    def _create_eb_entry(
+        self, new_event: Event, trace_header: str | None = None
+    ) -> PutEventsRequestEntryTypeDef:
+        entry: PutEventsRequestEntryTypeDef = {
             "Detail": new_event.serialized_data,
             "DetailType": new_event.type,
             "EventBusName": self._bus_name,
             "Resources": self._resources,
             "Source": self._source,
         }
+        if trace_header:
+            entry["TraceHeader"] = trace_header
+        return entry
+
+
+@snapshot_hooks.register_before_snapshot
+def _clear_event_api() -> None:
+    """Drops the events of the EventAPI if it was created, it is not created just for that."""
+    # pylint: disable-next=protected-access
+    if (event_api := Singleton._instances.get(EventAPI)) is not None:
+        event_api.clear()
 
 
 def event_emitter(function: Callable) -> Callable:
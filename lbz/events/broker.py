@@ -26,7 +26,13 @@ class BaseEventBroker(BaseHandler[None]):
     def handle(self) -> None:
         self.pre_handle()
 
-        for handler in self._get_handlers():
+        handlers = self._get_handlers()
+        try:
+            self.event.validate()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Validating event failed, event: %s", self.event)
+            handlers = []
+        for handler in handlers:
             try:
                 handler(deepcopy(self.event))
             except Exception:  # pylint: disable=broad-except
@@ -1,28 +1,142 @@
 from __future__ import annotations
 
 import json
+from typing import TYPE_CHECKING, Any, ClassVar
 
+from lbz.events.schema import event_schemas
 
-# TODO: Implement the hash method to stay compatible with pylint requirements
-class Event:  # pylint: disable=eq-without-hash
-    type: str
+_NOT_DECODED = object()
+
+
+class _EventTypeField:
+    """Resolves to the declared type on an Event class and to the actual one on its instances."""
+
+    def __get__(self, instance: Event | None, owner: type[Event]) -> str | None:
+        if instance is None:
+            return owner._declared_type
+        return instance._type
+
+
+class Event:
+    """Immutable representation of an event.
+
+    The serialized form of the event is computed only once, so the data passed to the event
+    must not be modified after its creation. Subclasses declaring a schema (a dataclass or
+    a TypedDict) get it registered for their type, so their data is validated and decoded.
+    """
+
+    __slots__ = ("_type", "_data", "_serialized_data", "_size", "_payload")
+
+    schema: ClassVar[type | None] = None
+    # Name of the data field identifying the entity - pending events of the same type sharing
+    # its value are coalesced by EventAPI, so only the last registered one is sent
+    coalesce_by: ClassVar[str | None] = None
+
+    _declared_type: str | None = None
+    _type: str
+    _data: dict
+    _serialized_data: str | None
+    _size: int | None
+    _payload: Any
+
+    if TYPE_CHECKING:
+        type: str
+    else:
+        type = _EventTypeField()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if isinstance(declared_type := cls.__dict__.get("type"), str):
+            cls._declared_type = declared_type
+            delattr(cls, "type")
+        if cls._declared_type is not None and cls.__dict__.get("schema") is not None:
+            event_schemas.register(cls._declared_type, cls.__dict__["schema"])
 
     def __init__(self, data: dict, *, event_type: str | None = None) -> None:
-        self.data = data
-        self.type = event_type or self.type
+        if not (event_type := event_type or self._declared_type):
+            raise ValueError(f"Type of the {self.__class__.__name__} event has to be declared")
+
+        self._set_fields(event_type, data)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Event):
             return self.type == other.type and self.data == other.data
         return False
 
+    def __hash__(self) -> int:
+        # Keys are enough to stay consistent with __eq__ regardless of the values' hashability
+        return hash((self._type, frozenset(self._data)))
+
     def __repr__(self) -> str:
         return f"Event(type='{self.type}', data={self.data})"
 
+    def __getstate__(self) -> tuple:
+        if self._payload is _NOT_DECODED:
+            return self._type, self._data
+        return self._type, self._data, self._payload
+
+    def __setstate__(self, state: tuple) -> None:
+        self._set_fields(state[0], state[1])
+        if len(state) == 3:
+            object.__setattr__(self, "_payload", state[2])
+
+    def _set_fields(self, event_type: str, data: dict) -> None:
+        object.__setattr__(self, "_type", event_type)
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_serialized_data", None)
+        object.__setattr__(self, "_size", None)
+        object.__setattr__(self, "_payload", _NOT_DECODED)
+
+    @property
+    def data(self) -> dict:
+        return self._data
+
+    @property
+    def coalescing_key(self) -> tuple[str, Any] | None:
+        """Type and entity of the event, compound entity ids (objects, arrays) are serialized."""
+        if self.coalesce_by is None or (entity_id := self._data.get(self.coalesce_by)) is None:
+            return None
+        if isinstance(entity_id, (dict, list)):
+            entity_id = json.dumps(entity_id, sort_keys=True, default=str)
+        return self._type, entity_id
+
+    @property
+    def content_key(self) -> tuple[str, str]:
+        """Type and canonical serialization of the data - equal for the same content."""
+        return self._type, json.dumps(self._data, sort_keys=True, default=str)
+
+    @property
+    def payload(self) -> Any:
+        """Data decoded with the schema registered for the event type (data itself otherwise)."""
+        self.validate()
+        return self._payload
+
+    def validate(self) -> None:
+        """Raises SchemaValidationError when the data does not match the registered schema."""
+        if self._payload is _NOT_DECODED:
+            object.__setattr__(self, "_payload", event_schemas.decode(self._type, self._data))
+
     @staticmethod
     def serialize(data: dict) -> str:
         return json.dumps(data, default=str)
 
     @property
     def serialized_data(self) -> str:
-        return self.serialize(self.data)
+        if (serialized_data := self._serialized_data) is None:
+            serialized_data = self.serialize(self._data)
+            object.__setattr__(self, "_serialized_data", serialized_data)
+        return serialized_data
+
+    @property
+    def size(self) -> int:
+        """Size of the serialized data in bytes."""
+        if (size := self._size) is None:
+            size = len(self.serialized_data.encode("utf-8"))
+            object.__setattr__(self, "_size", size)
+        return size
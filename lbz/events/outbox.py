@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import uuid
+from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable, Sequence
+
+from lbz.aws_boto3 import client
+from lbz.events.event import Event
+
+# https://docs.aws.amazon.com/amazondynamodb/latest/APIReference/API_BatchWriteItem.html
+MAX_ITEMS_TO_WRITE_AT_ONCE = 25
+MAX_WRITE_ATTEMPTS = 5
+# Records younger than this (seconds) may still be being sent by the container which saved them,
+# the maximum Lambda timeout by default
+DEFAULT_SEND_TIMEOUT = 900.0
+
+OutboxRecord = tuple[str, Event]
+
+
+class EventOutbox(metaclass=ABCMeta):
+    """Durable storage keeping the events until they are successfully sent.
+
+    The delivery is at-least-once: an event is sent again when removing its record fails or
+    when its sender dies after sending it, so the consumers have to be idempotent.
+    """
+
+    @abstractmethod
+    def save(self, events: Sequence[Event]) -> list[str]:
+        """Stores the events and returns identifiers of created records in the same order."""
+
+    @abstractmethod
+    def load(self) -> list[OutboxRecord]:
+        """Returns the records to be sent again, which were not removed yet."""
+
+    @abstractmethod
+    def remove(self, record_ids: Iterable[str]) -> None:
+        """Removes the records of events that were successfully sent."""
+
+    @staticmethod
+    def _new_record_id() -> str:
+        return str(uuid.uuid4())
+
+
+class FileOutbox(EventOutbox):
+    """Outbox storing the events in a local JSON lines file - meant for tests and local runs."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or os.path.join(tempfile.gettempdir(), "lbz-events-outbox.jsonl")
+
+    def __repr__(self) -> str:
+        return f"<FileOutbox path={self.path}>"
+
+    def save(self, events: Sequence[Event]) -> list[str]:
+        record_ids = [self._new_record_id() for _ in events]
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(
+                f'{{"id": "{record_id}", "type": {json.dumps(event.type)}, '
+                f'"data": {event.serialized_data}}}\n'
+                for record_id, event in zip(record_ids, events)
+            )
+        return record_ids
+
+    def load(self) -> list[OutboxRecord]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as file:
+            records = [json.loads(line) for line in file if line.strip()]
+        return [
+            (record["id"], Event(record["data"], event_type=record["type"])) for record in records
+        ]
+
+    def remove(self, record_ids: Iterable[str]) -> None:
+        ids_to_remove = set(record_ids)
+        if not ids_to_remove or not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as file:
+            lines = [line for line in file if json.loads(line)["id"] not in ids_to_remove]
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.writelines(lines)
+
+
+class DynamoDBOutbox(EventOutbox):
+    """Outbox storing the events in a DynamoDB table with the "id" string partition key.
+
+    The table is shared by all the containers, so only the records older than the send timeout
+    are loaded - the younger ones may still be being sent. Each loaded record is claimed with
+    a conditional update first, so containers replaying at once do not send it twice; a claim
+    expires after the send timeout as well, in case the claiming container dies.
+    """
+
+    # records saved before created_at was introduced are treated as old
+    _OLD_RECORD = "attribute_not_exists(created_at) OR created_at < :stale"
+    _UNCLAIMED_RECORD = "attribute_not_exists(claimed_at) OR claimed_at < :stale"
+
+    def __init__(self, table_name: str, send_timeout: float = DEFAULT_SEND_TIMEOUT) -> None:
+        self.table_name = table_name
+        self.send_timeout = send_timeout
+
+    def __repr__(self) -> str:
+        return f"<DynamoDBOutbox table={self.table_name}>"
+
+    def save(self, events: Sequence[Event]) -> list[str]:
+        record_ids = [self._new_record_id() for _ in events]
+        now = time.time()
+        self._batch_write(
+            {
+                "PutRequest": {
+                    "Item": {
+                        "id": {"S": record_id},
+                        "type": {"S": event.type},
+                        "data": {"S": event.serialized_data},
+                        "created_at": {"N": str(now)},
+                    }
+                }
+            }
+            for record_id, event in zip(record_ids, events)
+        )
+        return record_ids
+
+    def load(self) -> list[OutboxRecord]:
+        now = time.time()
+        stale = {":stale": {"N": str(now - self.send_timeout)}}
+        records = []
+        pages = client.dynamodb.get_paginator("scan").paginate(
+            TableName=self.table_name,
+            FilterExpression=f"({self._OLD_RECORD}) AND ({self._UNCLAIMED_RECORD})",
+            ExpressionAttributeValues=stale,
+        )
+        for page in pages:
+            for item in page["Items"]:
+                if self._claim(item["id"]["S"], now, stale):
+                    event = Event(json.loads(item["data"]["S"]), event_type=item["type"]["S"])
+                    records.append((item["id"]["S"], event))
+        return records
+
+    def remove(self, record_ids: Iterable[str]) -> None:
+        self._batch_write(
+            {"DeleteRequest": {"Key": {"id": {"S": record_id}}}} for record_id in record_ids
+        )
+
+    def _claim(self, record_id: str, now: float, stale: dict[str, dict[str, str]]) -> bool:
+        """Marks the record as being sent, False if it was claimed or removed in the meantime."""
+        try:
+            client.dynamodb.update_item(
+                TableName=self.table_name,
+                Key={"id": {"S": record_id}},
+                UpdateExpression="SET claimed_at = :now",
+                ConditionExpression=f"attribute_exists(id) AND ({self._UNCLAIMED_RECORD})",
+                ExpressionAttributeValues={**stale, ":now": {"N": str(now)}},
+            )
+        except client.dynamodb.exceptions.ConditionalCheckFailedException:
+            return False
+        return True
+
+    def _batch_write(self, requests: Iterable[dict]) -> None:
+        requests = list(requests)
+        for idx in range(0, len(requests), MAX_ITEMS_TO_WRITE_AT_ONCE):
+            unprocessed = {self.table_name: requests[idx : idx + MAX_ITEMS_TO_WRITE_AT_ONCE]}
+            for attempt in range(MAX_WRITE_ATTEMPTS):
+                if attempt:
+                    time.sleep(0.05 * 2**attempt)
+                response = client.dynamodb.batch_write_item(
+                    RequestItems=unprocessed  # type: ignore[arg-type]
+                )
+                if not (unprocessed := response.get("UnprocessedItems")):  # type: ignore
+                    break
+            else:
+                raise RuntimeError(f"Writing to {self.table_name} outbox has failed!")
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any
+
+from lbz.misc import Singleton
+from lbz.schema import CompiledSchema, compile_schema
+
+
+class EventSchemaRegistry(metaclass=Singleton):
+    """Compiled schemas of the events' data keyed by the event type."""
+
+    def __init__(self) -> None:
+        self._schemas: dict[str, CompiledSchema] = {}
+
+    def __repr__(self) -> str:
+        return f"<EventSchemaRegistry types={list(self._schemas)}>"
+
+    def __contains__(self, event_type: object) -> bool:
+        return event_type in self._schemas
+
+    def register(self, event_type: str, schema: type) -> None:
+        self._schemas[event_type] = compile_schema(schema)
+
+    def unregister(self, event_type: str) -> None:
+        self._schemas.pop(event_type, None)
+
+    def get(self, event_type: str) -> CompiledSchema | None:
+        return self._schemas.get(event_type)
+
+    def decode(self, event_type: str, data: dict) -> Any:
+        """Validates and decodes data of the event, passes it through if no schema is known."""
+        if (schema := self._schemas.get(event_type)) is None:
+            return data
+        return schema.decode(data)
+
+    def clear(self) -> None:
+        self._schemas = {}
+
+
+event_schemas = EventSchemaRegistry()
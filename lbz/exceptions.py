@@ -21,6 +21,19 @@ class ConfigValueParsingFailed(Exception):
         super().__init__(f"'{key}' could not parse '{value}'")
 
 
+class ConfigurationError(Exception):
+    def __init__(self, errors: dict[str, str]) -> None:
+        details = "; ".join(f"{key}: {message}" for key, message in errors.items())
+        super().__init__(f"Invalid configuration - {details}")
+        self.errors = errors
+
+
+class SchemaValidationError(Exception):
+    def __init__(self, errors: dict[str, str]) -> None:
+        super().__init__("; ".join(f"{path}: {message}" for path, message in errors.items()))
+        self.errors = errors
+
+
 class LambdaFWException(Exception):
     """Standardised for AWS Lambda exception class."""
 
@@ -297,6 +310,12 @@ class ServiceUnavailable(LambdaFWServerException):
     status_code = HTTPStatus.SERVICE_UNAVAILABLE.value
 
 
+class DeadlineExceeded(ServiceUnavailable):
+    """503 - The request could not be completed in time"""
+
+    message = "The request could not be completed in time"
+
+
 class GatewayTimeout(LambdaFWServerException):
     """504 - The gateway server did not receive a timely response"""
 
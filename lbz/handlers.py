@@ -3,7 +3,11 @@ from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 from typing import Generic, TypeVar
 
+from lbz.container import container_stats
+from lbz.deadline import Deadline, reset_deadline, set_deadline
 from lbz.misc import deprecated, get_logger
+from lbz.recording import event_recorder
+from lbz.tracing import TraceContext, tracer
 from lbz.type_defs import LambdaContext
 
 logger = get_logger(__name__)
@@ -18,11 +22,35 @@ class BaseHandler(Generic[T], metaclass=ABCMeta):
         self.response: T | None = None
 
     def react(self) -> T:
+        recording = event_recorder.start("handler", self.record_name(), self.raw_event)
+        cold_start = container_stats.start_invocation()
+        deadline = set_deadline(Deadline.from_context(self.context))
+        try:
+            if tracer.exporter is None:
+                response = self._run()
+            else:
+                response = self._run_traced(cold_start)
+        finally:
+            reset_deadline(deadline)
+        if recording is not None:
+            recording.finish(response)
+        return response
+
+    def _run(self) -> T:
         self.pre_handle()
         self.response = self.handle()
         self._post_handle()
         return self.response
 
+    def _run_traced(self, cold_start: bool) -> T:
+        with tracer.span(type(self).__name__, self.trace_context(), cold_start=cold_start):
+            self.pre_handle()
+            with tracer.span("handle"):
+                self.response = self.handle()
+            with tracer.span("post_handle"):
+                self._post_handle()
+            return self.response
+
     @deprecated(message="Please use react() for full request flow", version="0.7.0")
     def __call__(self) -> T:
         return self.react()
@@ -34,6 +62,15 @@ class BaseHandler(Generic[T], metaclass=ABCMeta):
     def pre_handle(self) -> None:
         pass
 
+    def record_name(self) -> str:
+        """Name the events are recorded under - the Lambda function, as handlers are shared."""
+        function_name = getattr(self.context, "function_name", None)
+        return function_name if isinstance(function_name, str) else type(self).__name__
+
+    def trace_context(self) -> TraceContext | None:
+        """Context of the caller the spans of the handler continue, if it passes one."""
+        return tracer.extract(None)
+
     def post_handle(self) -> None:
         pass
 
@@ -1,9 +1,16 @@
-from jose import jwt
-from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+from typing import TYPE_CHECKING
 
 from lbz._cfg import ALLOWED_AUDIENCES, ALLOWED_ISS, ALLOWED_PUBLIC_KEYS
 from lbz.exceptions import MissingConfigValue, SecurityError, Unauthorized
-from lbz.misc import get_logger
+from lbz.misc import LazyModule, get_logger
+from lbz.tracing import tracer
+
+if TYPE_CHECKING:
+    from jose import exceptions as jose_exceptions, jwt
+else:
+    # jose is needed only when a token is actually processed
+    jose_exceptions = LazyModule("jose.exceptions")
+    jwt = LazyModule("jose.jwt")
 
 logger = get_logger(__name__)
 
@@ -20,7 +27,7 @@ def get_matching_jwk(auth_jwt_token: str) -> dict:
             "The key with id=%s was not found in the environment variable.", kid_from_jwt_header
         )
         raise Unauthorized
-    except JWTError as error:
+    except jose_exceptions.JWTError as error:
         logger.warning("Error finding matching JWK %r", error)
         raise Unauthorized from error
     except KeyError as error:
@@ -38,8 +45,13 @@ def validate_jwt_properties(decoded_jwt: dict) -> None:
         raise Unauthorized(f"{issuer} is not an allowed token issuer")
 
 
-def decode_jwt(auth_jwt_token: str) -> dict:  # noqa:C901
+def decode_jwt(auth_jwt_token: str) -> dict:
     """Decodes JWT token."""
+    with tracer.span("jwt.decode"):
+        return _decode_jwt(auth_jwt_token)
+
+
+def _decode_jwt(auth_jwt_token: str) -> dict:  # noqa:C901
 
     if not ALLOWED_PUBLIC_KEYS.value:
         raise MissingConfigValue("ALLOWED_PUBLIC_KEYS")
@@ -56,13 +68,13 @@ def decode_jwt(auth_jwt_token: str) -> dict:  # noqa:C901
             decoded_jwt: dict = jwt.decode(auth_jwt_token, jwk, algorithms="RS256", audience=aud)
             validate_jwt_properties(decoded_jwt)
             return decoded_jwt
-        except JWTClaimsError as error:
+        except jose_exceptions.JWTClaimsError as error:
             if idx == len(ALLOWED_AUDIENCES.value):
                 logger.warning("Failed decoding JWT with any of JWK - details: %r", error)
                 raise Unauthorized() from error
-        except ExpiredSignatureError as error:
+        except jose_exceptions.ExpiredSignatureError as error:
             raise Unauthorized("Your token has expired. Please refresh it.") from error
-        except JWTError as error:
+        except jose_exceptions.JWTError as error:
             logger.warning("Failed decoding JWT with following details: %r", error)
             raise Unauthorized() from error
         except Exception as ex:
@@ -1,5 +1,24 @@
-from lbz.lambdas.broker import LambdaBroker
-from lbz.lambdas.client import LambdaClient
-from lbz.lambdas.enums import LambdaResult, LambdaSource
-from lbz.lambdas.exceptions import LambdaError
-from lbz.lambdas.response import LambdaResponse, lambda_error_response, lambda_ok_response
+from typing import TYPE_CHECKING
+
+from lbz._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from lbz.lambdas.broker import LambdaBroker
+    from lbz.lambdas.client import LambdaClient
+    from lbz.lambdas.enums import LambdaResult, LambdaSource
+    from lbz.lambdas.exceptions import LambdaError
+    from lbz.lambdas.response import LambdaResponse, lambda_error_response, lambda_ok_response
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "LambdaBroker": "lbz.lambdas.broker",
+        "LambdaClient": "lbz.lambdas.client",
+        "LambdaResult": "lbz.lambdas.enums",
+        "LambdaSource": "lbz.lambdas.enums",
+        "LambdaError": "lbz.lambdas.exceptions",
+        "LambdaResponse": "lbz.lambdas.response",
+        "lambda_error_response": "lbz.lambdas.response",
+        "lambda_ok_response": "lbz.lambdas.response",
+    },
+)
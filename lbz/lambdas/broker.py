@@ -1,14 +1,20 @@
 from collections.abc import Callable, Mapping
 
+from lbz.container import container_stats
+from lbz.deadline import check_deadline
 from lbz.exceptions import LambdaFWException
 from lbz.handlers import BaseHandler
 from lbz.lambdas.enums import LambdaResult
-from lbz.lambdas.response import LambdaResponse, lambda_error_response
+from lbz.lambdas.response import LambdaResponse, lambda_error_response, lambda_ok_response
 from lbz.misc import get_logger
+from lbz.tracing import TRACE_CLIENT_CONTEXT_KEY, TraceContext, tracer
 from lbz.type_defs import LambdaContext
 
 logger = get_logger(__name__)
 
+# Built-in operation returning the statistics of the container (unless the mapper defines it)
+CONTAINER_STATS_OP = "lbz.container_stats"
+
 
 class LambdaBroker(BaseHandler[LambdaResponse]):
     def __init__(
@@ -20,14 +26,24 @@ class LambdaBroker(BaseHandler[LambdaResponse]):
         super().__init__(event, context)
         self.mapper = mapper
 
+    def trace_context(self) -> TraceContext | None:
+        # the client context is None unless the caller has passed one
+        client_context = getattr(self.context, "client_context", None)
+        return tracer.extract(
+            (getattr(client_context, "custom", None) or {}).get(TRACE_CLIENT_CONTEXT_KEY)
+        )
+
     def handle(self) -> LambdaResponse:
         if not (op := self.raw_event.get("op")):
             logger.error('Missing "op" field in the processed event: %r', self.raw_event)
             return lambda_error_response(LambdaResult.CONTRACT_ERROR, 'Missing "op" field.')
+        if op == CONTAINER_STATS_OP and op not in self.mapper:
+            return lambda_ok_response(container_stats.to_dict())
         if not (handler := self.mapper.get(op)):
             logger.error('No handler declared for requested operation: "%s"', op)
             return lambda_error_response(LambdaResult.CONTRACT_ERROR, f'"{op}" not implemented.')
         try:
+            check_deadline()
             return handler(self.raw_event.get("data") or {})
         except LambdaFWException as err:
             logger.exception('Unexpected error in "%s" function!', handler.__name__)
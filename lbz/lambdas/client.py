@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+import base64
 import json
 from collections.abc import Iterable
 from typing import Any, cast
 
 from lbz.aws_boto3 import client
+from lbz.deadline import io_timeout
 from lbz.lambdas.enums import LambdaResult, LambdaSource
 from lbz.lambdas.exceptions import LambdaError
 from lbz.lambdas.response import LambdaResponse
 from lbz.misc import get_logger
 from lbz.response import Response
 from lbz.rest import APIGatewayEvent
+from lbz.tracing import TRACE_CLIENT_CONTEXT_KEY, TRACE_HEADER, tracer
 
 logger = get_logger(__name__)
 
@@ -86,11 +89,15 @@ class LambdaClient:
 
     @classmethod
     def _invoke(cls, function_name: str, payload: dict, asynchronous: bool = False) -> dict:
-        raw_response = client.lambda_.invoke(
-            FunctionName=function_name,
-            Payload=json.dumps(payload, cls=cls.json_encoder).encode("utf-8"),
-            InvocationType="Event" if asynchronous else "RequestResponse",
-        )
+        with tracer.span("lambda.invoke", function_name=function_name, asynchronous=asynchronous):
+            raw_response = client.bounded(io_timeout()).lambda_.invoke(
+                FunctionName=function_name,
+                Payload=json.dumps(cls._with_trace_header(payload), cls=cls.json_encoder).encode(
+                    "utf-8"
+                ),
+                InvocationType="Event" if asynchronous else "RequestResponse",
+                **cls._trace_client_context(payload, asynchronous),
+            )
 
         if asynchronous:
             # Lambda invoked asynchronously only includes a status code in the response
@@ -104,3 +111,28 @@ class LambdaClient:
             error_message = f"Invalid response received from {function_name} Lambda"
             logger.error(error_message, extra={"payload": payload, "response": raw_response})
             raise
+
+    @staticmethod
+    def _with_trace_header(payload: dict) -> dict:
+        """Returns a copy of HTTP-like events with the trace context added to the headers."""
+        if (
+            not isinstance(payload, APIGatewayEvent)
+            or (trace_header := tracer.trace_header()) is None
+        ):
+            return payload
+        return {**payload, "headers": {**payload["headers"], TRACE_HEADER: trace_header}}
+
+    @staticmethod
+    def _trace_client_context(payload: dict, asynchronous: bool) -> dict[str, Any]:
+        """Passes the trace context of other payloads in the client context, not in the data.
+
+        Lambda passes the client context to synchronous invocations only.
+        """
+        if (
+            asynchronous
+            or isinstance(payload, APIGatewayEvent)
+            or (trace_header := tracer.trace_header()) is None
+        ):
+            return {}
+        client_context = json.dumps({"custom": {TRACE_CLIENT_CONTEXT_KEY: trace_header}})
+        return {"ClientContext": base64.b64encode(client_context.encode("utf-8")).decode("ascii")}
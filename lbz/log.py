@@ -0,0 +1,117 @@
+"""Structured logging with the context of the handled request.
+
+Usage (at the module level of the Lambda handler):
+    setup_logging(json_format=True, sampling_rate=0.1)
+
+Every record is then printed as one JSON document including the request id, route, method
+and user of the request being handled, and only 10% of the records up to WARNING are kept.
+Resources fill the request context only once it is read by a JsonFormatter, or after
+enable_request_context() when it is read otherwise (get_request_context).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import sys
+from collections.abc import Mapping
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from typing import Any
+
+_request_context: ContextVar[Mapping[str, Any]] = ContextVar("lbz_request_context", default={})
+_request_context_enabled = False  # pylint: disable=invalid-name
+
+# Attributes of every LogRecord, anything else was passed in the extra argument
+_RECORD_ATTRIBUTES = frozenset(
+    [*vars(logging.LogRecord("", 0, "", 0, "", (), None)), "message", "asctime"]
+)
+
+
+def enable_request_context(enabled: bool = True) -> None:
+    """Makes the resources fill the request context, done by every created JsonFormatter."""
+    global _request_context_enabled  # pylint: disable=global-statement
+    _request_context_enabled = enabled
+
+
+def is_request_context_enabled() -> bool:
+    return _request_context_enabled
+
+
+def set_request_context(**fields: Any) -> Token[Mapping[str, Any]]:
+    """Replaces the context added to the records, the returned token restores the previous one."""
+    return _request_context.set(fields)
+
+
+def update_request_context(**fields: Any) -> None:
+    _request_context.set({**_request_context.get(), **fields})
+
+
+def reset_request_context(token: Token[Mapping[str, Any]]) -> None:
+    _request_context.reset(token)
+
+
+def get_request_context() -> Mapping[str, Any]:
+    return _request_context.get()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats the records as one-line JSON documents with the request context and extras."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        enable_request_context()
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **_request_context.get(),
+        }
+        document.update(
+            (key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES
+        )
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            document["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(document, default=repr, separators=(",", ":"))
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only the given fraction of the records up to max_level, the rest passes always."""
+
+    def __init__(self, rate: float, max_level: int = logging.WARNING) -> None:
+        super().__init__()
+        if not 0 <= rate <= 1:
+            raise ValueError(f"Sampling rate has to be between 0 and 1, got {rate}")
+        self.rate = rate
+        self.max_level = max_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > self.max_level or random.random() < self.rate
+
+
+def setup_logging(
+    *,
+    json_format: bool = True,
+    sampling_rate: float | None = None,
+    max_sampled_level: int = logging.WARNING,
+) -> None:
+    """Configures the handlers of the root logger (the one installed by the Lambda runtime).
+
+    A handler printing to stdout is added when there is none (e.g. when running locally).
+    """
+    root = logging.getLogger()
+    if not root.handlers:
+        root.addHandler(logging.StreamHandler(sys.stdout))
+    for handler in root.handlers:
+        if json_format:
+            handler.setFormatter(JsonFormatter())
+        for sampling_filter in [f for f in handler.filters if isinstance(f, SamplingFilter)]:
+            handler.removeFilter(sampling_filter)
+        if sampling_rate is not None:
+            handler.addFilter(SamplingFilter(sampling_rate, max_sampled_level))
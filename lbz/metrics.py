@@ -0,0 +1,250 @@
+"""Per-phase latency instrumentation of the requests handled by Resource.
+
+Nothing is measured until a sink is set, e.g. at the module level of the Lambda handler:
+    request_metrics.set_sink(EMFSink(namespace="MyService"))
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable
+from typing import TextIO
+
+from lbz.container import container_stats, get_max_memory
+from lbz.misc import Singleton, get_logger
+
+logger = get_logger(__name__)
+
+# Phases of Resource.__call__ in the order they are run
+PHASES = (
+    "pre_request_hook",
+    "routing",
+    "authentication",
+    "handler",
+    "error_handling",
+    "post_request_hook",
+)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestTimings:
+    """Durations (in milliseconds) of the phases the request went through.
+
+    The init duration is given only for the first request handled by the container.
+    """
+
+    __slots__ = (
+        "route",
+        "method",
+        "status_code",
+        "phases",
+        "total",
+        "cold_start",
+        "init_duration",
+        "max_memory",
+    )
+
+    def __init__(
+        self,
+        route: str | None,
+        method: str,
+        status_code: int,
+        phases: dict[str, float],
+        total: float,
+        *,
+        cold_start: bool = False,
+        init_duration: float | None = None,
+        max_memory: float | None = None,
+    ) -> None:
+        self.route = route or UNMATCHED_ROUTE
+        self.method = method
+        self.status_code = status_code
+        self.phases = phases
+        self.total = total
+        self.cold_start = cold_start
+        self.init_duration = init_duration
+        self.max_memory = max_memory
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestTimings {self.method} {self.route} status={self.status_code} "
+            f"total={self.total:.3f}ms>"
+        )
+
+
+class MetricsSink(metaclass=ABCMeta):
+    """Destination of the timings of handled requests."""
+
+    @abstractmethod
+    def record(self, timings: RequestTimings) -> None:
+        """Called after every request, must not raise (failures are logged and ignored)."""
+
+
+class EMFSink(MetricsSink):
+    """Prints the timings in the CloudWatch Embedded Metric Format.
+
+    Lambda sends stdout to CloudWatch Logs, which extracts the metrics without any API calls.
+    The metrics are dimensioned by the route and the method, the status code is a property.
+    """
+
+    def __init__(self, namespace: str = "Lambdalizator", stream: TextIO | None = None) -> None:
+        self.namespace = namespace
+        self.stream = stream
+
+    def __repr__(self) -> str:
+        return f"<EMFSink namespace={self.namespace}>"
+
+    def record(self, timings: RequestTimings) -> None:
+        metrics: dict[str, tuple[float, str]] = {
+            f"{phase}_duration": (duration, "Milliseconds")
+            for phase, duration in timings.phases.items()
+        }
+        metrics["total_duration"] = (timings.total, "Milliseconds")
+        metrics["cold_start"] = (int(timings.cold_start), "Count")
+        if timings.init_duration is not None:
+            metrics["init_duration"] = (timings.init_duration, "Milliseconds")
+        if timings.max_memory is not None:
+            metrics["max_memory"] = (timings.max_memory, "Megabytes")
+        document = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [["Route", "Method"]],
+                        "Metrics": [
+                            {"Name": name, "Unit": unit} for name, (_, unit) in metrics.items()
+                        ],
+                    }
+                ],
+            },
+            "Route": timings.route,
+            "Method": timings.method,
+            "StatusCode": timings.status_code,
+            **{name: value for name, (value, _) in metrics.items()},
+        }
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(document, separators=(",", ":")) + "\n")
+
+
+class InMemorySink(MetricsSink):
+    """Keeps the timings in memory and aggregates them - meant for tests and local benchmarks."""
+
+    def __init__(self) -> None:
+        self.records: list[RequestTimings] = []
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<InMemorySink records={len(self.records)}>"
+
+    def record(self, timings: RequestTimings) -> None:
+        with self._lock:
+            self.records.append(timings)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records = []
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Returns count, min, max, mean, p50 and p95 durations of every phase and the total."""
+        durations: dict[str, list[float]] = {}
+        for timings in list(self.records):
+            for phase, duration in timings.phases.items():
+                durations.setdefault(phase, []).append(duration)
+            durations.setdefault("total", []).append(timings.total)
+        return {phase: summarize(values) for phase, values in durations.items()}
+
+
+def summarize(
+    durations: Iterable[float], percentiles: Iterable[int] = (50, 95)
+) -> dict[str, float]:
+    """Returns count, min, max, mean and percentiles (p50, p95) of the (non-empty) durations."""
+    values = sorted(durations)
+    return {
+        "count": len(values),
+        "min": values[0],
+        "max": values[-1],
+        "mean": sum(values) / len(values),
+        **{f"p{percent}": _percentile(values, percent) for percent in percentiles},
+    }
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    rank = max(-(-len(sorted_values) * percent // 100), 1)
+    return sorted_values[rank - 1]
+
+
+class PhaseTimer:
+    """Measures the phases of one request, created only when metrics are on."""
+
+    __slots__ = ("_sink", "_phases", "_phase", "_started", "_phase_started")
+
+    def __init__(self, sink: MetricsSink) -> None:
+        self._sink = sink
+        self._phases: dict[str, float] = {}
+        self._phase: str | None = None
+        self._started = self._phase_started = time.perf_counter()
+
+    def start(self, phase: str) -> None:
+        """Ends the running phase (if any) and starts the given one."""
+        now = time.perf_counter()
+        self._end_phase(now)
+        self._phase, self._phase_started = phase, now
+
+    def finish(self, route: str | None, method: str, status_code: int) -> None:
+        """Ends the running phase and passes the timings to the sink."""
+        now = time.perf_counter()
+        self._end_phase(now)
+        cold_start = container_stats.cold_start
+        timings = RequestTimings(
+            route,
+            method,
+            status_code,
+            self._phases,
+            (now - self._started) * 1000,
+            cold_start=cold_start,
+            init_duration=container_stats.init_duration if cold_start else None,
+            max_memory=get_max_memory(),
+        )
+        try:
+            self._sink.record(timings)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Recording the request metrics in %r has failed", self._sink)
+
+    def _end_phase(self, now: float) -> None:
+        if self._phase is not None:
+            elapsed = (now - self._phase_started) * 1000
+            self._phases[self._phase] = self._phases.get(self._phase, 0.0) + elapsed
+            self._phase = None
+
+
+class RequestMetrics(metaclass=Singleton):
+    """Holds the sink receiving the timings of all the requests handled by resources."""
+
+    def __init__(self) -> None:
+        self._sink: MetricsSink | None = None
+
+    def __repr__(self) -> str:
+        return f"<RequestMetrics sink={self._sink!r}>"
+
+    @property
+    def sink(self) -> MetricsSink | None:
+        return self._sink
+
+    def set_sink(self, sink: MetricsSink | None) -> None:
+        """Enables the instrumentation, None disables it again."""
+        self._sink = sink
+
+    def timer(self) -> PhaseTimer | None:
+        """Timer of a request, None without a sink so that nothing is measured at all."""
+        if self._sink is None:
+            return None
+        return PhaseTimer(self._sink)
+
+
+request_metrics = RequestMetrics()
@@ -1,15 +1,18 @@
 """Misc Helpers of Lambda Framework."""
+
 from __future__ import annotations
 
 import copy
+import importlib
 import logging
-import logging.handlers
 import warnings
 from collections.abc import Callable, Hashable, Iterable, Iterator, MutableMapping
 from functools import wraps
+from types import ModuleType
 from typing import Any
 
 from lbz._cfg import LBZ_DEBUG_MODE, LOGGING_LEVEL
+from lbz._lazy import lazy_exports  # noqa: F401  # pylint: disable=unused-import
 
 
 class NestedDict(dict):
@@ -85,10 +88,31 @@ class MultiDict(MutableMapping):
         return [(key, values) for key, values in self._dict.items() if key not in keys_to_skip]
 
 
+class LazyModule(ModuleType):
+    """Module imported on the first access to any of its attributes.
+
+    Keeps heavy dependencies (e.g. boto3) out of the cold start of functions not using them.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._module: ModuleType | None = None
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self.__name__} loaded={self._module is not None}>"
+
+    def __getattr__(self, name: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return getattr(self._module, name)
+
+
 def get_logger(name: str) -> logging.Logger:
     """Shortcut for creating logger instance."""
     logger_obj = logging.getLogger(name)
-    logger_obj.setLevel(logging.getLevelName(LOGGING_LEVEL.value))
+    # setLevel clears the level caches of all the loggers, so it is called only when needed
+    if logger_obj.level != (level := logging.getLevelName(LOGGING_LEVEL.value)):
+        logger_obj.setLevel(level)
     return logger_obj
 
 
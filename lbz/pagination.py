@@ -0,0 +1,69 @@
+"""Opaque, signed continuation tokens for cursor (keyset) pagination.
+
+A cursor wraps the state needed to continue listing, e.g. DynamoDB's LastEvaluatedKey.
+Tokens are signed with PAGINATION_CURSOR_SECRET, so clients cannot forge the state.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any
+
+from lbz._cfg import PAGINATION_CURSOR_SECRET
+
+SIGNATURE_SIZE = 16
+
+
+class Cursor:
+    """Pagination state, backward cursors continue to the previous page."""
+
+    __slots__ = ("state", "backward")
+
+    def __init__(self, state: Any, backward: bool = False) -> None:
+        self.state = state
+        self.backward = backward
+
+    def __repr__(self) -> str:
+        return f"Cursor(state={self.state!r}, backward={self.backward})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Cursor):
+            return NotImplemented
+        return self.state == other.state and self.backward == other.backward
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    content = {"s": cursor.state, "b": 1} if cursor.backward else {"s": cursor.state}
+    payload = _b64encode(json.dumps(content, separators=(",", ":"), sort_keys=True).encode())
+    return f"{payload}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Raises ValueError when the token is malformed or its signature does not match."""
+    payload, _, signature = token.partition(".")
+    try:
+        valid = hmac.compare_digest(_b64decode(signature), _sign(payload))
+        content = json.loads(_b64decode(payload)) if valid else None
+    except ValueError as error:  # including binascii.Error
+        raise ValueError("Malformed pagination cursor") from error
+    if not isinstance(content, dict) or "s" not in content:
+        raise ValueError("Invalid pagination cursor")
+    return Cursor(content["s"], backward=bool(content.get("b")))
+
+
+def _sign(payload: str) -> bytes:
+    secret = PAGINATION_CURSOR_SECRET.value.encode()
+    return hmac.new(secret, payload.encode(), hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
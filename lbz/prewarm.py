@@ -0,0 +1,74 @@
+"""Moves the cost of lazily created objects from the first request to the Lambda init phase.
+
+Usage (at the module level of the Lambda handler):
+    lbz.warmup(clients=["dynamodb"], config_values=[TABLE_NAME], resources=[MyResource])
+
+    @warmer_ping_aware
+    def handle(event, context):
+        return MyResource(event)()
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable, Iterable
+from functools import wraps
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from lbz._cfg import ALLOWED_PUBLIC_KEYS
+from lbz.aws_boto3 import client
+from lbz.misc import get_logger
+from lbz.type_defs import LambdaContext
+
+if TYPE_CHECKING:
+    from lbz.configuration import ConfigValue
+    from lbz.resource import Resource
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+WARMER_PING_KEY = "warmer"
+# https://github.com/juanjoDiaz/serverless-plugin-warmup
+WARMER_PING_SOURCES = frozenset({"serverless-plugin-warmup"})
+
+
+def warmup(
+    *,
+    clients: Iterable[str] = (),
+    config_values: Iterable[ConfigValue] = (),
+    resources: Iterable[type[Resource]] = (),
+) -> None:
+    """Eagerly creates boto3 clients, resolves configuration values and warms up resources.
+
+    Clients are given by the Boto3Client attribute names, e.g. "dynamodb" or "lambda_".
+    """
+    for config_value in config_values:
+        config_value.value  # pylint: disable=pointless-statement
+    for client_name in clients:
+        getattr(client, client_name)
+    if ALLOWED_PUBLIC_KEYS.value:
+        importlib.import_module("jose.jwt")
+    for resource in resources:
+        resource.warmup()
+
+
+def is_warmer_ping(event: Any) -> bool:
+    return isinstance(event, dict) and (
+        event.get(WARMER_PING_KEY) is True or event.get("source") in WARMER_PING_SOURCES
+    )
+
+
+def warmer_ping_aware(
+    handler: Callable[[dict, LambdaContext], T],
+) -> Callable[[dict, LambdaContext], T | dict]:
+    """Answers warmer pings before the handler runs - keeping the container warm is enough."""
+
+    @wraps(handler)
+    def wrapped(event: dict, context: LambdaContext) -> T | dict:
+        if is_warmer_ping(event):
+            logger.debug("Warmer ping received, skipping the handler")
+            return {WARMER_PING_KEY: True}
+        return handler(event, context)
+
+    return wrapped
@@ -0,0 +1,249 @@
+"""Recording of sampled events and their responses, to be replayed against other builds.
+
+Resources and handlers record nothing until a store is set, e.g. at the module level of the
+Lambda handler:
+    event_recorder.set_store(JSONLinesStore("/tmp/events.jsonl.gz"), sample_rate=0.01)
+
+Credentials and personal data are redacted before anything is written - the sensitive headers
+and the values of the sensitive keys found anywhere in the events, the responses and the JSON
+bodies. The records are replayed with lbz.dev.replay.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any
+
+from lbz.misc import Singleton, get_logger
+
+logger = get_logger(__name__)
+
+REDACTED = "<redacted>"
+SENSITIVE_HEADERS = frozenset(
+    {
+        "authorization",
+        "authentication",
+        "cookie",
+        "set-cookie",
+        "x-api-key",
+        "x-amz-security-token",
+    }
+)
+SENSITIVE_KEYS = frozenset(
+    {
+        "password",
+        "secret",
+        "token",
+        "access_token",
+        "refresh_token",
+        "id_token",
+        "api_key",
+        "email",
+        "phone",
+        "phone_number",
+        "address",
+        "first_name",
+        "last_name",
+        "full_name",
+        "birth_date",
+        "ssn",
+        "claims",
+        "authorizer",
+        "identity",
+    }
+)
+
+
+def redact(value: Any, keys: frozenset[str] = SENSITIVE_KEYS | SENSITIVE_HEADERS) -> Any:
+    """Returns a copy with the values of the keys (case-insensitive) replaced, JSON strings too."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if str(key).lower() in keys else redact(item, keys)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item, keys) for item in value]
+    if isinstance(value, str) and value[:1] in ("{", "["):
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            return value
+        return json.dumps(redact(decoded, keys), separators=(",", ":"))
+    return value
+
+
+class EventRecord:
+    """Event handled by a resource ("resource" kind) or a handler, with its outcome."""
+
+    __slots__ = ("kind", "name", "event", "response", "duration", "recorded_at")
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        event: Any,
+        response: Any,
+        duration: float,
+        recorded_at: str | None = None,
+    ) -> None:
+        self.kind = kind
+        self.name = name
+        self.event = event
+        self.response = response
+        self.duration = duration  # milliseconds
+        self.recorded_at = recorded_at or datetime.now(timezone.utc).isoformat()
+
+    def __repr__(self) -> str:
+        return f"<EventRecord {self.kind} {self.name} duration={self.duration:.3f}ms>"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EventRecord:
+        return cls(**{key: data[key] for key in cls.__slots__})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class RecordStore(metaclass=ABCMeta):
+    """Destination of the recorded events."""
+
+    @abstractmethod
+    def write(self, record: EventRecord) -> None:
+        """Called for every sampled event, failures are logged and ignored."""
+
+
+class JSONLinesStore(RecordStore):
+    """Appends the records as JSON lines to the file, gzip compressed when its name ends in .gz."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<JSONLinesStore {self.path}>"
+
+    def write(self, record: EventRecord) -> None:
+        line = json.dumps(record.to_dict(), separators=(",", ":"), default=str) + "\n"
+        with self._lock, _open(self.path, "at") as file:
+            file.write(line)
+
+
+class InMemoryStore(RecordStore):
+    """Keeps the records in memory - meant for tests."""
+
+    def __init__(self) -> None:
+        self.records: list[EventRecord] = []
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<InMemoryStore records={len(self.records)}>"
+
+    def write(self, record: EventRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records = []
+
+
+def read_records(path: str | Path) -> Iterator[EventRecord]:
+    """Reads the records written by JSONLinesStore."""
+    with _open(Path(path), "rt") as file:
+        for line in file:
+            if line.strip():
+                yield EventRecord.from_dict(json.loads(line))
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode[0], encoding="utf-8")
+
+
+class Recording:
+    """Sampled event being handled, finished with its response."""
+
+    __slots__ = ("_recorder", "_kind", "_name", "_event", "_started")
+
+    def __init__(self, recorder: EventRecorder, kind: str, name: str, event: Any) -> None:
+        self._recorder = recorder
+        self._kind = kind
+        self._name = name
+        # redacted right away as the event may be modified while it is handled
+        self._event = redact(event, recorder.redacted_keys)
+        self._started = time.perf_counter()
+
+    def finish(self, response: Any) -> None:
+        duration = (time.perf_counter() - self._started) * 1000
+        record = EventRecord(
+            self._kind,
+            self._name,
+            self._event,
+            redact(response, self._recorder.redacted_keys),
+            duration,
+        )
+        self._recorder.write(record)
+
+
+class EventRecorder(metaclass=Singleton):
+    """Holds the store receiving the sampled events of all the resources and handlers."""
+
+    def __init__(self) -> None:
+        self._store: RecordStore | None = None
+        self._sample_rate = 1.0
+        self.redacted_keys = SENSITIVE_KEYS | SENSITIVE_HEADERS
+
+    def __repr__(self) -> str:
+        return f"<EventRecorder store={self._store!r} sample_rate={self._sample_rate}>"
+
+    @property
+    def store(self) -> RecordStore | None:
+        return self._store
+
+    def set_store(
+        self,
+        store: RecordStore | None,
+        sample_rate: float = 1.0,
+        redacted_keys: Iterable[str] | None = None,
+    ) -> None:
+        """Enables the recording of the sampled events, None disables it again.
+
+        The redacted keys (headers and other keys, case-insensitive) replace the default ones.
+        """
+        self._store = store
+        self._sample_rate = sample_rate
+        self.redacted_keys = (
+            SENSITIVE_KEYS | SENSITIVE_HEADERS
+            if redacted_keys is None
+            else frozenset(key.lower() for key in redacted_keys)
+        )
+
+    def start(self, kind: str, name: str, event: Any) -> Recording | None:
+        """Returns the recording of the event if it is sampled."""
+        if self._store is None or random.random() >= self._sample_rate:  # nosec B311
+            return None
+        try:
+            return Recording(self, kind, name, event)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Recording the %s event of %s has failed", kind, name)
+            return None
+
+    def write(self, record: EventRecord) -> None:
+        if (store := self._store) is None:
+            return
+        try:
+            store.write(record)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Writing %r to %r has failed", record, store)
+
+
+event_recorder = EventRecorder()
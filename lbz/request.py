@@ -2,23 +2,199 @@ from __future__ import annotations
 
 import base64
 import json
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping, Sequence
+from types import MappingProxyType
+from typing import Any, TypeVar
 
 from multidict import CIMultiDict
 
 from lbz.authentication import User
 from lbz.exceptions import BadRequestError
-from lbz.misc import MultiDict, get_logger
+from lbz.misc import get_logger
+from lbz.schema import BOOL_STRINGS
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+
+def _parse_bool(value: str) -> bool:
+    return BOOL_STRINGS[value.lower()]
+
+
+class QueryParams(Mapping[str, str]):
+    """Read-only query string parameters built once per request.
+
+    Accessing a key returns its last value, all values are available via getlist/get_list.
+    """
+
+    __slots__ = ("_lists", "_last")
+
+    def __init__(self, multi_value_params: Mapping[str, Iterable[str]] | None = None) -> None:
+        self._lists: dict[str, tuple[str, ...]] = {}
+        self._last: dict[str, str] = {}
+        if multi_value_params:  # most requests come without a query string
+            self._lists = {key: tuple(values) for key, values in multi_value_params.items()}
+            self._last = {key: values[-1] for key, values in self._lists.items() if values}
+
+    def __getitem__(self, key: str) -> str:
+        return self._last[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._last
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._last)
+
+    def __repr__(self) -> str:
+        return f"QueryParams({self._lists})"
+
+    @property
+    def lists(self) -> Mapping[str, tuple[str, ...]]:
+        """All the values of the parameters."""
+        return MappingProxyType(self._lists)
+
+    def getlist(self, key: str) -> tuple[str, ...]:
+        """Returns all values of the parameter, raises KeyError if it was not given."""
+        return self._lists[key]
+
+    def get_list(self, key: str, default: tuple[str, ...] = ()) -> tuple[str, ...]:
+        return self._lists.get(key, default)
+
+    def get_int(self, key: str, default: int | None = None) -> int | None:
+        """Returns the last value as an integer, raises BadRequestError if it is not one."""
+        return self._get_converted(key, default, int, "an integer")
+
+    def get_float(self, key: str, default: float | None = None) -> float | None:
+        return self._get_converted(key, default, float, "a number")
+
+    def get_bool(self, key: str, default: bool | None = None) -> bool | None:
+        """Accepts true/false and 1/0 regardless of the case."""
+        return self._get_converted(key, default, _parse_bool, "a boolean")
+
+    def original_items(
+        self, keys_to_skip: Iterable[str] | None = None
+    ) -> list[tuple[str, tuple[str, ...]]]:
+        skipped = frozenset(keys_to_skip or ())
+        return [(key, values) for key, values in self._lists.items() if key not in skipped]
+
+    def _get_converted(
+        self, key: str, default: T | None, converter: Callable[[str], T], expected: str
+    ) -> T | None:
+        if (value := self._last.get(key)) is None:
+            return default
+        try:
+            return converter(value)
+        except (KeyError, ValueError) as error:
+            raise BadRequestError(f"Query parameter '{key}' has to be {expected}") from error
+
+
+class Headers(MutableMapping[str, str]):
+    """Case-insensitive view over the headers of the API Gateway event.
+
+    Nothing is copied until the headers are modified, as requests carry dozens of them.
+    Values from multiValueHeaders take precedence, a key returns the last value of a header
+    and getall returns all of them. Lookups of the exact or lowercase spelling of a name
+    (e.g. "Content-Type" or "content-type") are answered directly. Others are checked against
+    all the names lowercased at once, the lowercase index of the names is built only when
+    a header is given in another spelling - not for the (usual) misses of absent headers.
+    """
+
+    __slots__ = ("_single", "_multi", "_index", "_names")
+
+    def __init__(
+        self,
+        headers: Mapping[str, str] | None = None,
+        multi_value_headers: Mapping[str, Sequence[str]] | None = None,
+    ) -> None:
+        self._single: Mapping[str, str] = headers or {}
+        self._multi: Mapping[str, Sequence[str]] = multi_value_headers or {}
+        self._index: dict[str, str] | None = None
+        self._names: str | None = None
+
+    def __getitem__(self, key: str) -> str:
+        return self.getall(key)[-1]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._get_index())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_index().values())
+
+    def __setitem__(self, key: str, value: str) -> None:
+        single, self._multi = self._without(key)
+        single[key] = value
+        self._single = single
+
+    def __delitem__(self, key: str) -> None:
+        single, multi = self._without(key)
+        if len(single) + len(multi) == len(self._single) + len(self._multi):
+            raise KeyError(key)
+        self._single, self._multi = single, multi
+
+    def __repr__(self) -> str:
+        return f"Headers({dict(self)})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # not raising KeyError as Mapping.get does, most requests lack some looked up headers
+        if (name := self._find(key)) is not None and (values := self._values(name)):
+            return values[-1]
+        return default
+
+    def getall(self, key: str) -> Sequence[str]:
+        """Returns all values of the header, raises KeyError if it was not given."""
+        if (name := self._find(key)) is None or not (values := self._values(name)):
+            raise KeyError(key)
+        return values
+
+    def _values(self, name: str) -> Sequence[str]:
+        if values := self._multi.get(name):
+            return values
+        if (value := self._single.get(name)) is not None:
+            return (value,)
+        return ()
+
+    def _find(self, key: str) -> str | None:
+        if key in self._multi or key in self._single:
+            return key
+        lowered = key.lower()
+        if lowered in self._multi or lowered in self._single:
+            return lowered
+        if self._names is None:
+            # all the lowercase names, each one between newlines (never part of a header name)
+            self._names = "\n".join(["", *self._single, *self._multi, ""]).lower()
+        if f"\n{lowered}\n" not in self._names:
+            return None
+        return self._get_index().get(lowered)
+
+    def _get_index(self) -> dict[str, str]:
+        if self._index is None:
+            self._index = {name.lower(): name for name in self._single}
+            self._index.update((name.lower(), name) for name in self._multi)
+        return self._index
+
+    def _without(self, key: str) -> tuple[dict[str, str], dict[str, Sequence[str]]]:
+        """Copies the headers leaving out all the spellings of the key."""
+        lowered = key.lower()
+        self._index = self._names = None
+        return (
+            {name: value for name, value in self._single.items() if name.lower() != lowered},
+            {name: values for name, values in self._multi.items() if name.lower() != lowered},
+        )
+
 
 class Request:
     """Represents request from API gateway."""
 
     def __init__(
         self,
-        headers: CIMultiDict,
+        headers: Headers | CIMultiDict,
         uri_params: dict,
         method: str,
         body: str | bytes | dict,
@@ -28,7 +204,7 @@ class Request:
         query_params: dict | None = None,
         user: User | None = None,
     ):
-        self.query_params = MultiDict(query_params or {})
+        self.query_params = QueryParams(query_params)
         self.headers = headers
         self.uri_params = uri_params
         self.method = method
@@ -1,29 +1,46 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from copy import deepcopy
 from http import HTTPStatus
+from typing import Any
 from urllib.parse import urlencode
 
-from multidict import CIMultiDict
-
+from lbz import prewarm
 from lbz._cfg import ALLOWED_PUBLIC_KEYS, CORS_HEADERS, CORS_ORIGIN
 from lbz.authentication import User
 from lbz.collector import authz_collector
+from lbz.configuration import ConfigValue
+from lbz.container import container_stats
+from lbz.deadline import check_deadline, deadline_expired
 from lbz.events.api import EventAPI
 from lbz.exceptions import (
+    BadRequestError,
+    DeadlineExceeded,
     LambdaFWException,
     NotFound,
     ServerError,
     Unauthorized,
     UnsupportedMethod,
 )
+from lbz.log import (
+    is_request_context_enabled,
+    reset_request_context,
+    set_request_context,
+    update_request_context,
+)
+from lbz.metrics import PhaseTimer, request_metrics
 from lbz.misc import get_logger, is_in_debug_mode
-from lbz.request import Request
+from lbz.pagination import Cursor, decode_cursor, encode_cursor
+from lbz.recording import event_recorder
+from lbz.request import Headers, Request
 from lbz.response import Response
 from lbz.router import Router
+from lbz.tracing import TRACE_HEADER, tracer
 
 ALLOW_ORIGIN_HEADER = "Access-Control-Allow-Origin"
+PAGINATION_PARAMS = frozenset({"offset", "limit"})
+CURSOR_PAGINATION_PARAMS = frozenset({"cursor", "limit"})
 
 logger = get_logger(__name__)
 
@@ -32,19 +49,34 @@ class Resource:
     _name: str = ""
     _router = Router()
     _authz_collector = authz_collector
+    _request_metrics = request_metrics
+    _tracer = tracer
+    _container_stats = container_stats
+    _event_recorder = event_recorder
+    # whether the request is traced, checked once per request so untraced ones skip the spans
+    _traced = False
+    # Boto3Client attribute names and configuration values initialized by warmup()
+    warmup_clients: tuple[str, ...] = ()
+    warmup_config_values: tuple[ConfigValue, ...] = ()
 
     @classmethod
     def get_name(cls) -> str:
         return cls._name or cls.__name__.lower()
 
+    @classmethod
+    def warmup(cls) -> None:
+        """Initializes what the resource creates lazily, meant to be run during Lambda init."""
+        prewarm.warmup(clients=cls.warmup_clients, config_values=cls.warmup_config_values)
+        cls.get_guest_authorization()
+
     def __init__(self, event: dict):
+        self.raw_event = event
         self.urn = event["path"]  # TODO: Variables should match corresponding event fields
         self.path = event.get("requestContext", {}).get("resourcePath")
         self.path_params = event.get("pathParameters") or {}  # DO NOT refactor
         self.method = event["requestContext"]["httpMethod"]
-        headers = CIMultiDict(event.get("headers", {}))
         self.request = Request(
-            headers=headers,
+            headers=Headers(event.get("headers"), event.get("multiValueHeaders")),
             uri_params=self.path_params,
             method=self.method,
             body=event["body"],
@@ -58,33 +90,107 @@ class Resource:
         self.response: Response = None  # type: ignore
 
     def __call__(self) -> Response:
+        recording = self._event_recorder.start("resource", self.get_name(), self.raw_event)
+        cold_start = self._container_stats.start_invocation()
+        log_context = (
+            set_request_context(
+                request_id=self.request.context.get("requestId"),
+                route=self.path,
+                method=self.method,
+            )
+            if is_request_context_enabled()
+            else None
+        )
+        self._traced = self._tracer.exporter is not None
+        if self._traced:
+            self._handle_traced_request(cold_start)
+        else:
+            self._handle_request()
+        if log_context is not None:
+            reset_request_context(log_context)
+        if recording is not None:
+            recording.finish(self.response.to_dict())
+        return self.response
+
+    def _handle_traced_request(self, cold_start: bool) -> None:
+        parent = self._tracer.extract(self.request.headers.get(TRACE_HEADER))
+        with self._tracer.span(
+            "resource", parent, route=self.path, method=self.method, cold_start=cold_start
+        ) as span:
+            self._handle_request()
+            span.set_attribute("status_code", self.response.status_code)
+
+    def _handle_request(self) -> None:
+        timer = self._request_metrics.timer()
         try:
+            if timer is not None:
+                timer.start("pre_request_hook")
             self.pre_request_hook()
 
-            if self.path is None or self.path not in self._router:
-                logger.warning("Couldn't find %s in current paths: %s", self.path, self._router)
-                raise NotFound
-            if self.method not in self._router[self.path]:
-                raise UnsupportedMethod(method=self.method)
-            self.request.user = self._get_user(self.request.headers)
-            endpoint: Callable = getattr(self, self._router[self.path][self.method])
-            self.response = endpoint(**self.path_params)
-        except LambdaFWException as err:
-            if 500 <= err.status_code < 600:
-                logger.exception(err)
-            else:
-                logger.warning(err, exc_info=is_in_debug_mode())
-            self.response = err.get_response(self.request.context["requestId"])
+            self.response = self._dispatch(timer)
         except Exception as err:  # pylint: disable=broad-except
-            logger.exception(err)
-            self.response = ServerError().get_response(self.request.context["requestId"])
+            if timer is not None:
+                timer.start("error_handling")
+            self.response = self._get_error_response(err)
+        if timer is not None:
+            timer.start("post_request_hook")
         self._post_request_hook()
-        return self.response
+        if timer is not None:
+            timer.finish(self.path, self.method, self.response.status_code)
 
     def __repr__(self) -> str:
         return f"<Resource {self.method} @ {self.urn} >"
 
-    def _get_user(self, headers: CIMultiDict) -> User | None:
+    def _dispatch(self, timer: PhaseTimer | None) -> Response:
+        """Finds the endpoint of the request, authenticates the user and runs the endpoint."""
+        if timer is not None:
+            timer.start("routing")
+        endpoint: Callable[..., Response] = getattr(self, self._find_endpoint())
+        if timer is not None:
+            timer.start("authentication")
+        self.request.user = self._authenticate()
+        check_deadline()
+        if timer is not None:
+            timer.start("handler")
+        if not self._traced:
+            return endpoint(**self.path_params)
+        with self._tracer.span("handler", endpoint=endpoint.__name__):
+            return endpoint(**self.path_params)
+
+    def _find_endpoint(self) -> str:
+        if self.path is None or self.path not in self._router:
+            logger.warning("Couldn't find %s among %d paths", self.path, len(self._router))
+            logger.debug("Current paths: %s", self._router)
+            raise NotFound
+        if self.method not in self._router[self.path]:
+            raise UnsupportedMethod(method=self.method)
+        endpoint_name: str = self._router[self.path][self.method]
+        return endpoint_name
+
+    def _authenticate(self) -> User | None:
+        if self._traced:
+            with self._tracer.span("authentication"):
+                user = self._get_user(self.request.headers)
+        else:
+            user = self._get_user(self.request.headers)
+        if user and is_request_context_enabled():
+            update_request_context(user=user.username)
+        return user
+
+    def _get_error_response(self, err: Exception) -> Response:
+        """Logs the error raised while handling the request and turns it into the response."""
+        if isinstance(err, LambdaFWException):
+            if 500 <= err.status_code < 600:
+                logger.exception(err)
+            else:
+                logger.warning(err, exc_info=is_in_debug_mode())
+            return err.get_response(self.request.context["requestId"])
+        logger.exception(err)
+        # e.g. a timeout of a call cut short by the deadline
+        error = DeadlineExceeded() if deadline_expired() else ServerError()
+        return error.get_response(self.request.context["requestId"])
+
+    def _get_user(self, headers: Mapping[str, str]) -> User | None:
         authentication = headers.get("Authentication")
         if authentication and ALLOWED_PUBLIC_KEYS.value:
             return User(authentication)
@@ -95,7 +201,11 @@ class Resource:
     def _post_request_hook(self) -> None:
         """Makes the post_request_hook run-time friendly."""
         try:
-            self.post_request_hook()
+            if self._traced:
+                with self._tracer.span("post_request_hook"):
+                    self.post_request_hook()
+            else:
+                self.post_request_hook()
         except Exception as err:  # pylint: disable=broad-except
             logger.exception(err)
 
@@ -169,6 +279,11 @@ class CORSResource(Resource):
                         return request_origin
         return origins[0]
 
+    @classmethod
+    def warmup(cls) -> None:
+        super().warmup()
+        prewarm.warmup(config_values=[CORS_HEADERS, CORS_ORIGIN])
+
     def resp_headers(self, content_type: str = "") -> dict:
         """Properly formatted headers."""
         return (
@@ -184,7 +299,11 @@ class CORSResource(Resource):
 
 
 class PaginatedCORSResource(CORSResource):
-    """Resource for standardised pagination."""
+    """Resource for standardised pagination.
+
+    Offset pagination (get_pagination) needs the total count of items, cursor pagination
+    (get_cursor/get_cursor_pagination) continues from the state of the last seen item instead.
+    """
 
     def get_pagination(self, total_items: int, limit: int, offset: int) -> dict:
         """Responsible for paginating the requests."""
@@ -206,12 +325,47 @@ class PaginatedCORSResource(CORSResource):
     @property
     def _pagination_uri(self) -> str:
         if query_params := self.request.query_params.original_items(
-            keys_to_skip=["offset", "limit"]
+            keys_to_skip=PAGINATION_PARAMS
         ):
             encoded_params = urlencode(query_params, doseq=True)
             return f"{self.urn}?{encoded_params}&offset={{offset}}&limit={{limit}}"
         return f"{self.urn}?offset={{offset}}&limit={{limit}}"
 
+    def get_cursor(self) -> Cursor | None:
+        """Decodes the cursor given in the query, None means the first page."""
+        if (token := self.request.query_params.get("cursor")) is None:
+            return None
+        try:
+            return decode_cursor(token)
+        except ValueError as error:
+            raise BadRequestError("Invalid pagination cursor") from error
+
+    def get_cursor_pagination(
+        self, limit: int, next_state: Any = None, prev_state: Any = None
+    ) -> dict:
+        """Creates links to the pages continuing from the given states (e.g. LastEvaluatedKey).
+
+        The state of the first item of the page can be given to link the previous page,
+        which is then requested with a backward cursor.
+        """
+        links = {"current": self._cursor_link(limit, self.request.query_params.get("cursor"))}
+        if next_state is not None:
+            links["next"] = self._cursor_link(limit, encode_cursor(Cursor(next_state)))
+        if prev_state is not None:
+            links["prev"] = self._cursor_link(
+                limit, encode_cursor(Cursor(prev_state, backward=True))
+            )
+        return {"links": links}
+
+    def _cursor_link(self, limit: int, token: str | None) -> str:
+        query_params: list[tuple[str, Any]] = self.request.query_params.original_items(
+            keys_to_skip=CURSOR_PAGINATION_PARAMS
+        )
+        if token is not None:
+            query_params.append(("cursor", token))
+        query_params.append(("limit", limit))
+        return f"{self.urn}?{urlencode(query_params, doseq=True)}"
+
 
 class EventAwareResource(Resource):
     def __init__(self, event: dict):
@@ -219,6 +373,12 @@ class EventAwareResource(Resource):
         self.event_api = EventAPI()
         self.event_api.clear()
 
+    @classmethod
+    def warmup(cls) -> None:
+        super().warmup()
+        EventAPI()
+        prewarm.warmup(clients=["eventbridge"])
+
     def post_request_hook(self) -> None:
         if self.response.is_ok():
             self.event_api.send()
@@ -1 +1,13 @@
-from lbz.rest.api_gateway_event import APIGatewayEvent
+from typing import TYPE_CHECKING
+
+from lbz._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from lbz.rest.api_gateway_event import APIGatewayEvent
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "APIGatewayEvent": "lbz.rest.api_gateway_event",
+    },
+)
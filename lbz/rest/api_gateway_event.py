@@ -17,7 +17,7 @@ class APIGatewayEvent(dict):
         resource_path: str,
         path_params: dict | None = None,
         query_params: dict | None = None,
-        body: dict | None = None,
+        body: dict | str | None = None,
         headers: dict | None = None,
         is_base64_encoded: bool = False,
     ) -> None:
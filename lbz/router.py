@@ -1,14 +1,28 @@
+from __future__ import annotations
+
 import json
 from collections.abc import Callable, Iterator
 from functools import wraps
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from lbz.exceptions import BadRequestError, SchemaValidationError, UnprocessableEntity
 from lbz.misc import NestedDict, Singleton
+from lbz.schema import (
+    ROOT_PATH,
+    CompiledQuerySchema,
+    CompiledSchema,
+    compile_query_schema,
+    compile_schema,
+)
+
+if TYPE_CHECKING:
+    from lbz.request import Request
 
 
 class Router(metaclass=Singleton):
     def __init__(self) -> None:
         self._routes = NestedDict()
+        self._version = 0
 
     def __getitem__(self, route: str) -> Any:
         return self._routes[route]
@@ -28,16 +42,33 @@ class Router(metaclass=Singleton):
     def __iter__(self) -> Iterator:
         return self._routes.__iter__()
 
+    @property
+    def version(self) -> int:
+        """Changes whenever the routes change, e.g. to invalidate what was derived from them."""
+        return self._version
+
     def add_route(self, route: str, method: str, handler: str) -> None:
         """Registers handler to route and method."""
         self._routes[route][method] = handler
+        self._version += 1
 
     def clear(self) -> None:
         self._routes = NestedDict()
+        self._version += 1
+
 
+def add_route(
+    route: str, method: str = "GET", *, body: type | None = None, query: type | None = None
+) -> Callable:
+    """Flask-like wrapper for adding routes.
 
-def add_route(route: str, method: str = "GET") -> Callable:
-    """Flask-like wrapper for adding routes."""
+    Schemas (dataclasses or TypedDicts) given as body and query are compiled once here,
+    the handler receives the decoded objects in the "body" and "query" keyword arguments.
+    """
+    body_schema: CompiledSchema | None = compile_schema(body) if body is not None else None
+    query_schema: CompiledQuerySchema | None = (
+        compile_query_schema(query) if query is not None else None
+    )
 
     def wrapper(func: Callable) -> Callable:
         router = Router()
@@ -45,8 +76,31 @@ def add_route(route: str, method: str = "GET") -> Callable:
 
         @wraps(func)
         def wrapped(self: Any, *func_args: Any, **func_kwargs: Any) -> Any:
+            if body_schema is not None:
+                func_kwargs["body"] = _decode_body(body_schema, self.request)
+            if query_schema is not None:
+                func_kwargs["query"] = _decode_query(query_schema, self.request)
             return func(self, *func_args, **func_kwargs)
 
         return wrapped
 
     return wrapper
+
+
+def _decode_body(schema: CompiledSchema, request: Request) -> Any:
+    """Malformed bodies end with 400, well-formed ones with invalid fields with 422."""
+    if (payload := request.json_body) is None:
+        raise BadRequestError("Request body is required")
+    try:
+        return schema.decode(payload)
+    except SchemaValidationError as error:
+        if ROOT_PATH in error.errors:
+            raise BadRequestError(str(error)) from error
+        raise UnprocessableEntity(str(error)) from error
+
+
+def _decode_query(schema: CompiledQuerySchema, request: Request) -> Any:
+    try:
+        return schema.decode_params(request.query_params.lists)
+    except SchemaValidationError as error:
+        raise BadRequestError(f"Invalid query parameters - {error}") from error
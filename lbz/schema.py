@@ -0,0 +1,372 @@
+"""Schemas compiled once into validating decoders.
+
+Supported schemas are dataclasses, TypedDicts and the following annotations nested in them:
+builtin scalars, Any, Optional/Union, Literal, Enum, list, tuple, set, frozenset and dict.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import enum
+import types
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any, Generic, Literal, TypeVar, Union, get_args, get_origin, get_type_hints
+
+from lbz.exceptions import SchemaValidationError
+
+T = TypeVar("T")
+
+# (value, path, errors) -> decoded value; errors are collected instead of being raised
+Decoder = Callable[[Any, str, dict[str, str]], Any]
+
+ROOT_PATH = "$"
+# strings accepted as booleans in query parameters, shared with lbz.request
+BOOL_STRINGS = {"true": True, "1": True, "false": False, "0": False}
+NoneType = type(None)
+# pylint: disable-next=consider-alternative-union-syntax
+UNION_TYPES: tuple[Any, ...] = (Union, getattr(types, "UnionType", Union))
+
+
+class CompiledSchema(Generic[T]):
+    """Validating decoder built once per schema."""
+
+    def __init__(self, schema: Any) -> None:
+        self.schema = schema
+        self._decoder = _compile(schema)
+
+    def __repr__(self) -> str:
+        return f"<CompiledSchema {getattr(self.schema, '__name__', self.schema)}>"
+
+    def decode(self, data: Any) -> T:
+        """Validates the data and converts it into the schema representation.
+
+        Raises SchemaValidationError with all the detected problems at once.
+        """
+        errors: dict[str, str] = {}
+        decoded: T = self._decoder(data, "", errors)
+        if errors:
+            raise SchemaValidationError(errors)
+        return decoded
+
+    def validate(self, data: Any) -> None:
+        self.decode(data)
+
+
+class CompiledQuerySchema(CompiledSchema[T]):
+    """Compiled schema of query parameters (a dataclass or TypedDict).
+
+    Parameters come as lists of strings, so they are converted into the declared scalar types
+    first - the last value is taken unless the field is declared as a collection.
+    """
+
+    def __init__(self, schema: Any) -> None:
+        if not (dataclasses.is_dataclass(schema) or _is_typed_dict(schema)):
+            raise TypeError(f"Query schema has to be a dataclass or TypedDict: {schema!r}")
+        super().__init__(schema)
+        self._converters = {
+            name: _query_converter(hint) for name, hint in get_type_hints(schema).items()
+        }
+
+    def decode_params(self, params: Mapping[str, Sequence[str]]) -> T:
+        return self.decode(
+            {
+                name: convert(params[name])
+                for name, convert in self._converters.items()
+                if name in params
+            }
+        )
+
+
+_compiled_schemas: dict[Any, CompiledSchema] = {}
+_compiled_query_schemas: dict[Any, CompiledQuerySchema] = {}
+_decoders: dict[Any, Decoder] = {}
+
+
+def compile_schema(schema: type[T]) -> CompiledSchema[T]:
+    """Returns the compiled schema - compilation happens only on the first call."""
+    if (compiled := _compiled_schemas.get(schema)) is None:
+        compiled = _compiled_schemas[schema] = CompiledSchema[T](schema)
+    return compiled
+
+
+def compile_query_schema(schema: type[T]) -> CompiledQuerySchema[T]:
+    """Returns the compiled query schema - compilation happens only on the first call."""
+    if (compiled := _compiled_query_schemas.get(schema)) is None:
+        compiled = _compiled_query_schemas[schema] = CompiledQuerySchema[T](schema)
+    return compiled
+
+
+def _join(path: str, key: str | int) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else key
+
+
+def _error(errors: dict[str, str], path: str, message: str) -> None:
+    errors[path or ROOT_PATH] = message
+
+
+def _compile(tp: Any) -> Decoder:
+    if (decoder := _decoders.get(tp)) is None:
+        decoder = _decoders[tp] = _build_decoder(tp)
+    return decoder
+
+
+def _build_decoder(tp: Any) -> Decoder:  # noqa: C901
+    # pylint: disable=too-many-branches,too-many-return-statements
+    if tp is Any or tp is object:
+        return lambda value, path, errors: value
+    if tp is None or tp is NoneType:
+        return _scalar_decoder(NoneType, "null")
+    if tp is bool:
+        return _scalar_decoder(bool, "boolean")
+    if tp is int:
+        return _int_decoder
+    if tp is float:
+        return _float_decoder
+    if tp is str:
+        return _scalar_decoder(str, "string")
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return _enum_decoder(tp)
+    if dataclasses.is_dataclass(tp) and isinstance(tp, type):
+        return _recursive(tp, _dataclass_decoder)
+    if _is_typed_dict(tp):
+        return _recursive(tp, _typed_dict_decoder)
+
+    origin, args = get_origin(tp), get_args(tp)
+    if origin in UNION_TYPES:
+        return _union_decoder(args)
+    if origin is Literal:
+        return _literal_decoder(args)
+    if tp in (list, tuple, set, frozenset) or origin in (list, tuple, set, frozenset):
+        return _collection_decoder(origin or tp, args)
+    if tp is dict or origin is dict:
+        return _dict_decoder(args)
+    raise TypeError(f"Unsupported schema type: {tp!r}")
+
+
+def _is_typed_dict(tp: Any) -> bool:
+    return isinstance(tp, type) and issubclass(tp, dict) and hasattr(tp, "__required_keys__")
+
+
+def _recursive(tp: type, builder: Callable[[type], Decoder]) -> Decoder:
+    """Allows schemas referring to themselves by registering a trampoline before building."""
+    built: list[Decoder] = []
+
+    def trampoline(value: Any, path: str, errors: dict[str, str]) -> Any:
+        return built[0](value, path, errors)
+
+    _decoders[tp] = trampoline
+    try:
+        built.append(builder(tp))
+    except Exception:
+        # not to leave the trampoline without the decoder behind
+        _decoders.pop(tp, None)
+        raise
+    return built[0]
+
+
+def _scalar_decoder(expected: type, name: str) -> Decoder:
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        if not isinstance(value, expected):
+            _error(errors, path, f"Expected {name}")
+        return value
+
+    return decode
+
+
+def _int_decoder(value: Any, path: str, errors: dict[str, str]) -> Any:
+    if not isinstance(value, int) or isinstance(value, bool):
+        _error(errors, path, "Expected integer")
+    return value
+
+
+def _float_decoder(value: Any, path: str, errors: dict[str, str]) -> Any:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        _error(errors, path, "Expected number")
+        return value
+    return float(value)
+
+
+def _enum_decoder(enum_cls: type[enum.Enum]) -> Decoder:
+    allowed = ", ".join(repr(member.value) for member in enum_cls)
+
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        try:
+            return enum_cls(value)
+        except ValueError:
+            _error(errors, path, f"Expected one of: {allowed}")
+            return value
+
+    return decode
+
+
+def _literal_decoder(options: tuple) -> Decoder:
+    allowed = ", ".join(repr(option) for option in options)
+
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        if value not in options:
+            _error(errors, path, f"Expected one of: {allowed}")
+        return value
+
+    return decode
+
+
+def _union_decoder(options: tuple) -> Decoder:
+    decoders = [_compile(option) for option in options if option is not NoneType]
+    nullable = len(decoders) != len(options)
+
+    if nullable and len(decoders) == 1:
+        (inner,) = decoders
+
+        def decode_optional(value: Any, path: str, errors: dict[str, str]) -> Any:
+            return None if value is None else inner(value, path, errors)
+
+        return decode_optional
+
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        if value is None and nullable:
+            return None
+        for decoder in decoders:
+            option_errors: dict[str, str] = {}
+            decoded = decoder(value, path, option_errors)
+            if not option_errors:
+                return decoded
+        _error(errors, path, "Value does not match any of the allowed types")
+        return value
+
+    return decode
+
+
+def _collection_decoder(container: type, args: tuple) -> Decoder:
+    if container is tuple and args and args[-1] is not Ellipsis:
+        return _fixed_tuple_decoder(args)
+    item_decoder = _compile(args[0] if args else Any)
+    accepted = (list, tuple) if container in (list, tuple) else (list, tuple, set, frozenset)
+
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        if not isinstance(value, accepted):
+            _error(errors, path, "Expected array")
+            return value
+        return container(
+            item_decoder(item, _join(path, idx), errors) for idx, item in enumerate(value)
+        )
+
+    return decode
+
+
+def _fixed_tuple_decoder(args: tuple) -> Decoder:
+    item_decoders = [_compile(arg) for arg in args]
+
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        if not isinstance(value, (list, tuple)) or len(value) != len(item_decoders):
+            _error(errors, path, f"Expected array of {len(item_decoders)} items")
+            return value
+        return tuple(
+            item_decoder(item, _join(path, idx), errors)
+            for idx, (item_decoder, item) in enumerate(zip(item_decoders, value))
+        )
+
+    return decode
+
+
+def _dict_decoder(args: tuple) -> Decoder:
+    key_decoder = _compile(args[0] if args else Any)
+    value_decoder = _compile(args[1] if args else Any)
+
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        if not isinstance(value, dict):
+            _error(errors, path, "Expected object")
+            return value
+        return {
+            key_decoder(key, _join(path, key), errors): value_decoder(
+                item, _join(path, key), errors
+            )
+            for key, item in value.items()
+        }
+
+    return decode
+
+
+def _fields_decoder(fields: list[tuple[str, Decoder, bool]]) -> Callable:
+    """Decodes only the declared fields, unknown ones are skipped to stay forward compatible."""
+
+    def decode_fields(value: Any, path: str, errors: dict[str, str]) -> dict | None:
+        if not isinstance(value, dict):
+            _error(errors, path, "Expected object")
+            return None
+        decoded = {}
+        for name, decoder, required in fields:
+            if name in value:
+                decoded[name] = decoder(value[name], _join(path, name), errors)
+            elif required:
+                _error(errors, _join(path, name), "Field required")
+        return decoded
+
+    return decode_fields
+
+
+def _dataclass_decoder(schema: type) -> Decoder:
+    hints = get_type_hints(schema)
+    decode_fields = _fields_decoder(
+        [
+            (
+                field.name,
+                _compile(hints[field.name]),
+                field.default is dataclasses.MISSING
+                and field.default_factory is dataclasses.MISSING,
+            )
+            for field in dataclasses.fields(schema)
+            if field.init
+        ]
+    )
+
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        errors_before = len(errors)
+        decoded = decode_fields(value, path, errors)
+        if decoded is None or len(errors) != errors_before:
+            return value
+        return schema(**decoded)
+
+    return decode
+
+
+def _query_converter(tp: Any) -> Callable[[Sequence[str]], Any]:
+    origin, args = get_origin(tp), get_args(tp)
+    if origin in UNION_TYPES and len(options := [arg for arg in args if arg is not NoneType]) == 1:
+        return _query_converter(options[0])
+    if tp in (list, tuple, set, frozenset) or origin in (list, tuple, set, frozenset):
+        convert_item = _scalar_converter(args[0] if args else str)
+        return lambda values: [convert_item(value) for value in values]
+    convert = _scalar_converter(tp)
+    return lambda values: convert(values[-1])
+
+
+def _scalar_converter(tp: Any) -> Callable[[str], Any]:
+    """Converts strings into the type, values that cannot be converted are left for the decoder."""
+    if tp is bool:
+        return lambda value: BOOL_STRINGS.get(value.lower(), value)
+    if tp in (int, float):
+
+        def convert(value: str) -> Any:
+            try:
+                return tp(value)
+            except ValueError:
+                return value
+
+        return convert
+    return lambda value: value
+
+
+def _typed_dict_decoder(schema: type) -> Decoder:
+    hints = get_type_hints(schema)
+    required_keys = schema.__required_keys__  # type: ignore[attr-defined]
+    decode_fields = _fields_decoder(
+        [(name, _compile(hint), name in required_keys) for name, hint in hints.items()]
+    )
+
+    def decode(value: Any, path: str, errors: dict[str, str]) -> Any:
+        decoded = decode_fields(value, path, errors)
+        return value if decoded is None else decoded
+
+    return decode
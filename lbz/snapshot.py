@@ -0,0 +1,76 @@
+"""Hooks keeping the process state valid when it is restored from a snapshot (e.g. SnapStart).
+
+Connections and time-sensitive values captured in a snapshot are stale after the restore,
+so lbz clients and caches register hooks dropping them here. When running in a runtime
+providing snapshot_restore_py, the hooks are run by it automatically.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from lbz.misc import Singleton, get_logger
+
+logger = get_logger(__name__)
+
+Hook = Callable[[], None]
+
+
+class SnapshotHooks(metaclass=Singleton):
+    """Registry of functions run before taking and after restoring a snapshot of the process."""
+
+    def __init__(self) -> None:
+        self._before_snapshot: list[Hook] = []
+        self._after_restore: list[Hook] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"<SnapshotHooks before_snapshot={len(self._before_snapshot)} "
+            f"after_restore={len(self._after_restore)}>"
+        )
+
+    def register_before_snapshot(self, hook: Hook) -> Hook:
+        """Registers the hook, can be used as a decorator."""
+        self._before_snapshot.append(hook)
+        return hook
+
+    def register_after_restore(self, hook: Hook) -> Hook:
+        """Registers the hook, can be used as a decorator."""
+        self._after_restore.append(hook)
+        return hook
+
+    def unregister(self, hook: Hook) -> None:
+        for hooks in (self._before_snapshot, self._after_restore):
+            while hook in hooks:
+                hooks.remove(hook)
+
+    def run_before_snapshot(self) -> None:
+        self._run(self._before_snapshot)
+
+    def run_after_restore(self) -> None:
+        self._run(self._after_restore)
+
+    @staticmethod
+    def _run(hooks: list[Hook]) -> None:
+        """Runs all the hooks - a failing one must not leave the rest of the state stale."""
+        for hook in list(hooks):
+            try:
+                hook()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Running the snapshot hook %r has failed", hook)
+
+
+snapshot_hooks = SnapshotHooks()
+
+
+def _register_in_runtime() -> None:
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        import snapshot_restore_py
+    except ImportError:
+        return
+    snapshot_restore_py.register_before_snapshot(snapshot_hooks.run_before_snapshot)
+    snapshot_restore_py.register_after_restore(snapshot_hooks.run_after_restore)
+
+
+_register_in_runtime()
@@ -0,0 +1,290 @@
+"""Spans around the I/O of lbz and propagation of the trace context between lambdas.
+
+The context is carried in the X-Ray format (X-Amzn-Trace-Id header, EventBridge TraceHeader),
+its trace id and span ids are also valid OpenTelemetry ones. Nothing is recorded until
+an exporter is set, e.g. at the module level of the Lambda handler:
+    tracer.set_exporter(XRayExporter())
+
+The trace header is propagated even without an exporter when Lambda runs with active tracing.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import Any
+
+from lbz.misc import Singleton, get_logger
+
+logger = get_logger(__name__)
+
+TRACE_HEADER = "X-Amzn-Trace-Id"
+# Key of the trace header in the custom client context of lambdas invoked directly
+TRACE_CLIENT_CONTEXT_KEY = "trace_header"
+# Set by Lambda for every invocation when active tracing is enabled
+LAMBDA_TRACE_ENV = "_X_AMZN_TRACE_ID"
+DEFAULT_DAEMON_ADDRESS = "127.0.0.1:2000"
+
+
+class TraceContext:
+    """Identifies the trace and the span the following spans are children of."""
+
+    __slots__ = ("trace_id", "parent_id", "sampled")
+
+    def __init__(self, trace_id: str, parent_id: str | None = None, sampled: bool = True) -> None:
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+
+    def __repr__(self) -> str:
+        return f"<TraceContext {self.to_header()}>"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, TraceContext) and (
+            (self.trace_id, self.parent_id, self.sampled)
+            == (other.trace_id, other.parent_id, other.sampled)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @classmethod
+    def from_header(cls, header: str | None) -> TraceContext | None:
+        """Parses the X-Ray header (Root=1-5759e988-bd862e3fe1be46a994272793;Parent=...)."""
+        if not header:
+            return None
+        fields = dict(part.strip().split("=", 1) for part in header.split(";") if "=" in part)
+        root = fields.get("Root", "").split("-")
+        if len(root) != 3 or len(root[1]) + len(root[2]) != 32:
+            return None
+        return cls(root[1] + root[2], fields.get("Parent"), fields.get("Sampled") != "0")
+
+    def to_header(self) -> str:
+        header = f"Root=1-{self.trace_id[:8]}-{self.trace_id[8:]}"
+        if self.parent_id:
+            header += f";Parent={self.parent_id}"
+        return f"{header};Sampled={int(self.sampled)}"
+
+    @classmethod
+    def new(cls) -> TraceContext:
+        # X-Ray requires the trace id to start with the epoch time of the request
+        return cls(f"{int(time.time()):08x}{secrets.token_hex(12)}")
+
+
+class Span:
+    """Span of a traced operation, this base one records nothing when tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> Span:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+class RecordingSpan(Span):
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "sampled",
+        "attributes",
+        "start_time",
+        "end_time",
+        "error",
+        "_tracer",
+        "_token",
+    )
+
+    def __init__(
+        self, owner: Tracer, name: str, parent: TraceContext, attributes: dict[str, Any]
+    ) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id
+        self.parent_id = parent.parent_id
+        self.sampled = parent.sampled
+        self.span_id = secrets.token_hex(8)
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.end_time: float | None = None
+        self.error: str | None = None
+        self._tracer = owner
+        self._token: Token[RecordingSpan | None] | None = None
+
+    def __repr__(self) -> str:
+        return f"<Span {self.name} trace={self.trace_id} id={self.span_id}>"
+
+    def __enter__(self) -> RecordingSpan:
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.end_time = time.time()
+        if exc is not None:
+            self.error = repr(exc)
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self._tracer.export(self)
+
+    @property
+    def context(self) -> TraceContext:
+        """Context of the spans started within this one."""
+        return TraceContext(self.trace_id, self.span_id, self.sampled)
+
+    @property
+    def duration(self) -> float | None:
+        """Duration in milliseconds, None until the span ends."""
+        return None if self.end_time is None else (self.end_time - self.start_time) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+_current_span: ContextVar[RecordingSpan | None] = ContextVar("lbz_current_span", default=None)
+_DISABLED_SPAN = Span()
+
+
+class SpanExporter(metaclass=ABCMeta):
+    """Destination of the ended spans."""
+
+    @abstractmethod
+    def export(self, span: RecordingSpan) -> None:
+        """Called for every ended span, must not raise (failures are logged and ignored)."""
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the ended spans in memory - meant for tests."""
+
+    def __init__(self) -> None:
+        self.spans: list[RecordingSpan] = []
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<InMemoryExporter spans={len(self.spans)}>"
+
+    def export(self, span: RecordingSpan) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+
+    def get_spans(self, name: str) -> list[RecordingSpan]:
+        return [span for span in self.spans if span.name == name]
+
+
+class XRayExporter(SpanExporter):
+    """Sends the spans as X-Ray subsegments to the daemon run by Lambda (over UDP)."""
+
+    HEADER = b'{"format": "json", "version": 1}\n'
+
+    def __init__(self, daemon_address: str | None = None) -> None:
+        address = daemon_address or os.getenv("AWS_XRAY_DAEMON_ADDRESS") or DEFAULT_DAEMON_ADDRESS
+        host, port = address.rsplit(":", 1)
+        self.address = (host, int(port))
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __repr__(self) -> str:
+        return f"<XRayExporter address={self.address[0]}:{self.address[1]}>"
+
+    def export(self, span: RecordingSpan) -> None:
+        if not span.sampled:
+            return
+        subsegment: dict[str, Any] = {
+            "type": "subsegment",
+            "name": span.name,
+            "id": span.span_id,
+            "trace_id": f"1-{span.trace_id[:8]}-{span.trace_id[8:]}",
+            "parent_id": span.parent_id,
+            "start_time": span.start_time,
+            "end_time": span.end_time,
+            "fault": span.error is not None,
+            "metadata": {"lbz": span.attributes},
+        }
+        if span.error is not None:
+            subsegment["cause"] = {"exceptions": [{"message": span.error}]}
+        payload = json.dumps(subsegment, default=repr, separators=(",", ":")).encode("utf-8")
+        self._socket.sendto(self.HEADER + payload, self.address)
+
+
+class Tracer(metaclass=Singleton):
+    """Creates the spans and holds the exporter receiving them."""
+
+    def __init__(self) -> None:
+        self._exporter: SpanExporter | None = None
+
+    def __repr__(self) -> str:
+        return f"<Tracer exporter={self._exporter!r}>"
+
+    @property
+    def exporter(self) -> SpanExporter | None:
+        return self._exporter
+
+    def set_exporter(self, exporter: SpanExporter | None) -> None:
+        """Enables the tracing, None disables it again."""
+        self._exporter = exporter
+
+    def span(self, name: str, parent: TraceContext | None = None, /, **attributes: Any) -> Span:
+        """Starts a span when used as a context manager.
+
+        Its parent is the given context, the current span, or the segment of the Lambda
+        invocation - in this order. A new trace is started if there is none of them.
+        """
+        if self._exporter is None:
+            return _DISABLED_SPAN
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current else self._invocation_context()
+        return RecordingSpan(self, name, parent or TraceContext.new(), attributes)
+
+    @staticmethod
+    def extract(header: str | None) -> TraceContext | None:
+        """Context the spans handling an incoming request continue.
+
+        The Lambda invocation segment takes precedence as it already continues the caller's trace.
+        """
+        return Tracer._invocation_context() or TraceContext.from_header(header)
+
+    def trace_header(self) -> str | None:
+        """Header passing the current trace context to the invoked lambdas or sent events."""
+        if current := _current_span.get():
+            return current.context.to_header()
+        return os.getenv(LAMBDA_TRACE_ENV) or None
+
+    def export(self, span: RecordingSpan) -> None:
+        if self._exporter is None:
+            return
+        try:
+            self._exporter.export(span)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Exporting the span %r has failed", span)
+
+    @staticmethod
+    def _invocation_context() -> TraceContext | None:
+        # read on every span as Lambda changes it for every invocation
+        return TraceContext.from_header(os.getenv(LAMBDA_TRACE_ENV))
+
+
+tracer = Tracer()
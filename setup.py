@@ -7,7 +7,9 @@ setup(
     version=pathlib.Path("version").read_text("utf-8").strip(),
     author="Piotr Dyba",
     author_email="piotr.dyba@localbini.com",
-    packages=find_packages(exclude=["examples", "examples.*", "tests", "tests.*"]),
+    packages=find_packages(
+        exclude=["benchmarks", "benchmarks.*", "examples", "examples.*", "tests", "tests.*"]
+    ),
     package_data={"lbz": ["py.typed"]},
     scripts=[],
     url="https://github.com/pdyba/lambdalizator",
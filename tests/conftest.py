@@ -12,23 +12,39 @@ from lbz._cfg import (
     ALLOWED_AUDIENCES,
     ALLOWED_ISS,
     ALLOWED_PUBLIC_KEYS,
+    APPCONFIG_EXTENSION_URL,
     AUTH_REMOVE_PREFIXES,
     AWS_LAMBDA_FUNCTION_NAME,
+    BOTO3_CONNECT_TIMEOUT,
+    BOTO3_ENDPOINT_URLS,
+    BOTO3_MAX_ATTEMPTS,
+    BOTO3_MAX_POOL_CONNECTIONS,
+    BOTO3_READ_TIMEOUT,
+    BOTO3_RETRY_MODE,
+    BOTO3_TCP_KEEPALIVE,
     CORS_HEADERS,
     CORS_ORIGIN,
+    DEADLINE_RESERVED_TIME,
     EVENTS_BUS_NAME,
     LBZ_DEBUG_MODE,
     LOGGING_LEVEL,
+    PAGINATION_CURSOR_SECRET,
 )
 from lbz.authentication import User
 from lbz.authz.authorizer import Authorizer
 from lbz.authz.decorators import authorization
 from lbz.collector import authz_collector
+from lbz.configuration import config_cache
+from lbz.container import container_stats
+from lbz.log import enable_request_context
+from lbz.metrics import request_metrics
+from lbz.recording import event_recorder
 from lbz.request import Request
 from lbz.resource import Resource
 from lbz.response import Response
 from lbz.rest import APIGatewayEvent
 from lbz.router import Router, add_route
+from lbz.tracing import tracer
 from tests.fixtures.rsa_pair import SAMPLE_PRIVATE_KEY, SAMPLE_PUBLIC_KEY
 from tests.utils import encode_token
 
@@ -48,6 +64,7 @@ def setting_initial_lbz_configuration(allowed_audiences: list[str]) -> Iterator[
         "AWS_LAMBDA_FUNCTION_NAME": "million-dollar-lambda",
         "EVENTS_BUS_NAME": "million-dollar-lambda-event-bus",
         "AWS_DEFAULT_REGION": "us-west-2",
+        "PAGINATION_CURSOR_SECRET": "test-cursor-secret",
     }
     with patch.dict(environ, patched_environ):
         LBZ_DEBUG_MODE.reset()
@@ -60,6 +77,16 @@ def setting_initial_lbz_configuration(allowed_audiences: list[str]) -> Iterator[
         ALLOWED_AUDIENCES.reset()
         ALLOWED_ISS.reset()
         AUTH_REMOVE_PREFIXES.reset()
+        BOTO3_MAX_POOL_CONNECTIONS.reset()
+        BOTO3_CONNECT_TIMEOUT.reset()
+        BOTO3_READ_TIMEOUT.reset()
+        BOTO3_TCP_KEEPALIVE.reset()
+        BOTO3_RETRY_MODE.reset()
+        BOTO3_MAX_ATTEMPTS.reset()
+        BOTO3_ENDPOINT_URLS.reset()
+        APPCONFIG_EXTENSION_URL.reset()
+        PAGINATION_CURSOR_SECRET.reset()
+        DEADLINE_RESERVED_TIME.reset()
         yield
 
 
@@ -69,6 +96,43 @@ def clear_authz_collector() -> Iterator[None]:
     authz_collector.clean()
 
 
+@pytest.fixture(autouse=True)
+def clear_config_cache() -> Iterator[None]:
+    yield
+    config_cache.invalidate()
+    config_cache.reset_stats()
+
+
+@pytest.fixture(autouse=True)
+def reset_container_stats() -> Iterator[None]:
+    yield
+    container_stats.reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_request_metrics_sink() -> Iterator[None]:
+    yield
+    request_metrics.set_sink(None)
+
+
+@pytest.fixture(autouse=True)
+def disable_request_context() -> Iterator[None]:
+    yield
+    enable_request_context(False)
+
+
+@pytest.fixture(autouse=True)
+def clear_event_recorder_store() -> Iterator[None]:
+    yield
+    event_recorder.set_store(None)
+
+
+@pytest.fixture(autouse=True)
+def clear_tracer_exporter() -> Iterator[None]:
+    yield
+    tracer.set_exporter(None)
+
+
 @pytest.fixture(autouse=True)
 def clear_router_collector() -> Iterator[None]:
     yield
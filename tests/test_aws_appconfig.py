@@ -0,0 +1,46 @@
+from email.message import Message
+from io import BytesIO
+from os import environ
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError
+
+import pytest
+
+from lbz.aws_appconfig import REQUEST_TIMEOUT, AppConfig
+
+
+@patch("lbz.aws_appconfig.urlopen")
+def test__get_configuration__reads_profile_from_the_extension(mocked_urlopen: MagicMock) -> None:
+    mocked_urlopen.return_value.__enter__.return_value = BytesIO(b'{"a": 1}')
+
+    value = AppConfig.get_configuration("my app", "prod", "flags")
+
+    assert value == '{"a": 1}'
+    mocked_urlopen.assert_called_once_with(
+        "http://localhost:2772/applications/my%20app/environments/prod/configurations/flags",
+        timeout=REQUEST_TIMEOUT,
+    )
+
+
+@patch.dict(environ, {"APPCONFIG_EXTENSION_URL": "http://stand-in:8000/"})
+@patch("lbz.aws_appconfig.urlopen")
+def test__get_configuration__uses_configured_address(mocked_urlopen: MagicMock) -> None:
+    mocked_urlopen.return_value.__enter__.return_value = BytesIO(b"")
+
+    AppConfig.get_configuration("app", "prod", "flags")
+
+    assert mocked_urlopen.call_args.args[0].startswith("http://stand-in:8000/applications/app/")
+
+
+@pytest.mark.parametrize("status_code, expected_error", [(404, None), (500, HTTPError)])
+@patch("lbz.aws_appconfig.urlopen")
+def test__get_configuration__handles_http_errors(
+    mocked_urlopen: MagicMock, status_code: int, expected_error: type[Exception] | None
+) -> None:
+    mocked_urlopen.side_effect = HTTPError("url", status_code, "error", Message(), None)
+
+    if expected_error is None:
+        assert AppConfig.get_configuration("app", "prod", "flags") is None
+    else:
+        with pytest.raises(expected_error):
+            AppConfig.get_configuration("app", "prod", "flags")
@@ -0,0 +1,164 @@
+from functools import cached_property
+from os import environ
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lbz.aws_boto3 import MIN_BOUNDED_TIMEOUT, Boto3Client
+from lbz.exceptions import DeadlineExceeded
+
+
+class TestBoto3Client:
+    def test__config__mirrors_botocore_defaults_when_nothing_is_configured(self) -> None:
+        config: Any = Boto3Client().config
+
+        assert config.max_pool_connections == 10
+        assert config.connect_timeout == 60
+        assert config.read_timeout == 60
+        assert config.tcp_keepalive is False
+        assert config.retries is None
+
+    @patch.dict(
+        environ,
+        {
+            "BOTO3_MAX_POOL_CONNECTIONS": "50",
+            "BOTO3_CONNECT_TIMEOUT": "1.5",
+            "BOTO3_READ_TIMEOUT": "5",
+            "BOTO3_TCP_KEEPALIVE": "1",
+            "BOTO3_RETRY_MODE": "standard",
+            "BOTO3_MAX_ATTEMPTS": "2",
+        },
+    )
+    def test__config__is_taken_from_environment(self) -> None:
+        config: Any = Boto3Client().config
+
+        assert config.max_pool_connections == 50
+        assert config.connect_timeout == 1.5
+        assert config.read_timeout == 5
+        assert config.tcp_keepalive is True
+        assert config.retries == {"mode": "standard", "total_max_attempts": 2}
+
+    @patch.dict(environ, {"BOTO3_MAX_POOL_CONNECTIONS": "50"})
+    def test__config__prefers_options_passed_directly(self) -> None:
+        config: Any = Boto3Client(max_pool_connections=100, read_timeout=3).config
+
+        assert config.max_pool_connections == 100
+        assert config.read_timeout == 3
+
+    @patch.dict(environ, {"BOTO3_ENDPOINT_URLS": "sqs=http://localhost:9324,s3=http://s3"})
+    def test__endpoint_url__is_taken_from_environment_per_service(self) -> None:
+        boto3_client = Boto3Client()
+
+        assert boto3_client.endpoint_url("sqs") == "http://localhost:9324"
+        assert boto3_client.endpoint_url("s3") == "http://s3"
+        assert boto3_client.endpoint_url("sns") is None
+
+    @patch.dict(
+        environ,
+        {"DYNAMODB_URL": "http://localhost:8000", "BOTO3_ENDPOINT_URLS": "dynamodb=http://x"},
+    )
+    def test__endpoint_url__prefers_dynamodb_url_for_dynamodb(self) -> None:
+        assert Boto3Client().endpoint_url("dynamodb") == "http://localhost:8000"
+
+    @patch("lbz.aws_boto3.boto3.client")
+    def test_clients_are_created_once_with_shared_config(self, mocked_client: MagicMock) -> None:
+        boto3_client = Boto3Client()
+
+        sqs_client = boto3_client.sqs
+        sns_client = boto3_client.sns
+
+        assert boto3_client.sqs is sqs_client
+        assert boto3_client.sns is sns_client
+
+        assert mocked_client.call_count == 2
+        mocked_client.assert_any_call("sqs", config=boto3_client.config, endpoint_url=None)
+        mocked_client.assert_any_call("sns", config=boto3_client.config, endpoint_url=None)
+
+    def test__reset__drops_created_clients_and_configuration(self) -> None:
+        boto3_client = Boto3Client()
+        with patch("lbz.aws_boto3.boto3") as mocked_boto3:
+            mocked_boto3.client.side_effect = lambda *args, **kwargs: MagicMock()
+            old_client, old_config = boto3_client.sqs, boto3_client.config
+            boto3_client.reset()
+
+            assert boto3_client.sqs is not old_client
+            assert boto3_client.config is not old_config
+
+    def test__reset__drops_clients_added_by_subclasses(self) -> None:
+        class MyBoto3Client(Boto3Client):
+            @cached_property
+            def kinesis(self) -> Any:
+                return object()
+
+        boto3_client = MyBoto3Client()
+        old_client = boto3_client.kinesis
+        boto3_client.reset()
+
+        assert boto3_client.kinesis is not old_client
+        assert boto3_client.bounded(0.5).kinesis is not old_client
+
+    def test__bounded__returns_itself_without_a_tighter_timeout(self) -> None:
+        boto3_client = Boto3Client(read_timeout=10)
+
+        assert boto3_client.bounded(None) is boto3_client
+        assert boto3_client.bounded(10) is boto3_client
+        assert boto3_client.bounded(25.5) is boto3_client
+
+    def test__bounded__rounds_the_timeout_down_to_a_power_of_two(self) -> None:
+        boto3_client = Boto3Client(read_timeout=30, max_pool_connections=20)
+
+        bounded = boto3_client.bounded(7.9)
+        config: Any = bounded.config
+
+        assert bounded is boto3_client.bounded(4.2)
+        assert config.read_timeout == 4
+        assert config.connect_timeout == 4
+        assert config.max_pool_connections == 20
+        assert boto3_client.bounded(8) is not bounded
+        assert boto3_client.bounded(1.9) is boto3_client.bounded(1)
+
+    def test__bounded__rounds_sub_second_timeouts_down_as_well(self) -> None:
+        boto3_client = Boto3Client(read_timeout=30)
+
+        bounded = boto3_client.bounded(0.3)
+        config: Any = bounded.config
+
+        assert bounded is boto3_client.bounded(0.25)
+        assert bounded is not boto3_client.bounded(0.5)
+        assert config.read_timeout == 0.25
+        assert config.connect_timeout == 0.25
+
+    @pytest.mark.parametrize("timeout", [MIN_BOUNDED_TIMEOUT / 2, 0.0])
+    def test__bounded__fails_fast_with_too_little_time_left(self, timeout: float) -> None:
+        with pytest.raises(DeadlineExceeded):
+            Boto3Client(read_timeout=30).bounded(timeout)
+
+    def test__reset__drops_bounded_clients(self) -> None:
+        boto3_client = Boto3Client(read_timeout=30)
+        bounded = boto3_client.bounded(5)
+
+        boto3_client.reset()
+
+        assert boto3_client.bounded(5) is not bounded
+
+    def test__set_client__replaces_the_client_also_in_bounded_clients(self) -> None:
+        boto3_client = Boto3Client(read_timeout=30)
+        emulated = MagicMock()
+
+        boto3_client.set_client("lambda_", emulated)
+
+        assert boto3_client.lambda_ is emulated
+        assert boto3_client.bounded(5).lambda_ is emulated
+        boto3_client.reset()
+        assert boto3_client.lambda_ is emulated
+
+        with patch("lbz.aws_boto3.boto3"):
+            boto3_client.set_client("lambda_", None)
+
+            assert boto3_client.lambda_ is not emulated
+            assert boto3_client.bounded(5).lambda_ is not emulated
+
+    def test__set_client__rejects_unknown_clients(self) -> None:
+        with pytest.raises(ValueError):
+            Boto3Client().set_client("unknown", MagicMock())
@@ -0,0 +1,51 @@
+from unittest.mock import call, patch
+
+from lbz.aws_boto3 import client
+from lbz.aws_secretsmanager import SecretsManager
+
+
+def test__get_secret__returns_secret_string_fetched_from_aws() -> None:
+    with patch.object(client.secretsmanager, "get_secret_value") as mocked_get_secret_value:
+        mocked_get_secret_value.return_value = {"SecretString": "x"}
+
+        value = SecretsManager.get_secret("secret")
+
+    assert value == "x"
+    mocked_get_secret_value.assert_called_once_with(SecretId="secret")
+
+
+def test__get_secret__returns_none_when_secret_not_found() -> None:
+    with patch.object(client.secretsmanager, "get_secret_value") as mocked_get_secret_value:
+        mocked_get_secret_value.side_effect = (
+            client.secretsmanager.exceptions.ResourceNotFoundException(
+                {"Error": {"Code": "ResourceNotFoundException", "Message": "Not found"}},
+                "get_secret_value",
+            )
+        )
+
+        value = SecretsManager.get_secret("secret")
+
+    assert value is None
+
+
+def test__get_secrets__fetches_secrets_in_batches_keyed_by_requested_ids() -> None:
+    secret_ids = [f"secret_{idx}" for idx in range(21)]
+    arn = "arn:aws:secretsmanager:us-west-2:123:secret:secret_20-AbCd"
+    with patch.object(client.secretsmanager, "batch_get_secret_value") as mocked_batch_get:
+        mocked_batch_get.side_effect = [
+            {
+                "SecretValues": [{"Name": "secret_0", "ARN": "arn0", "SecretString": "x"}],
+                "NextToken": "next",
+            },
+            {"SecretValues": [{"Name": "secret_1", "ARN": "arn1", "SecretString": "y"}]},
+            {"SecretValues": [{"Name": "secret_20", "ARN": arn, "SecretString": "z"}]},
+        ]
+
+        secrets = SecretsManager.get_secrets([*secret_ids[:20], arn])
+
+    assert secrets == {"secret_0": "x", "secret_1": "y", arn: "z"}
+    assert mocked_batch_get.call_args_list == [
+        call(SecretIdList=secret_ids[:20]),
+        call(SecretIdList=secret_ids[:20], NextToken="next"),
+        call(SecretIdList=[arn]),
+    ]
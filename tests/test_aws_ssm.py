@@ -1,7 +1,10 @@
-from unittest.mock import patch
+import threading
+from typing import Any
+from unittest.mock import call, patch
 
 from lbz.aws_boto3 import client
-from lbz.aws_ssm import SSM
+from lbz.aws_ssm import SSM, SSMParameterGroup
+from lbz.deadline import Deadline, io_timeout, reset_deadline, set_deadline
 
 
 def test__get_parameter__returns_value_fetched_from_aws() -> None:
@@ -35,3 +38,77 @@ def test__get_parameter__returns_value_none_when_parameter_not_found() -> None:
 
         assert value is None
         mocked_get_parameter.assert_called_once_with(Name="param_name", WithDecryption=True)
+
+
+def test__get_parameters__fetches_parameters_in_batches_of_ten() -> None:
+    names = [f"param_{idx}" for idx in range(15)]
+    with patch.object(client.ssm, "get_parameters") as mocked_get_parameters:
+        mocked_get_parameters.side_effect = lambda Names, WithDecryption: {
+            "Parameters": [{"Name": name, "Value": name.upper()} for name in Names[1:]]
+        }
+
+        values = SSM.get_parameters(names)
+
+    assert values == {name: name.upper() for name in names if name not in ("param_0", "param_10")}
+    mocked_get_parameters.assert_has_calls(
+        [
+            call(Names=names[:10], WithDecryption=True),
+            call(Names=names[10:], WithDecryption=True),
+        ],
+        any_order=True,
+    )
+
+
+def test__get_parameters_by_path__returns_all_parameters_under_the_path() -> None:
+    with patch.object(client.ssm, "get_paginator") as mocked_get_paginator:
+        mocked_get_paginator.return_value.paginate.return_value = [
+            {"Parameters": [{"Name": "/app/a", "Value": "1"}]},
+            {"Parameters": [{"Name": "/app/nested/b", "Value": "2"}]},
+        ]
+
+        values = SSM.get_parameters_by_path("/app/")
+
+    assert values == {"/app/a": "1", "/app/nested/b": "2"}
+    mocked_get_paginator.assert_called_once_with("get_parameters_by_path")
+    mocked_get_paginator.return_value.paginate.assert_called_once_with(
+        Path="/app/", Recursive=True, WithDecryption=True
+    )
+
+
+def test__get_parameter__uses_client_bounded_by_the_deadline() -> None:
+    token = set_deadline(Deadline(5.5, reserved=0.5))
+    try:
+        bounded_ssm = client.bounded(io_timeout()).ssm
+        with patch.object(bounded_ssm, "get_parameter") as mocked_get_parameter:
+            mocked_get_parameter.return_value = {"Parameter": {"Value": "x"}}
+
+            assert SSM.get_parameter("param_name") == "x"
+    finally:
+        reset_deadline(token)
+
+    assert bounded_ssm is not client.ssm
+    config: Any = bounded_ssm.meta.config
+    assert config.read_timeout == 4
+
+
+def test__refresh_in_background__runs_one_refresh_at_a_time() -> None:
+    group = SSMParameterGroup()
+    started, release = threading.Event(), threading.Event()
+
+    def refresh_stale(self: SSMParameterGroup) -> None:
+        started.set()
+        release.wait(5)
+        self._refresh_lock.release()  # pylint: disable=protected-access
+
+    with patch.object(
+        SSMParameterGroup, "_refresh_stale", autospec=True, side_effect=refresh_stale
+    ) as refresh:
+        callers = [threading.Thread(target=group.refresh_in_background) for _ in range(8)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+        assert started.wait(5)
+        release.set()
+
+    assert refresh.call_count == 1
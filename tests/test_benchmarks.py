@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import importlib
+import pkgutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks import runner
+from benchmarks.__main__ import main
+
+for _module in pkgutil.iter_modules([str(Path(runner.__file__).parent)], prefix="benchmarks."):
+    if _module.name.startswith("benchmarks.bench_"):
+        importlib.import_module(_module.name)
+
+
+@pytest.mark.parametrize(
+    "name", [name for name, bench in runner.BENCHMARKS.items() if not bench.measures]
+)
+def test_benchmark_runs(name: str) -> None:
+    with runner.prepared(runner.BENCHMARKS[name]) as timed:
+        timed()
+
+
+def test_compare_reports_regressions_over_tolerance() -> None:
+    baseline = {"results": {"a": {"min": 1.0}, "b": {"min": 1.0}, "gone": {"min": 1.0}}}
+    current = {"results": {"a": {"min": 1.2}, "b": {"min": 1.3}, "new": {"min": 1e-6}}}
+
+    lines, regressions = runner.compare(baseline, current, tolerance=0.25)
+
+    assert regressions == ["b", "gone"]
+    assert lines[1:] == [
+        f"{'a':<40} {'1.00 s':>12} {'1.20 s':>12} {'+20.0%':>8}",
+        f"{'b':<40} {'1.00 s':>12} {'1.30 s':>12} {'+30.0%':>8} REGRESSION",
+        f"{'gone':<40} {'1.00 s':>12} {'-':>12} MISSING",
+        f"{'new':<40} {'-':>12} {'1.00 us':>12} {'new':>8}",
+    ]
+
+
+def test_compare_reports_benchmarks_over_their_budget() -> None:
+    current = {"results": {"import": {"min": 0.02, "budget": 0.01}}}
+
+    lines, regressions = runner.compare({"results": {}}, current, tolerance=0.25)
+
+    assert regressions == ["import"]
+    assert lines[1].endswith("OVER BUDGET 10.00 ms")
+
+
+def test_main_saves_results_and_fails_on_regressions(tmp_path: Path) -> None:
+    results_path = tmp_path / "results.json"
+    baseline_path = tmp_path / "baseline.json"
+    argv = ["-k", "response.to_dict[small]", "--repeat", "1"]
+
+    assert main([*argv, "--save", str(results_path)]) == 0
+    results = runner.load(results_path)
+    assert list(results["results"]) == ["response.to_dict[small]"]
+
+    results["results"]["response.to_dict[small]"]["min"] /= 100
+    runner.save(results, baseline_path)
+    assert main([*argv, "--compare", str(baseline_path)]) == 1
+
+
+def test_failing_benchmarks_are_skipped_only_when_allowed() -> None:
+    def broken() -> runner.Timed:
+        raise ImportError("missing in the baseline")
+
+    with patch.dict(runner.BENCHMARKS, {"broken": runner.Benchmark("broken", broken, {})}):
+        assert runner.run("broken", repeat=1, allow_skips=True)["results"] == {}
+        with pytest.raises(ImportError):
+            runner.run("broken", repeat=1)
+
+
+def test_main_fails_when_baseline_benchmark_is_missing(tmp_path: Path) -> None:
+    baseline_path = tmp_path / "baseline.json"
+    argv = ["-k", "response.to_dict[small]", "--repeat", "1"]
+    assert main([*argv, "--save", str(baseline_path)]) == 0
+    baseline = runner.load(baseline_path)
+    # left out by the pattern
+    baseline["results"]["response.to_dict[large]"] = {"min": 1.0}
+    runner.save(baseline, baseline_path)
+    assert main([*argv, "--compare", str(baseline_path), "--tolerance", "100"]) == 0
+
+    baseline["results"]["response.to_dict[small] (removed)"] = {"min": 1.0}
+    runner.save(baseline, baseline_path)
+    assert main([*argv, "--compare", str(baseline_path), "--tolerance", "100"]) == 1
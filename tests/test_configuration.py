@@ -1,13 +1,30 @@
 import json
 import re
+import time
+import weakref
 from os import environ
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
-
-from lbz.aws_ssm import SSM
-from lbz.configuration import ConfigParser, EnvValue, SSMValue
-from lbz.exceptions import ConfigValueParsingFailed, MissingConfigValue
+from pytest import LogCaptureFixture
+
+from lbz._cfg import ALLOWED_AUDIENCES, LOGGING_LEVEL
+from lbz.aws_appconfig import AppConfig
+from lbz.aws_secretsmanager import SecretsManager
+from lbz.aws_ssm import SSM, SSMParameterGroup
+from lbz.configuration import (
+    AppConfigValue,
+    ConfigCache,
+    ConfigParser,
+    ConfigRegistry,
+    ConfigValue,
+    EnvValue,
+    SecretsManagerValue,
+    SSMValue,
+    config_cache,
+    config_registry,
+)
+from lbz.exceptions import ConfigurationError, ConfigValueParsingFailed, MissingConfigValue
 
 
 class TestConfigValue:
@@ -90,14 +107,291 @@ class TestEnvConfig:
 
 
 class TestSSMConfig:
-    @patch.object(SSM, "get_parameter", autospec=True)
-    def test_getter_calls_ssm_with_specific_key(self, mocked_get_parameter: MagicMock) -> None:
-        mocked_get_parameter.return_value = "test_value"
+    @patch.object(SSM, "get_parameters", autospec=True)
+    def test_getter_calls_ssm_with_specific_key(self, mocked_get_parameters: MagicMock) -> None:
+        mocked_get_parameters.return_value = {"key_name": "test_value"}
         cfg = SSMValue[str]("key_name")
 
         assert cfg.value == "test_value"
 
-        mocked_get_parameter.assert_called_once_with("key_name")
+        mocked_get_parameters.assert_called_once_with(["key_name"])
+
+    @patch.object(SSM, "get_parameters", autospec=True)
+    def test_values_of_the_group_are_fetched_together(
+        self, mocked_get_parameters: MagicMock
+    ) -> None:
+        mocked_get_parameters.return_value = {"a": "1", "b": "2"}
+        group = SSMParameterGroup()
+        cfg_a = SSMValue("a", parser=int, group=group)
+        cfg_b = SSMValue("b", parser=int, group=group)
+        cfg_c = SSMValue("c", default=3, group=group)
+
+        assert (cfg_a.value, cfg_b.value, cfg_c.value) == (1, 2, 3)
+
+        mocked_get_parameters.assert_called_once()
+        assert sorted(mocked_get_parameters.call_args.args[0]) == ["a", "b", "c"]
+
+    @patch.object(SSM, "get_parameters_by_path", autospec=True)
+    @patch.object(SSM, "get_parameters", autospec=True)
+    def test_values_under_the_group_path_are_fetched_by_path(
+        self, mocked_get_parameters: MagicMock, mocked_get_parameters_by_path: MagicMock
+    ) -> None:
+        mocked_get_parameters_by_path.return_value = {"/app/a": "1"}
+        mocked_get_parameters.return_value = {"/other": "2"}
+        group = SSMParameterGroup(path="/app/")
+        cfg_a = SSMValue[str]("/app/a", group=group)
+        cfg_other = SSMValue[str]("/other", group=group)
+
+        assert (cfg_a.value, cfg_other.value) == ("1", "2")
+
+        mocked_get_parameters_by_path.assert_called_once_with("/app/")
+        mocked_get_parameters.assert_called_once_with(["/other"])
+
+    @patch.object(SSM, "get_parameters", autospec=True)
+    def test_stale_value_is_served_while_refreshed_in_background(
+        self, mocked_get_parameters: MagicMock
+    ) -> None:
+        mocked_get_parameters.side_effect = [{"key": "old"}, {"key": "new"}]
+        group = SSMParameterGroup()
+        cfg = SSMValue[str]("key", ttl=60, group=group)
+        assert cfg.value == "old"
+
+        with patch("lbz.aws_ssm.time.monotonic", return_value=time.monotonic() + 61):
+            with patch("lbz.aws_ssm.threading.Thread") as mocked_thread:
+                assert cfg.value == "old"
+            mocked_thread.assert_called_once_with(target=ANY, daemon=True)
+            mocked_thread.call_args.kwargs["target"]()
+
+        assert cfg.value == "new"
+        assert mocked_get_parameters.call_count == 2
+
+    @patch.object(SSM, "get_parameters", autospec=True)
+    def test_value_is_kept_when_refreshing_fails(
+        self, mocked_get_parameters: MagicMock, caplog: LogCaptureFixture
+    ) -> None:
+        mocked_get_parameters.side_effect = [{"key": "old"}, RuntimeError]
+        group = SSMParameterGroup()
+        cfg = SSMValue[str]("key", ttl=0, group=group)
+        assert cfg.value == "old"
+
+        with patch("lbz.aws_ssm.threading.Thread") as mocked_thread:
+            assert cfg.value == "old"
+            mocked_thread.call_args.kwargs["target"]()
+
+            assert cfg.value == "old"
+        assert "Refreshing SSM parameters has failed" in caplog.text
+
+
+class TestConfigRegistry:
+    def test_keeps_track_of_created_values(self) -> None:
+        cfg = EnvValue[str]("key")
+
+        assert cfg in list(config_registry)
+        assert LOGGING_LEVEL in list(config_registry)
+
+    @patch.dict(environ, {"A": "1", "B": "x"})
+    def test__resolve_all__returns_read_only_mapping_of_resolved_values(self) -> None:
+        cfg_a = EnvValue("A", parser=int)
+        cfg_b = EnvValue[str]("B")
+
+        resolved = ConfigRegistry().resolve_all([cfg_a, cfg_b])
+
+        assert resolved == {"env:A": 1, "env:B": "x"}
+        with pytest.raises(TypeError):
+            resolved["env:A"] = 2  # type: ignore[index]
+
+    @patch.dict(environ, {}, clear=True)
+    def test__resolve_all__skips_optional_settings_of_lbz_by_default(self) -> None:
+        registry = ConfigRegistry()
+        registry.add(LOGGING_LEVEL)
+        registry.add(ALLOWED_AUDIENCES)
+        registry.mark_internal([ALLOWED_AUDIENCES])
+        cfg = EnvValue[str]("APP", default="app")
+        registry.add(cfg)
+
+        assert registry.resolve_all() == {"env:APP": "app", "env:LOGGING_LEVEL": "INFO"}
+
+    def test__resolve_all__of_the_registry_skips_settings_of_lbz(self) -> None:
+        with (
+            patch.dict(environ, {}, clear=True),
+            patch.object(config_registry, "_values", weakref.WeakSet()),
+        ):
+            config_registry.add(ALLOWED_AUDIENCES)
+
+            assert config_registry.resolve_all() == {}
+
+    @patch.dict(environ, {"A": "1"})
+    def test__resolve_all__reports_keys_resolved_to_different_values(self) -> None:
+        values: list[ConfigValue] = [
+            EnvValue("A", parser=int),
+            EnvValue[str]("A"),
+            EnvValue("A", parser=int),
+        ]
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            ConfigRegistry().resolve_all(values)
+
+        assert exc_info.value.errors == {
+            "env:A": "'A' is defined more than once with other values"
+        }
+
+    @patch.dict(environ, {"A": "1"})
+    @patch.object(SSM, "get_parameters", autospec=True)
+    def test__resolve_all__keeps_values_of_other_sources_sharing_the_key(
+        self, mocked_get_parameters: MagicMock
+    ) -> None:
+        mocked_get_parameters.return_value = {"A": "2"}
+        values: list[ConfigValue] = [
+            EnvValue[str]("A"),
+            SSMValue[str]("A", group=SSMParameterGroup()),
+        ]
+
+        resolved = ConfigRegistry().resolve_all(values)
+
+        assert resolved == {"env:A": "1", "ssm:A": "2"}
+
+    @patch.dict(environ, {"INVALID": "x"})
+    def test__resolve_all__reports_all_problems_at_once(self) -> None:
+        values: list[ConfigValue] = [
+            EnvValue("INVALID", parser=int),
+            EnvValue[str]("MISSING"),
+            EnvValue[str]("OK", default="ok"),
+        ]
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            ConfigRegistry().resolve_all(values)
+
+        assert exc_info.value.errors == {
+            "env:INVALID": "'INVALID' could not parse 'x'",
+            "env:MISSING": "'MISSING' was not defined.",
+        }
+
+    @patch.object(SecretsManager, "get_secrets", autospec=True)
+    @patch.object(SSM, "get_parameters", autospec=True)
+    def test__resolve_all__fetches_each_source_in_bulk(
+        self, mocked_get_parameters: MagicMock, mocked_get_secrets: MagicMock
+    ) -> None:
+        mocked_get_parameters.return_value = {"a": "1", "b": "2"}
+        mocked_get_secrets.return_value = {"db": '{"user": "admin"}', "api": "token"}
+        group = SSMParameterGroup()
+        values: list[ConfigValue] = [
+            SSMValue("a", group=group),
+            SSMValue("b", group=group),
+            SecretsManagerValue("db", json_key="user"),
+            SecretsManagerValue("api", ttl=60),
+        ]
+
+        resolved = ConfigRegistry().resolve_all(values)
+
+        assert resolved == {
+            "ssm:a": "1",
+            "ssm:b": "2",
+            "secretsmanager:db:user": "admin",
+            "secretsmanager:api": "token",
+        }
+        mocked_get_parameters.assert_called_once()
+        mocked_get_secrets.assert_called_once_with(["db", "api"])
+
+    @patch.object(SecretsManager, "get_secret", autospec=True)
+    @patch.object(SecretsManager, "get_secrets", autospec=True)
+    def test__resolve_all__reads_values_one_by_one_when_bulk_fetch_fails(
+        self, mocked_get_secrets: MagicMock, mocked_get_secret: MagicMock
+    ) -> None:
+        mocked_get_secrets.side_effect = RuntimeError
+        mocked_get_secret.return_value = "token"
+
+        resolved = ConfigRegistry().resolve_all([SecretsManagerValue[str]("api")])
+
+        assert resolved == {"secretsmanager:api": "token"}
+
+
+class TestConfigCache:
+    def test__get__fetches_once_and_counts_stats_per_source(self) -> None:
+        cache = ConfigCache()
+        fetch = MagicMock(return_value="x")
+
+        assert cache.get("source", "key", fetch).value == "x"
+        assert cache.get("source", "key", fetch).value == "x"
+
+        fetch.assert_called_once_with()
+        assert cache.stats == {"source": {"hits": 1, "misses": 1, "errors": 0}}
+
+    def test__get__fetches_again_when_entry_expired(self) -> None:
+        cache = ConfigCache()
+        fetch = MagicMock(side_effect=["old", "new"])
+
+        assert cache.get("source", "key", fetch, ttl=60).value == "old"
+        with patch("lbz.configuration.time.monotonic", return_value=time.monotonic() + 61):
+            assert cache.current("source", "key") is None
+            assert cache.get("source", "key", fetch, ttl=60).value == "new"
+
+    def test__get__counts_errors(self) -> None:
+        cache = ConfigCache()
+
+        with pytest.raises(RuntimeError):
+            cache.get("source", "key", MagicMock(side_effect=RuntimeError))
+
+        assert cache.stats == {"source": {"hits": 0, "misses": 1, "errors": 1}}
+
+    def test__invalidate__drops_entries_of_the_source(self) -> None:
+        cache = ConfigCache()
+        cache.get("a", "key", lambda: 1)
+        cache.get("b", "key", lambda: 2)
+
+        cache.invalidate("a")
+        assert cache.current("a", "key") is None
+        assert cache.current("b", "key") is not None
+
+        cache.invalidate()
+        assert cache.current("b", "key") is None
+
+
+class TestSecretsManagerValue:
+    @patch.object(SecretsManager, "get_secret", autospec=True)
+    def test_json_keys_of_one_secret_share_one_fetch(self, mocked_get_secret: MagicMock) -> None:
+        mocked_get_secret.return_value = '{"user": "admin", "port": 5432}'
+        user = SecretsManagerValue[str]("db", json_key="user")
+        port = SecretsManagerValue("db", parser=int, json_key="port")
+
+        assert (user.value, port.value) == ("admin", 5432)
+
+        mocked_get_secret.assert_called_once_with("db")
+        assert config_cache.stats["secretsmanager"] == {"hits": 1, "misses": 1, "errors": 0}
+
+    @patch.object(SecretsManager, "get_secret", autospec=True)
+    def test_value_is_fetched_again_after_ttl(self, mocked_get_secret: MagicMock) -> None:
+        mocked_get_secret.side_effect = ['{"token": "old"}', '{"token": "new"}']
+        token = SecretsManagerValue[str]("api", json_key="token", ttl=60)
+        assert token.value == "old"
+        assert token.value == "old"
+
+        with patch("lbz.configuration.time.monotonic", return_value=time.monotonic() + 61):
+            assert token.value == "new"
+
+    @patch.object(SecretsManager, "get_secret", autospec=True)
+    def test_missing_secret_raises_with_json_key_in_message(
+        self, mocked_get_secret: MagicMock
+    ) -> None:
+        mocked_get_secret.return_value = None
+        user = SecretsManagerValue[str]("db", json_key="user")
+
+        with pytest.raises(MissingConfigValue, match="'db:user' was not defined."):
+            _ = user.value
+
+
+class TestAppConfigValue:
+    @patch.object(AppConfig, "get_configuration", autospec=True)
+    def test_fetches_the_profile_of_the_application_environment(
+        self, mocked_get_configuration: MagicMock
+    ) -> None:
+        mocked_get_configuration.return_value = '{"limit": 10}'
+        limit = AppConfigValue("app/prod/settings", parser=int, json_key="limit")
+        settings = AppConfigValue("app/prod/settings", parser=json.loads)
+
+        assert limit.value == 10
+        assert settings.value == {"limit": 10}
+
+        mocked_get_configuration.assert_called_once_with("app", "prod", "settings")
 
 
 class TestConfigParser:
@@ -124,3 +418,6 @@ class TestConfigParser:
 
     def test__load_jwt_keys__return_value_of_keys(self) -> None:
         assert ConfigParser.load_jwt_keys('{"keys": [{"key": "a"}]}') == [{"key": "a"}]
+
+    def test__split_to_dict__returns_dict_of_key_value_pairs(self) -> None:
+        assert ConfigParser.split_to_dict("a=1,b=http://x?y=z,") == {"a": "1", "b": "http://x?y=z"}
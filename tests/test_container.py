@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock, patch
+
+from lbz.configuration import config_cache
+from lbz.container import ContainerStats, container_stats, get_max_memory
+from lbz.snapshot import snapshot_hooks
+
+
+class TestContainerStats:
+    def test_is_singleton(self) -> None:
+        assert ContainerStats() is container_stats
+
+    @patch("lbz.container.time.monotonic", side_effect=[10.0, 10.25, 11.0])
+    def test__start_invocation__tells_cold_start_from_warm_ones(self, _time: MagicMock) -> None:
+        container_stats.reset()
+
+        assert container_stats.start_invocation() is True
+        assert container_stats.init_duration == 250.0
+        assert container_stats.start_invocation() is False
+        assert container_stats.invocations == 2
+        assert container_stats.uptime == 1.0
+
+    @patch.object(container_stats, "_cache_stats", {})
+    def test__cache_stats__adds_hit_ratios_of_config_and_registered_caches(self) -> None:
+        config_cache.stats["ssm"] = {"hits": 3, "misses": 1, "errors": 0}
+        container_stats.register_cache("responses", lambda: {"hits": 0, "misses": 0})
+
+        assert container_stats.cache_stats() == {
+            "config.ssm": {"hits": 3, "misses": 1, "errors": 0, "hit_ratio": 0.75},
+            "responses": {"hits": 0, "misses": 0, "hit_ratio": 0.0},
+        }
+
+    def test__to_dict__describes_the_container(self) -> None:
+        container_stats.start_invocation()
+
+        stats = container_stats.to_dict()
+
+        assert stats["invocations"] == 1
+        assert stats["cold_start"] is True
+        assert stats["init_duration"] >= 0
+        assert stats["uptime"] >= 0
+        assert stats["max_memory"] > 0
+
+    def test_restoring_snapshot_makes_the_next_invocation_cold(self) -> None:
+        container_stats.start_invocation()
+        container_stats.start_invocation()
+
+        snapshot_hooks.run_after_restore()
+
+        assert container_stats.start_invocation() is True
+
+
+@patch("lbz.container.sys.platform", "darwin")
+def test_get_max_memory_converts_bytes_on_macos() -> None:
+    with patch("resource.getrusage", return_value=MagicMock(ru_maxrss=2 * 1024**2)):
+        assert get_max_memory() == 2.0
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from os import environ
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lbz._cfg import DEADLINE_RESERVED_TIME
+from lbz.deadline import (
+    Deadline,
+    check_deadline,
+    deadline_aware,
+    deadline_expired,
+    get_deadline,
+    io_timeout,
+    reset_deadline,
+    set_deadline,
+)
+from lbz.exceptions import DeadlineExceeded
+from lbz.type_defs import LambdaContext
+
+
+def make_context(remaining_ms: int) -> MagicMock:
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = remaining_ms
+    return context
+
+
+class TestDeadline:
+    @patch("lbz.deadline.time.monotonic", MagicMock(return_value=100.0))
+    def test_available_time_excludes_the_reserved_time(self) -> None:
+        deadline = Deadline(3.0, reserved=0.5)
+
+        assert deadline.remaining == 3.0
+        assert deadline.available == 2.5
+        assert deadline.expired is False
+
+    @patch.dict(environ, {"DEADLINE_RESERVED_TIME": "1.5"})
+    def test_reserved_time_is_taken_from_environment(self) -> None:
+        DEADLINE_RESERVED_TIME.reset()
+
+        assert Deadline(3.0).reserved == 1.5
+
+    def test_expires_when_only_the_reserved_time_is_left(self) -> None:
+        deadline = Deadline(0.4, reserved=0.5)
+
+        assert deadline.expired is True
+        assert deadline.available == 0.0
+        with pytest.raises(DeadlineExceeded):
+            deadline.check()
+
+    def test_timeout_may_use_the_reserved_time_when_asked(self) -> None:
+        deadline = Deadline(0.4, reserved=0.5)
+
+        with pytest.raises(DeadlineExceeded):
+            deadline.timeout()
+        assert 0 < deadline.timeout(use_reserve=True) <= 0.4
+
+    def test_from_context_uses_the_remaining_time_of_the_invocation(self) -> None:
+        deadline = Deadline.from_context(make_context(30_000))
+
+        assert deadline is not None
+        assert 29 < deadline.remaining <= 30
+
+    def test_from_context_returns_none_for_contexts_without_the_remaining_time(self) -> None:
+        assert Deadline.from_context(LambdaContext()) is None
+        assert Deadline.from_context(None) is None
+        assert Deadline.from_context(MagicMock()) is None
+
+
+class TestCurrentDeadline:
+    def test_functions_are_no_op_without_a_deadline(self) -> None:
+        assert get_deadline() is None
+        assert io_timeout() is None
+        assert deadline_expired() is False
+        check_deadline()
+
+    def test_functions_use_the_set_deadline(self) -> None:
+        token = set_deadline(Deadline(0.1, reserved=0.5))
+        try:
+            assert deadline_expired() is True
+            with pytest.raises(DeadlineExceeded):
+                check_deadline()
+            with pytest.raises(DeadlineExceeded):
+                io_timeout()
+            assert io_timeout(use_reserve=True) is not None
+        finally:
+            reset_deadline(token)
+
+        assert get_deadline() is None
+
+    def test_deadline_aware_sets_the_deadline_for_the_handler(self) -> None:
+        @deadline_aware
+        def handler(_event: dict, _context: LambdaContext) -> float | None:
+            return io_timeout()
+
+        timeout = handler({}, make_context(10_000))
+
+        assert timeout is not None and 9 < timeout <= 9.5
+        assert get_deadline() is None
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from lbz.aws_boto3 import client
+from lbz.deadline import get_deadline
+from lbz.dev.emulator import EventRule, LambdaEmulator, LocalLambdaContext
+from lbz.events.api import EventAPI
+from lbz.events.broker import EventBroker
+from lbz.events.event import Event
+from lbz.lambdas import (
+    LambdaBroker,
+    LambdaClient,
+    LambdaResponse,
+    LambdaResult,
+    lambda_ok_response,
+)
+from lbz.tracing import InMemoryExporter, tracer
+from lbz.type_defs import LambdaContext
+
+
+@pytest.fixture(name="emulator")
+def emulator_fixture() -> Any:
+    emulator = LambdaEmulator()
+    with emulator:
+        yield emulator
+    emulator.shutdown()
+    EventAPI().clear()
+
+
+def test_flow_of_invocations_and_events_is_handled_locally(emulator: LambdaEmulator) -> None:
+    received: list[Event] = []
+
+    def place_order(data: dict) -> LambdaResponse:
+        EventAPI().register(Event(data, event_type="OrderPlaced"))
+        EventAPI().send()
+        stock = LambdaClient.invoke("stock", "reserve", data)
+        return lambda_ok_response({"reserved": stock["data"]["reserved"]})
+
+    def orders(event: dict, context: LambdaContext) -> Any:
+        return LambdaBroker({"place_order": place_order}, event, context).react()
+
+    def stock(event: dict, context: LambdaContext) -> Any:
+        assert get_deadline() is not None
+        return LambdaBroker(
+            {"reserve": lambda data: lambda_ok_response({"reserved": 1})}, event, context
+        ).react()
+
+    def emails(event: dict, context: LambdaContext) -> None:
+        EventBroker({"OrderPlaced": [received.append]}, event, context).react()
+
+    emulator.add_function("orders", orders)
+    emulator.add_function("stock", stock)
+    emulator.add_function("emails", emails)
+    emulator.add_rule(
+        "emails", {"source": ["million-dollar-lambda"], "detail-type": ["OrderPlaced"]}
+    )
+
+    response = LambdaClient.invoke("orders", "place_order", {"id": 1})
+    emulator.drain(timeout=5)
+
+    assert response == {"result": LambdaResult.OK, "data": {"reserved": 1}}
+    assert received == [Event({"id": 1}, event_type="OrderPlaced")]
+    stats = emulator.stats()
+    assert {name: function_stats["invocations"] for name, function_stats in stats.items()} == {
+        "orders": 1,
+        "stock": 1,
+        "emails": 1,
+    }
+    assert set(stats["orders"]["duration"]) == {"count", "min", "max", "mean", "p50", "p95"}
+
+
+def test_trace_is_passed_to_synchronously_invoked_functions(emulator: LambdaEmulator) -> None:
+    exporter = InMemoryExporter()
+    tracer.set_exporter(exporter)
+
+    def stock(event: dict, context: LambdaContext) -> Any:
+        return LambdaBroker({"reserve": lambda data: lambda_ok_response()}, event, context).react()
+
+    emulator.add_function("stock", stock)
+    LambdaClient.invoke("stock", "reserve")
+
+    (invoke_span,) = exporter.get_spans("lambda.invoke")
+    (broker_span,) = exporter.get_spans("LambdaBroker")
+    assert broker_span.trace_id == invoke_span.trace_id
+    assert broker_span.parent_id == invoke_span.span_id
+
+
+def test_failed_async_invocations_are_retried(emulator: LambdaEmulator) -> None:
+    def failing(_event: dict, _context: LambdaContext) -> None:
+        raise RuntimeError("oops")
+
+    emulator.add_function("failing", failing, async_retries=1)
+
+    response = LambdaClient.invoke("failing", "x", asynchronous=True)
+    emulator.drain(timeout=5)
+
+    assert response == {"result": LambdaResult.ACCEPTED}
+    assert emulator.stats()["failing"]["invocations"] == 2
+    assert emulator.stats()["failing"]["errors"] == 2
+
+
+def test_unhandled_errors_of_sync_invocations_are_reported_as_server_errors(
+    emulator: LambdaEmulator,
+) -> None:
+    def failing(_event: dict, _context: LambdaContext) -> None:
+        raise RuntimeError("oops")
+
+    emulator.add_function("failing", failing)
+
+    response = LambdaClient.invoke("failing", "x")
+
+    assert response == {"errorMessage": "oops", "errorType": "RuntimeError"}
+    assert emulator.stats()["failing"]["errors"] == 1
+
+
+def test_events_matching_no_rule_are_kept(emulator: LambdaEmulator) -> None:
+    EventAPI().register(Event({"x": 1}, event_type="Unrouted"))
+    EventAPI().send()
+
+    (event,) = emulator.undelivered_events
+    assert event["detail-type"] == "Unrouted"
+    assert event["detail"] == {"x": 1}
+
+
+def test_unknown_functions_are_rejected() -> None:
+    emulator = LambdaEmulator()
+
+    with pytest.raises(ValueError):
+        emulator.invoke("unknown", {})
+    with pytest.raises(ValueError):
+        emulator.add_rule("unknown", {})
+
+
+def test_uninstall_brings_back_the_boto3_clients() -> None:
+    emulator = LambdaEmulator()
+    emulator.install()
+    assert "lambda_" in vars(client)
+
+    emulator.uninstall()
+
+    assert "lambda_" not in vars(client)
+    assert "eventbridge" not in vars(client)
+
+
+def test_context_counts_the_remaining_time_from_the_start() -> None:
+    emulator = LambdaEmulator()
+    function = emulator.add_function("x", lambda event, context: None, timeout=2)
+
+    context = LocalLambdaContext(function)
+
+    assert 1900 < context.get_remaining_time_in_millis() <= 2000
+    assert context.function_name == "x"
+    assert context.invoked_function_arn.endswith(":function:x")
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ({"source": ["orders"]}, True),
+        ({"source": ["stock", "orders"], "detail-type": ["OrderPlaced"]}, True),
+        ({"detail": {"status": ["PAID"]}}, True),
+        ({"detail": {"tags": ["b"]}}, True),
+        ({"source": ["stock"]}, False),
+        ({"detail": {"status": ["NEW"]}}, False),
+        ({"detail": {"missing": ["x"]}}, False),
+    ],
+)
+def test_event_rule_matches_the_pattern(pattern: dict, expected: bool) -> None:
+    event = {
+        "source": "orders",
+        "detail-type": "OrderPlaced",
+        "detail": {"status": "PAID", "tags": ["a", "b"]},
+    }
+
+    assert EventRule("x", pattern).matches("bus", event) is expected
+    assert EventRule("x", pattern, bus_name="other").matches("bus", event) is False
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from lbz.dev.load import LoadReport, LoadTest, load_events, weighted_mix
+from lbz.dev.test import Client
+from lbz.resource import Resource
+from lbz.response import Response
+from lbz.rest import APIGatewayEvent
+
+HELLO = APIGatewayEvent(method="GET", resource_path="/")
+MISSING = APIGatewayEvent(method="GET", resource_path="/missing")
+
+
+@pytest.mark.parametrize(
+    "content",
+    [json.dumps([HELLO, MISSING]), f"{json.dumps(HELLO)}\n\n{json.dumps(MISSING)}\n"],
+)
+def test_load_events_reads_json_lists_and_lines(tmp_path: Path, content: str) -> None:
+    path = tmp_path / "events.json"
+    path.write_text(content)
+
+    assert load_events(path) == [HELLO, MISSING]
+
+
+def test_weighted_mix_is_reproducible() -> None:
+    mix = weighted_mix([(HELLO, 3), (MISSING, 1)], 100, seed=7)
+
+    assert len(mix) == 100
+    assert 50 < sum(event is HELLO for event in mix) < 100
+    assert mix == weighted_mix([(HELLO, 3), (MISSING, 1)], 100, seed=7)
+
+
+def test_load_test_sends_one_round_of_events_by_default(sample_resource: type[Resource]) -> None:
+    report = LoadTest(sample_resource, [HELLO, MISSING, HELLO], concurrency=2).run()
+
+    assert report.requests == 3
+    assert report.statuses == Counter({200: 2, 404: 1})
+    assert report.errors == 0
+    assert report.latency["count"] == 3
+    assert set(report.latency) >= {"p50", "p90", "p95", "p99"}
+
+
+def test_load_test_counts_raising_resources_as_errors() -> None:
+    resource = mock.Mock(side_effect=RuntimeError)
+
+    report = LoadTest(resource, [HELLO], requests=4).run()
+
+    assert report.errors == 4
+    assert not report.statuses
+
+
+def test_load_test_keeps_the_target_rate(sample_resource: type[Resource]) -> None:
+    report = LoadTest(sample_resource, [HELLO], rate=200, duration=0.1, concurrency=4).run()
+
+    assert report.requests == 20
+    assert report.duration >= 0.095
+
+
+def test_load_test_measures_allocations(sample_resource: type[Resource]) -> None:
+    report = LoadTest(sample_resource, [HELLO], requests=1, allocation_samples=3).run()
+
+    assert report.allocations["peak_bytes"] > 0
+    assert "retained_bytes" in report.allocations
+    assert "Allocated:  peak_bytes=" in str(report)
+
+
+def test_load_test_splits_requests_between_processes(sample_resource: type[Resource]) -> None:
+    report = LoadTest(sample_resource, [HELLO, MISSING], requests=5, processes=2).run()
+
+    assert report.requests == 5
+    assert sum(report.statuses.values()) == 5
+
+
+@mock.patch("lbz.dev.load.RESULTS_POLL_INTERVAL", 0.05)
+def test_load_test_counts_requests_of_dead_processes_as_errors() -> None:
+    class Crashing(Resource):
+        def __call__(self) -> Response:
+            os._exit(1)
+
+    report = LoadTest(Crashing, [HELLO], requests=5, processes=2).run()
+
+    assert report.requests == 0
+    assert report.errors == 5
+
+
+@mock.patch("lbz.dev.load.RESULTS_POLL_INTERVAL", 0.05)
+@mock.patch("lbz.dev.load.RESULTS_GRACE_PERIOD", 0.1)
+def test_load_test_stops_waiting_for_processes_after_the_duration() -> None:
+    class Hanging(Resource):
+        def __call__(self) -> Response:
+            time.sleep(60)
+            return Response({})
+
+    started = time.monotonic()
+    report = LoadTest(Hanging, [HELLO], duration=0.1, processes=2).run()
+
+    assert time.monotonic() - started < 10
+    assert report.errors == 2
+
+
+@mock.patch("lbz.dev.load.RESULTS_POLL_INTERVAL", 0.05)
+@pytest.mark.parametrize("options", [{"timeout": 0.2}, {"rate": 100.0}])
+def test_load_test_stops_waiting_for_processes_of_count_based_runs(options: dict) -> None:
+    class Hanging(Resource):
+        def __call__(self) -> Response:
+            time.sleep(60)
+            return Response({})
+
+    started = time.monotonic()
+    with mock.patch("lbz.dev.load.RESULTS_GRACE_PERIOD", 0.1):
+        report = LoadTest(Hanging, [HELLO], requests=4, processes=2, **options).run()
+
+    assert time.monotonic() - started < 10
+    assert report.errors == 4
+
+
+def test_load_report_to_dict() -> None:
+    report = LoadReport([1.0, 3.0], Counter({200: 1, 500: 1}), 0, 0.5)
+
+    assert report.to_dict() == {
+        "requests": 2,
+        "errors": 0,
+        "statuses": {"200": 1, "500": 1},
+        "duration": 0.5,
+        "throughput": 4.0,
+        "latency": {
+            "count": 2,
+            "min": 1.0,
+            "max": 3.0,
+            "mean": 2.0,
+            "p50": 1.0,
+            "p90": 3.0,
+            "p95": 3.0,
+            "p99": 3.0,
+        },
+        "allocations": {},
+    }
+
+
+def test_client_loads_prepared_events(sample_resource: type[Resource]) -> None:
+    client = Client(sample_resource)
+    event = client.build_event("/")
+
+    assert client.send(event).status_code == 200
+    assert client.load([event], requests=10).statuses == Counter({200: 10})
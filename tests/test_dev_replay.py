@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from lbz.dev.load import load_events
+from lbz.dev.replay import Replayer, diff, main, with_headers
+from lbz.events import Event, EventBroker
+from lbz.handlers import BaseHandler
+from lbz.lambdas import LambdaBroker, lambda_ok_response
+from lbz.recording import (
+    REDACTED,
+    EventRecord,
+    InMemoryStore,
+    JSONLinesStore,
+    event_recorder,
+    read_records,
+)
+from lbz.resource import Resource
+from lbz.response import Response
+from lbz.rest import APIGatewayEvent
+from lbz.router import add_route
+from lbz.type_defs import LambdaContext
+
+
+class Handler(BaseHandler[dict]):
+    def handle(self) -> dict:
+        if self.raw_event.get("fail"):
+            raise ValueError("Failed")
+        return {"ok": True}
+
+
+MAPPER = {"x": lambda data: lambda_ok_response({"ok": True})}
+
+
+@pytest.fixture(name="records_path")
+def records_path_fixture(tmp_path: Path, sample_resource: type[Resource]) -> Path:
+    path = tmp_path / "events.jsonl.gz"
+    event_recorder.set_store(JSONLinesStore(path))
+    sample_resource(APIGatewayEvent(method="GET", resource_path="/"))()
+    sample_resource(APIGatewayEvent(method="GET", resource_path="/missing"))()
+    Handler({"id": 1}, LambdaContext()).react()
+    event_recorder.set_store(None)
+    return path
+
+
+def test_diff_returns_paths_of_differences() -> None:
+    expected = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "e": [1]}
+    actual = {"a": 1, "b": {"c": [1, 3], "d": "y"}, "e": [1, 2], "f": None}
+
+    assert diff(expected, actual) == ["b.c.1", "b.d", "e"]
+
+
+def test_replay_reports_no_mismatches_for_the_same_build(
+    records_path: Path, sample_resource: type[Resource]
+) -> None:
+    replayer = Replayer()
+    replayer.add_resource(sample_resource)
+    replayer.add_handler(Handler)
+
+    report = replayer.replay(read_records(records_path))
+
+    assert report.replayed == 3
+    assert report.mismatches == []
+    assert set(report.timings()) == {"helloworld", "Handler"}
+
+
+def test_replay_reports_changed_responses(records_path: Path) -> None:
+    class HelloWorld(Resource):
+        @add_route("/")
+        def list(self) -> Response:
+            return Response({"message": "Changed", "id": 1})
+
+    replayer = Replayer()
+    replayer.add_resource(HelloWorld)
+
+    report = replayer.replay(read_records(records_path), ignore=["body.id"])
+
+    assert report.replayed == 2
+    assert report.skipped == 1
+    assert report.mismatches == [
+        {"index": 0, "kind": "resource", "name": "helloworld", "differences": ["body.message"]}
+    ]
+    assert "#0 helloworld differs at: body.message" in str(report)
+
+
+def test_replay_reports_raising_handlers() -> None:
+    replayer = Replayer()
+    replayer.add_handler(Handler)
+    record = EventRecord("handler", "Handler", {"fail": True}, {"ok": True}, 1.0)
+
+    report = replayer.replay([record])
+
+    assert report.mismatches[0]["differences"] == ["errorMessage", "errorType", "ok"]
+
+
+def test_main_exits_with_error_on_mismatches(records_path: Path) -> None:
+    assert main([str(records_path), f"{__name__}:Handler"]) == 0
+    with patch.object(Handler, "handle", return_value={"ok": False}):
+        assert main([str(records_path), f"{__name__}:Handler"]) == 1
+
+
+def test_load_events_reads_recorded_resource_events(records_path: Path) -> None:
+    assert [event["path"] for event in load_events(records_path)] == ["/", "/missing"]
+
+
+def test_load_events_recognizes_uncompressed_records(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    JSONLinesStore(path).write(EventRecord("resource", "r", {"path": "/"}, {}, 1.0))
+    JSONLinesStore(path).write(EventRecord("handler", "h", {"id": 1}, {}, 1.0))
+
+    assert load_events(path) == [{"path": "/"}]
+
+
+def test_replay_of_brokers_shared_by_functions() -> None:
+    orders: list[Event] = []
+    emails: list[Event] = []
+    records = [
+        EventRecord("handler", name, {"detail-type": "X", "detail": {"id": 1}}, None, 1.0)
+        for name in ("orders", "emails", "orders")
+    ]
+    replayer = Replayer()
+    replayer.add_handler(EventBroker, {"X": [orders.append]}, name="orders")
+    replayer.add_handler(EventBroker, {"X": [emails.append]}, name="emails")
+
+    report = replayer.replay(records)
+
+    assert (report.replayed, report.mismatches) == (3, [])
+    assert (len(orders), len(emails)) == (2, 1)
+
+
+def test_handlers_are_recorded_under_the_function_name() -> None:
+    store = InMemoryStore()
+    event_recorder.set_store(store)
+    replayer = Replayer()
+    replayer.add_handler(LambdaBroker, MAPPER, name="orders")
+
+    replayer.replay([EventRecord("handler", "orders", {"op": "x"}, {}, 1.0)])
+    event_recorder.set_store(None)
+
+    assert [record.name for record in store.records] == ["orders"]
+
+
+def test_prepare_hook_puts_back_the_credentials() -> None:
+    class Secured(Resource):
+        @add_route("/")
+        def get(self) -> Response:
+            authorized = self.request.headers.get("Authorization") == "Bearer test"
+            return Response({}, status_code=200 if authorized else 401)
+
+    event = APIGatewayEvent(method="GET", resource_path="/", headers={"authorization": REDACTED})
+    record = EventRecord("resource", "secured", event, Secured(event)().to_dict(), 1.0)
+    record.response["statusCode"] = 200
+    replayer = Replayer(prepare=with_headers({"Authorization": "Bearer test"}))
+    replayer.add_resource(Secured)
+
+    assert replayer.replay([record]).mismatches == []
+    assert Replayer().replay([record]).skipped == 1
+
+
+def test_replay_redacts_responses_before_comparing_them(tmp_path: Path) -> None:
+    class Profile(Resource):
+        @add_route("/")
+        def get(self) -> Response:
+            return Response({"name": "Ann", "email": "ann@example.com"})
+
+    path = tmp_path / "events.jsonl"
+    event_recorder.set_store(JSONLinesStore(path))
+    Profile(APIGatewayEvent(method="GET", resource_path="/"))()
+    event_recorder.set_store(None)
+    replayer = Replayer()
+    replayer.add_resource(Profile)
+
+    report = replayer.replay(read_records(path))
+
+    assert report.replayed == 1
+    assert report.mismatches == []
+
+
+def test_main_adds_named_brokers_with_mappers(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    JSONLinesStore(path).write(EventRecord("handler", "fn", {"op": "x"}, MAPPER["x"]({}), 1.0))
+
+    assert main([str(path), f"fn={__name__}:LambdaBroker:MAPPER"]) == 0
@@ -1,13 +1,31 @@
 # coding=utf-8
+from __future__ import annotations
+
+import base64
 import io
 import json
+import os
 import socket
+import sys
+from collections.abc import Iterator
+from http.client import HTTPConnection
+from pathlib import Path
 from socketserver import BaseServer
 from unittest import mock
 from urllib import request
 
-from lbz.dev.server import MyDevServer, MyLambdaDevHandler
+import pytest
+
+from lbz.dev.server import (
+    FileWatcher,
+    MyDevServer,
+    MyLambdaDevHandler,
+    RouteMatcher,
+    is_text_content,
+)
 from lbz.resource import Resource
+from lbz.response import Response
+from lbz.router import add_route
 
 
 class MyClass:
@@ -62,3 +80,132 @@ def test_server_can_run_in_background(sample_resource: type[Resource]) -> None:
             assert json.loads(response.read().decode()) == {"message": "HelloWorld"}
     finally:
         dev_serv.stop()
+
+
+@pytest.fixture(name="echo_server")
+def echo_server_fixture() -> Iterator[MyDevServer]:
+    class EchoResource(Resource):
+        @add_route("/echo/{name}", method="POST")
+        def echo(self, name: str) -> Response:
+            return Response(
+                {
+                    "name": name,
+                    "body": self.request.raw_body.decode("latin-1"),  # type: ignore[union-attr]
+                    "tags": self.request.query_params.get_list("tag"),
+                    "accept": self.request.headers.getall("Accept"),
+                }
+            )
+
+        @add_route("/image", method="GET")
+        def image(self) -> Response:
+            return Response(
+                base64.b64encode(b"\x89PNG\x00").decode(),
+                headers={"Content-Type": "image/png"},
+                base64_encoded=True,
+            )
+
+    server = MyDevServer(EchoResource, port=0, workers=2, log_requests=False)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_route_matcher_matches_static_routes_first() -> None:
+    matcher = RouteMatcher(["/", "/t/{id}", "/t/me", "/t/{id}/items/{item}"])
+
+    assert matcher.match("/") == ("/", None)
+    assert matcher.match("/?x=1") == ("/", None)
+    assert matcher.match("/t/me") == ("/t/me", None)
+    assert matcher.match("/t/123?x=1") == ("/t/{id}", {"id": "123"})
+    assert matcher.match("/t/1/items/2") == ("/t/{id}/items/{item}", {"id": "1", "item": "2"})
+    assert matcher.match("/t/1/items") == (None, None)
+    assert matcher.match("/x/1") == (None, None)
+
+
+@pytest.mark.parametrize(
+    "content_type, expected",
+    [
+        (None, True),
+        ("application/json; charset=utf-8", True),
+        ("application/vnd.api+json", True),
+        ("text/csv", True),
+        ("application/octet-stream", False),
+        ("image/png", False),
+    ],
+)
+def test_is_text_content(content_type: str | None, expected: bool) -> None:
+    assert is_text_content(content_type) is expected
+
+
+def test_server_keeps_connection_alive_and_passes_bodies_through(echo_server: MyDevServer) -> None:
+    connection = HTTPConnection("localhost", echo_server.httpd.server_address[1])
+    try:
+        connection.request(
+            "POST",
+            "/echo/joe?tag=a&tag=b",
+            body=b"plain,text",
+            headers={"Content-Type": "text/csv", "Accept": "text/csv"},
+        )
+        response = connection.getresponse()
+        text_result = json.loads(response.read())
+        connection.request(
+            "POST",
+            "/echo/joe",
+            body=b"\x00\xff",
+            headers={"Content-Type": "application/octet-stream", "Accept": "*/*"},
+        )
+        binary_result = json.loads(connection.getresponse().read())
+        connection.request("GET", "/image")
+        image_response = connection.getresponse()
+        image = image_response.read()
+    finally:
+        connection.close()
+
+    assert response.version == 11
+    assert text_result == {
+        "name": "joe",
+        "body": "plain,text",
+        "tags": ["a", "b"],
+        "accept": ["text/csv"],
+    }
+    assert binary_result["body"] == "\x00\xff"
+    assert image_response.getheader("Content-Type") == "image/png"
+    assert image == b"\x89PNG\x00"
+
+
+def test_server_responds_with_not_found_for_unknown_paths(echo_server: MyDevServer) -> None:
+    connection = HTTPConnection("localhost", echo_server.httpd.server_address[1])
+    try:
+        connection.request("POST", "/unknown", body=b"{}")
+        response = connection.getresponse()
+        assert response.status == 404
+        assert json.loads(response.read()) == {"error": "Path not Found"}
+    finally:
+        connection.close()
+
+
+def test_file_watcher_detects_modified_modules(tmp_path: Path) -> None:
+    module_file = tmp_path / "watched_module.py"
+    module_file.write_text("X = 1\n")
+    with mock.patch.dict(sys.modules, {"watched_module": mock.Mock(__file__=str(module_file))}):
+        watcher = FileWatcher([str(tmp_path)])
+        assert watcher.changed() is None
+
+        os.utime(module_file, (0, 0))
+
+        assert watcher.changed() == str(module_file)
+        assert watcher.changed() is None
+
+
+def test_dev_server_restarts_on_changes(sample_resource: type[Resource]) -> None:
+    dev_serv = MyDevServer(sample_resource, port=0, reload=True)
+    dev_serv.reload_interval = 0.01
+    with (
+        mock.patch.object(FileWatcher, "changed", side_effect=[None, "resource.py"]),
+        mock.patch("lbz.dev.server.os.execv", side_effect=lambda *args: dev_serv.stop()) as execv,
+    ):
+        dev_serv.start()
+        dev_serv.join(timeout=5)
+
+    execv.assert_called_once()
+    assert not dev_serv.is_alive()
@@ -1,5 +1,8 @@
 import logging
 from collections.abc import Callable
+from dataclasses import dataclass
+from os import environ
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -8,12 +11,29 @@ from pytest import LogCaptureFixture
 from lbz.aws_boto3 import Boto3Client
 from lbz.events.api import EventAPI, event_emitter
 from lbz.events.event import Event
+from lbz.events.outbox import FileOutbox
+from lbz.exceptions import SchemaValidationError
 
 
 class MyTestEvent(Event):
     type = "MY_TEST_EVENT"
 
 
+@dataclass
+class MyTypedPayload:
+    x: int
+
+
+class MyTypedEvent(Event):
+    type = "MY_TYPED_API_EVENT"
+    schema = MyTypedPayload
+
+
+class MyEntityEvent(Event):
+    type = "MY_ENTITY_EVENT"
+    coalesce_by = "id"
+
+
 class TestEventAPI:
     def setup_method(self) -> None:
         # pylint: disable= attribute-defined-outside-init
@@ -62,23 +82,41 @@ class TestEventAPI:
             ]
         )
 
+    @patch.dict(
+        environ,
+        {"_X_AMZN_TRACE_ID": "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8"},
+    )
+    @patch.object(Boto3Client, "eventbridge")
+    def test__send__passes_the_trace_header_with_entries(self, mock_send: MagicMock) -> None:
+        self.event_api.register(MyTestEvent({"x": 1}))
+
+        self.event_api.send()
+
+        (entry,) = mock_send.put_events.call_args.kwargs["Entries"]
+        assert entry["TraceHeader"] == (
+            "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8"
+        )
+
     def test__sent_events__disallows_changing_its_content_outside_api(self) -> None:
-        self.event_api.sent_events.append(MyTestEvent({"x": 0}))
+        with pytest.raises(AttributeError):
+            self.event_api.sent_events.append(MyTestEvent({"x": 0}))  # type: ignore
 
-        assert self.event_api.sent_events == []
+        assert self.event_api.sent_events == ()
 
     def test__pending_events__disallows_changing_its_content_outside_api(self) -> None:
-        self.event_api.pending_events.append(MyTestEvent({"x": 0}))
+        with pytest.raises(AttributeError):
+            self.event_api.pending_events.append(MyTestEvent({"x": 0}))  # type: ignore
 
-        assert self.event_api.pending_events == []
+        assert self.event_api.pending_events == ()
 
     def test__failed_events__disallows_changing_its_content_outside_api(self) -> None:
-        self.event_api.failed_events.append(MyTestEvent({"x": 0}))
+        with pytest.raises(AttributeError):
+            self.event_api.failed_events.append(MyTestEvent({"x": 0}))  # type: ignore
 
-        assert self.event_api.failed_events == []
+        assert self.event_api.failed_events == ()
 
     def test_register_saves_event_in_right_place(self) -> None:
-        assert self.event_api.pending_events == []
+        assert not self.event_api.pending_events
 
         event_1 = MyTestEvent({"x": 1})
         event_2 = MyTestEvent({"x": 2})
@@ -86,7 +124,68 @@ class TestEventAPI:
         self.event_api.register(event_1)
         self.event_api.register(event_2)
 
-        assert self.event_api.pending_events == [event_1, event_2]
+        assert self.event_api.pending_events == (event_1, event_2)
+
+    def test__register__rejects_events_not_matching_their_schema(self) -> None:
+        with pytest.raises(SchemaValidationError, match="x: Field required"):
+            self.event_api.register(MyTypedEvent({"y": 1}))
+
+        assert not self.event_api.pending_events
+
+    def test__register__coalesces_events_of_the_same_entity_keeping_the_last_one(self) -> None:
+        self.event_api.register(MyEntityEvent({"id": 1, "v": 1}))
+        self.event_api.register(MyEntityEvent({"id": 2, "v": 1}))
+        self.event_api.register(MyTestEvent({"id": 1, "v": 1}))
+        self.event_api.register(MyEntityEvent({"id": 1, "v": 2}))
+        self.event_api.register(MyEntityEvent({"v": 3}))
+        self.event_api.register(MyEntityEvent({"v": 3}))
+
+        assert self.event_api.pending_events == (
+            MyEntityEvent({"id": 2, "v": 1}),
+            MyTestEvent({"id": 1, "v": 1}),
+            MyEntityEvent({"id": 1, "v": 2}),
+            MyEntityEvent({"v": 3}),
+            MyEntityEvent({"v": 3}),
+        )
+
+    def test__register__replaces_pending_event_registered_with_the_same_key(self) -> None:
+        self.event_api.register(MyTestEvent({"x": 1}), key="a")
+        self.event_api.register(MyTestEvent({"x": 2}), key="b")
+        self.event_api.register(MyTestEvent({"x": 3}), key="a")
+
+        assert self.event_api.pending_events == (MyTestEvent({"x": 2}), MyTestEvent({"x": 3}))
+
+    def test__register__drops_identical_events_when_deduplication_is_enabled(self) -> None:
+        self.event_api.set_deduplication(True)
+
+        self.event_api.register(MyTestEvent({"x": 1}))
+        self.event_api.register(MyTestEvent({"x": 2}))
+        self.event_api.register(MyTestEvent({"x": 1}))
+        self.event_api.register(Event({"x": 1}, event_type="OTHER"))
+
+        assert self.event_api.pending_events == (
+            MyTestEvent({"x": 2}),
+            MyTestEvent({"x": 1}),
+            Event({"x": 1}, event_type="OTHER"),
+        )
+
+    def test__register__drops_identical_events_regardless_of_key_order(self) -> None:
+        self.event_api.set_deduplication(True)
+
+        self.event_api.register(MyTestEvent({"x": 1, "y": 2}))
+        self.event_api.register(MyTestEvent({"y": 2, "x": 1}))
+
+        assert len(self.event_api.pending_events) == 1
+
+    @patch.object(Boto3Client, "eventbridge")
+    def test__send__sends_coalesced_events_only(self, mock_send: MagicMock) -> None:
+        for version in range(5):
+            self.event_api.register(MyEntityEvent({"id": 1, "v": version}))
+
+        self.event_api.send()
+
+        mock_send.put_events.assert_called_once()
+        assert mock_send.put_events.call_args.kwargs["Entries"][0]["Detail"] == '{"id": 1, "v": 4}'
 
     @patch.object(Boto3Client, "eventbridge")
     def test_send(self, mock_send: MagicMock) -> None:
@@ -106,7 +205,7 @@ class TestEventAPI:
                 }
             ]
         )
-        assert self.event_api.sent_events == [event]
+        assert self.event_api.sent_events == (event,)
 
     @patch.object(Boto3Client, "eventbridge")
     def test__send__sends_events_in_chunks_respecting_limits(self, mock_send: MagicMock) -> None:
@@ -152,7 +251,7 @@ class TestEventAPI:
 
     @patch.object(Boto3Client, "eventbridge")
     def test_sent_fail_saves_events_in_right_place(self, mock_send: MagicMock) -> None:
-        assert self.event_api.failed_events == []
+        assert not self.event_api.failed_events
 
         mock_send.put_events.side_effect = NotADirectoryError
         event = MyTestEvent({"x": 1})
@@ -161,16 +260,16 @@ class TestEventAPI:
         with pytest.raises(RuntimeError):
             self.event_api.send()
 
-        assert self.event_api.failed_events == [event]
+        assert self.event_api.failed_events == (event,)
 
     @patch.object(Boto3Client, "eventbridge")
     def test_send_no_events(self, mock_send: MagicMock) -> None:
         self.event_api.send()
 
         mock_send.put_events.assert_not_called()
-        assert self.event_api.failed_events == []
-        assert self.event_api.sent_events == []
-        assert self.event_api.pending_events == []
+        assert self.event_api.failed_events == ()
+        assert self.event_api.sent_events == ()
+        assert self.event_api.pending_events == ()
 
     @patch.object(Boto3Client, "eventbridge")
     def test_singleton_pattern_working_correctly_for_event_api(self, mock_send: MagicMock) -> None:
@@ -211,9 +310,9 @@ class TestEventAPI:
         self.event_api.register(event)
         self.event_api.send()
 
-        assert self.event_api.failed_events == [event]
-        assert self.event_api.sent_events == [event, event]
-        assert self.event_api.pending_events == []
+        assert self.event_api.failed_events == (event,)
+        assert self.event_api.sent_events == (event, event)
+        assert self.event_api.pending_events == ()
 
     @patch.object(Boto3Client, "eventbridge", MagicMock())
     def test__send__continuously_extends_lists_of_events_during_next_attempts(self) -> None:
@@ -227,9 +326,9 @@ class TestEventAPI:
         self.event_api.register(event_3)
         self.event_api.send()
 
-        assert self.event_api.failed_events == []
-        assert self.event_api.sent_events == [event_1, event_2, event_3]
-        assert self.event_api.pending_events == []
+        assert self.event_api.failed_events == ()
+        assert self.event_api.sent_events == (event_1, event_2, event_3)
+        assert self.event_api.pending_events == ()
 
     @patch.object(Boto3Client, "eventbridge", MagicMock())
     def test_clear(self) -> None:
@@ -240,9 +339,9 @@ class TestEventAPI:
 
         self.event_api.clear()
 
-        assert self.event_api.failed_events == []
-        assert self.event_api.sent_events == []
-        assert self.event_api.pending_events == []
+        assert self.event_api.failed_events == ()
+        assert self.event_api.sent_events == ()
+        assert self.event_api.pending_events == ()
 
     @patch.object(Boto3Client, "eventbridge", MagicMock())
     def test__clear_pending__clears_only_pending_events(self) -> None:
@@ -253,9 +352,9 @@ class TestEventAPI:
 
         self.event_api.clear_pending()
 
-        assert self.event_api.failed_events == []
-        assert self.event_api.sent_events == [event]
-        assert self.event_api.pending_events == []
+        assert self.event_api.failed_events == ()
+        assert self.event_api.sent_events == (event,)
+        assert self.event_api.pending_events == ()
 
     @patch.object(Boto3Client, "eventbridge", MagicMock())
     def test__clear_sent__clears_only_sent_events(self) -> None:
@@ -266,9 +365,9 @@ class TestEventAPI:
 
         self.event_api.clear_sent()
 
-        assert self.event_api.failed_events == []
-        assert self.event_api.sent_events == []
-        assert self.event_api.pending_events == [event]
+        assert self.event_api.failed_events == ()
+        assert self.event_api.sent_events == ()
+        assert self.event_api.pending_events == (event,)
 
     @patch.object(Boto3Client, "eventbridge")
     def test__clear_failed__clears_only_failed_events(self, mock_send: MagicMock) -> None:
@@ -281,9 +380,106 @@ class TestEventAPI:
 
         self.event_api.clear_failed()
 
-        assert self.event_api.failed_events == []
-        assert self.event_api.sent_events == []
-        assert self.event_api.pending_events == [event]
+        assert self.event_api.failed_events == ()
+        assert self.event_api.sent_events == ()
+        assert self.event_api.pending_events == (event,)
+
+
+class TestEventAPIOutboxMode:
+    def setup_method(self) -> None:
+        # pylint: disable= attribute-defined-outside-init
+        self.event_api = EventAPI()
+
+    def teardown_method(self, _test_method: Callable) -> None:
+        self.event_api._del()  # type: ignore # pylint: disable=protected-access
+
+    @patch.object(Boto3Client, "eventbridge", MagicMock())
+    def test__send__removes_events_from_outbox_once_sent(self, tmp_path: Path) -> None:
+        outbox = FileOutbox(str(tmp_path / "outbox.jsonl"))
+        self.event_api.set_outbox(outbox)
+        self.event_api.register(MyTestEvent({"x": 1}))
+
+        with patch.object(outbox, "save", wraps=outbox.save) as mocked_save:
+            self.event_api.send()
+
+        mocked_save.assert_called_once_with([MyTestEvent({"x": 1})])
+        assert self.event_api.outbox is outbox
+        assert self.event_api.sent_events == (MyTestEvent({"x": 1}),)
+        assert not outbox.load()
+
+    @patch.object(Boto3Client, "eventbridge")
+    def test__send__keeps_unsent_events_in_outbox(
+        self, mock_send: MagicMock, tmp_path: Path
+    ) -> None:
+        mock_send.put_events.side_effect = [None, ValueError]
+        outbox = FileOutbox(str(tmp_path / "outbox.jsonl"))
+        self.event_api.set_outbox(outbox)
+        for i in range(15):
+            self.event_api.register(MyTestEvent({"x": i}))
+
+        with pytest.raises(RuntimeError):
+            self.event_api.send()
+
+        assert [event for _, event in outbox.load()] == [
+            MyTestEvent({"x": i}) for i in range(10, 15)
+        ]
+
+    @patch.object(Boto3Client, "eventbridge")
+    def test__send__does_not_lose_events_when_outbox_failed(
+        self, mock_send: MagicMock, tmp_path: Path
+    ) -> None:
+        outbox = FileOutbox(str(tmp_path / "outbox.jsonl"))
+        self.event_api.set_outbox(outbox)
+        self.event_api.register(MyTestEvent({"x": 1}))
+
+        with patch.object(outbox, "save", side_effect=OSError):
+            with pytest.raises(OSError):
+                self.event_api.send()
+
+        mock_send.put_events.assert_not_called()
+        assert self.event_api.pending_events == (MyTestEvent({"x": 1}),)
+
+    @patch.object(Boto3Client, "eventbridge", MagicMock())
+    def test__send__ignores_errors_of_removing_sent_events_from_outbox(
+        self, tmp_path: Path, caplog: LogCaptureFixture
+    ) -> None:
+        outbox = FileOutbox(str(tmp_path / "outbox.jsonl"))
+        self.event_api.set_outbox(outbox)
+        self.event_api.register(MyTestEvent({"x": 1}))
+
+        with patch.object(outbox, "remove", side_effect=OSError):
+            self.event_api.send()
+
+        assert self.event_api.sent_events == (MyTestEvent({"x": 1}),)
+        assert "Removing sent events from the outbox has failed" in caplog.text
+
+    @patch.object(Boto3Client, "eventbridge")
+    def test__replay__sends_events_left_in_outbox(
+        self, mock_send: MagicMock, tmp_path: Path
+    ) -> None:
+        outbox = FileOutbox(str(tmp_path / "outbox.jsonl"))
+        outbox.save([MyTestEvent({"x": 1})])
+        self.event_api.set_outbox(outbox)
+
+        self.event_api.replay()
+
+        mock_send.put_events.assert_called_once()
+        assert self.event_api.sent_events == (MyTestEvent({"x": 1}),)
+        assert not outbox.load()
+
+    @patch.object(Boto3Client, "eventbridge")
+    def test__replay__does_nothing_when_outbox_is_empty(
+        self, mock_send: MagicMock, tmp_path: Path
+    ) -> None:
+        self.event_api.set_outbox(FileOutbox(str(tmp_path / "outbox.jsonl")))
+
+        self.event_api.replay()
+
+        mock_send.put_events.assert_not_called()
+
+    def test__replay__raises_when_outbox_is_not_set(self) -> None:
+        with pytest.raises(RuntimeError, match="Replaying events requires the outbox to be set!"):
+            self.event_api.replay()
 
 
 @patch.object(Boto3Client, "eventbridge", MagicMock())
@@ -306,7 +502,7 @@ class TestEventEmitter:
 
         decorated_function()
 
-        assert EventAPI().sent_events == [MyTestEvent({"x": 1})]
+        assert EventAPI().sent_events == (MyTestEvent({"x": 1}),)
         assert not EventAPI().pending_events
         assert not EventAPI().failed_events
 
@@ -323,7 +519,7 @@ class TestEventEmitter:
         with pytest.raises(RuntimeError):
             decorated_function()
 
-        assert EventAPI().sent_events == [MyTestEvent({"x": 2})]
+        assert EventAPI().sent_events == (MyTestEvent({"x": 2}),)
         assert not EventAPI().pending_events
         assert not EventAPI().failed_events
 
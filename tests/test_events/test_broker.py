@@ -1,15 +1,22 @@
 import logging
 from collections.abc import Callable, Mapping
 from copy import deepcopy
-from unittest.mock import MagicMock
+from dataclasses import dataclass
+from unittest.mock import MagicMock, patch
 
 import pytest
 from pytest import LogCaptureFixture
 
-from lbz.events import BaseEventBroker, CognitoEventBroker, Event, EventBroker
+from lbz.events import BaseEventBroker, CognitoEventBroker, Event, EventBroker, event_schemas
+from lbz.exceptions import SchemaValidationError
 from lbz.type_defs import LambdaContext
 
 
+@dataclass
+class BrokerPayload:
+    y: int
+
+
 class TestBaseEventBroker:
     def test_broker_works_properly(self) -> None:
         func_1 = MagicMock()
@@ -96,6 +103,47 @@ class TestBaseEventBroker:
 
         assert passed_events == expected_events
 
+    def test_broker_passes_events_with_data_decoded_using_registered_schema(self) -> None:
+        payloads = []
+        mapper: dict[str, list] = {"typed": [lambda event: payloads.append(event.payload)]}
+        event_schemas.register("typed", BrokerPayload)
+
+        try:
+            BaseEventBroker(
+                mapper,
+                {"my-type": "typed", "data": {"y": 1}},
+                LambdaContext(),
+                type_key="my-type",
+                data_key="data",
+            ).react()
+        finally:
+            event_schemas.unregister("typed")
+
+        assert payloads == [BrokerPayload(y=1)]
+
+    def test_broker_logs_error_without_calling_handlers_when_data_does_not_match_schema(
+        self, caplog: LogCaptureFixture
+    ) -> None:
+        func_1 = MagicMock()
+        event_schemas.register("typed", BrokerPayload)
+
+        try:
+            with patch.object(BaseEventBroker, "post_handle") as post_handle:
+                BaseEventBroker(
+                    {"typed": [func_1]},
+                    {"my-type": "typed", "data": {"y": "1"}},
+                    LambdaContext(),
+                    type_key="my-type",
+                    data_key="data",
+                ).react()
+        finally:
+            event_schemas.unregister("typed")
+
+        func_1.assert_not_called()
+        post_handle.assert_called()
+        assert caplog.records[0].message.startswith("Validating event failed")
+        assert isinstance(caplog.records[0].exc_info[1], SchemaValidationError)  # type: ignore
+
 
 class TestCognitoEventBroker:
     def test_broker_works_properly(self) -> None:
@@ -1,10 +1,29 @@
+import pickle  # nosec B403
+from collections.abc import Callable
+from copy import copy, deepcopy
+from dataclasses import dataclass
+from unittest.mock import patch
+
+import pytest
+
 from lbz.events.event import Event
+from lbz.exceptions import SchemaValidationError
 
 
 class MyTestEvent(Event):
     type = "MY_TEST_EVENT"
 
 
+@dataclass
+class MyTypedPayload:
+    x: int
+
+
+class MyTypedEvent(Event):
+    type = "MY_TYPED_EVENT"
+    schema = MyTypedPayload
+
+
 class TestEvent:
     def test_event_creation_and_structure(self) -> None:
         event = {"x": 1}
@@ -34,3 +53,97 @@ class TestEvent:
         new_event_2 = MySecondTestEvent({"x": 1})
 
         assert new_event_1 != new_event_2
+
+    def test__type__is_available_on_class_and_instance(self) -> None:
+        assert MyTestEvent.type == "MY_TEST_EVENT"
+        assert MyTestEvent({"x": 1}).type == "MY_TEST_EVENT"
+        assert MyTestEvent({"x": 1}, event_type="OVERRIDDEN").type == "OVERRIDDEN"
+        assert Event({"x": 1}, event_type="GENERIC").type == "GENERIC"
+
+    def test__init__raises_when_type_is_not_declared(self) -> None:
+        with pytest.raises(ValueError, match="Type of the Event event has to be declared"):
+            Event({"x": 1})
+
+    def test_event_is_immutable(self) -> None:
+        event = MyTestEvent({"x": 1})
+
+        with pytest.raises(AttributeError, match="MyTestEvent is immutable"):
+            event.data = {"x": 2}  # type: ignore[misc]
+        with pytest.raises(AttributeError, match="MyTestEvent is immutable"):
+            del event.data
+
+    def test__serialized_data__is_computed_only_once(self) -> None:
+        event = MyTestEvent({"x": 1})
+
+        with patch.object(MyTestEvent, "serialize", wraps=Event.serialize) as mocked_serialize:
+            assert event.serialized_data == '{"x": 1}'
+            assert event.serialized_data == '{"x": 1}'
+
+        mocked_serialize.assert_called_once_with({"x": 1})
+
+    def test__size__returns_number_of_bytes_of_serialized_data(self) -> None:
+        assert MyTestEvent({"x": "ł"}).size == len('{"x": "\\u0142"}')
+
+    def test__hash__is_consistent_with_eq(self) -> None:
+        events = {MyTestEvent({"x": 1, "y": 2}), MyTestEvent({"y": 2, "x": 1})}
+
+        assert events == {MyTestEvent({"x": 1, "y": 2})}
+
+    @pytest.mark.parametrize("copy_func", [copy, deepcopy])
+    def test_event_can_be_copied(self, copy_func: Callable) -> None:
+        event = MyTestEvent({"x": {"y": 1}}, event_type="COPIED")
+
+        copied_event = copy_func(event)
+
+        assert copied_event == event
+        assert copied_event.type == "COPIED"
+        assert copied_event.serialized_data == event.serialized_data
+
+    def test_event_can_be_pickled(self) -> None:
+        event = MyTestEvent({"x": 1})
+
+        assert pickle.loads(pickle.dumps(event)) == event
+
+    def test__payload__returns_data_when_no_schema_is_declared(self) -> None:
+        event = MyTestEvent({"x": 1})
+
+        assert event.payload is event.data
+
+    def test__payload__decodes_data_using_declared_schema(self) -> None:
+        assert MyTypedEvent({"x": 1}).payload == MyTypedPayload(x=1)
+
+    def test__payload__is_decoded_using_schema_registered_for_type(self) -> None:
+        assert Event({"x": 1}, event_type="MY_TYPED_EVENT").payload == MyTypedPayload(x=1)
+
+    def test__validate__raises_when_data_does_not_match_schema(self) -> None:
+        with pytest.raises(SchemaValidationError, match="x: Expected integer"):
+            MyTypedEvent({"x": "1"}).validate()
+
+    def test__payload__is_preserved_when_event_is_copied(self) -> None:
+        event = MyTypedEvent({"x": 1})
+        event.validate()
+
+        with patch("lbz.events.event.event_schemas") as mocked_schemas:
+            assert deepcopy(event).payload == MyTypedPayload(x=1)
+
+        mocked_schemas.decode.assert_not_called()
+
+    def test__coalescing_key__is_based_on_declared_entity_field(self) -> None:
+        class MyEntityEvent(Event):
+            type = "MY_ENTITY_EVENT"
+            coalesce_by = "id"
+
+        assert MyTestEvent({"id": 1}).coalescing_key is None
+        assert MyEntityEvent({"x": 1}).coalescing_key is None
+        assert MyEntityEvent({"id": 1}).coalescing_key == ("MY_ENTITY_EVENT", 1)
+
+    def test__coalescing_key__is_hashable_for_compound_entity_ids(self) -> None:
+        class MyEntityEvent(Event):
+            type = "MY_ENTITY_EVENT"
+            coalesce_by = "id"
+
+        first = MyEntityEvent({"id": {"tenant": "t", "ids": [1, 2]}}).coalescing_key
+        second = MyEntityEvent({"id": {"ids": [1, 2], "tenant": "t"}}).coalescing_key
+
+        assert first == second
+        assert len({first, second}) == 1
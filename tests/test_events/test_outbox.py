@@ -0,0 +1,144 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lbz.aws_boto3 import Boto3Client
+from lbz.events.event import Event
+from lbz.events.outbox import DynamoDBOutbox, FileOutbox
+
+
+class MyTestEvent(Event):
+    type = "MY_TEST_EVENT"
+
+
+class TestFileOutbox:
+    def test__load__returns_nothing_when_nothing_was_saved(self, tmp_path: Path) -> None:
+        assert not FileOutbox(str(tmp_path / "outbox.jsonl")).load()
+
+    def test_saved_events_are_loaded_until_removed(self, tmp_path: Path) -> None:
+        outbox = FileOutbox(str(tmp_path / "outbox.jsonl"))
+
+        record_ids = outbox.save([MyTestEvent({"x": 1}), MyTestEvent({"x": 2})])
+        outbox.remove(record_ids[:1])
+
+        assert outbox.load() == [(record_ids[1], MyTestEvent({"x": 2}))]
+
+    def test_records_are_shared_between_instances_using_the_same_file(
+        self, tmp_path: Path
+    ) -> None:
+        record_ids = FileOutbox(str(tmp_path / "outbox.jsonl")).save([MyTestEvent({"x": 1})])
+
+        assert FileOutbox(str(tmp_path / "outbox.jsonl")).load() == [
+            (record_ids[0], MyTestEvent({"x": 1}))
+        ]
+
+
+@patch.object(Boto3Client, "dynamodb")
+class TestDynamoDBOutbox:
+    @patch("lbz.events.outbox.time.time", MagicMock(return_value=1000.0))
+    def test__save__writes_events_in_batches(self, mocked_dynamodb: MagicMock) -> None:
+        mocked_dynamodb.batch_write_item.return_value = {"UnprocessedItems": {}}
+
+        record_ids = DynamoDBOutbox("outbox").save([MyTestEvent({"x": i}) for i in range(30)])
+
+        assert len(record_ids) == 30
+        assert mocked_dynamodb.batch_write_item.call_count == 2
+        first_request = mocked_dynamodb.batch_write_item.call_args_list[0].kwargs
+        assert len(first_request["RequestItems"]["outbox"]) == 25
+        assert first_request["RequestItems"]["outbox"][0] == {
+            "PutRequest": {
+                "Item": {
+                    "id": {"S": record_ids[0]},
+                    "type": {"S": "MY_TEST_EVENT"},
+                    "data": {"S": '{"x": 0}'},
+                    "created_at": {"N": "1000.0"},
+                }
+            }
+        }
+
+    @patch("lbz.events.outbox.time.sleep", MagicMock())
+    def test__save__retries_unprocessed_items(self, mocked_dynamodb: MagicMock) -> None:
+        unprocessed: dict = {"outbox": [{"PutRequest": {}}]}
+        mocked_dynamodb.batch_write_item.side_effect = [{"UnprocessedItems": unprocessed}, {}]
+
+        DynamoDBOutbox("outbox").save([MyTestEvent({"x": 1})])
+
+        assert mocked_dynamodb.batch_write_item.call_args_list[1].kwargs == {
+            "RequestItems": unprocessed
+        }
+
+    @patch("lbz.events.outbox.time.sleep", MagicMock())
+    def test__save__raises_when_items_could_not_be_written(
+        self, mocked_dynamodb: MagicMock
+    ) -> None:
+        mocked_dynamodb.batch_write_item.return_value = {"UnprocessedItems": {"outbox": [{}]}}
+
+        with pytest.raises(RuntimeError, match="Writing to outbox outbox has failed!"):
+            DynamoDBOutbox("outbox").save([MyTestEvent({"x": 1})])
+
+    @patch("lbz.events.outbox.time.time", MagicMock(return_value=1000.0))
+    def test__load__claims_records_older_than_the_send_timeout(
+        self, mocked_dynamodb: MagicMock
+    ) -> None:
+        mocked_dynamodb.get_paginator.return_value.paginate.return_value = [
+            {"Items": [{"id": {"S": "1"}, "type": {"S": "A"}, "data": {"S": '{"x": 1}'}}]},
+            {"Items": [{"id": {"S": "2"}, "type": {"S": "B"}, "data": {"S": "{}"}}]},
+        ]
+
+        records = DynamoDBOutbox("outbox", send_timeout=100).load()
+
+        assert records == [
+            ("1", Event({"x": 1}, event_type="A")),
+            ("2", Event({}, event_type="B")),
+        ]
+        mocked_dynamodb.get_paginator.return_value.paginate.assert_called_once_with(
+            TableName="outbox",
+            FilterExpression=(
+                "(attribute_not_exists(created_at) OR created_at < :stale) "
+                "AND (attribute_not_exists(claimed_at) OR claimed_at < :stale)"
+            ),
+            ExpressionAttributeValues={":stale": {"N": "900.0"}},
+        )
+        mocked_dynamodb.update_item.assert_called_with(
+            TableName="outbox",
+            Key={"id": {"S": "2"}},
+            UpdateExpression="SET claimed_at = :now",
+            ConditionExpression=(
+                "attribute_exists(id) "
+                "AND (attribute_not_exists(claimed_at) OR claimed_at < :stale)"
+            ),
+            ExpressionAttributeValues={":stale": {"N": "900.0"}, ":now": {"N": "1000.0"}},
+        )
+
+    def test__load__skips_records_claimed_by_other_containers(
+        self, mocked_dynamodb: MagicMock
+    ) -> None:
+        class ConditionalCheckFailedException(Exception):
+            pass
+
+        mocked_dynamodb.exceptions.ConditionalCheckFailedException = (
+            ConditionalCheckFailedException
+        )
+        mocked_dynamodb.update_item.side_effect = [ConditionalCheckFailedException, {}]
+        mocked_dynamodb.get_paginator.return_value.paginate.return_value = [
+            {
+                "Items": [
+                    {"id": {"S": "1"}, "type": {"S": "A"}, "data": {"S": "{}"}},
+                    {"id": {"S": "2"}, "type": {"S": "B"}, "data": {"S": "{}"}},
+                ]
+            },
+        ]
+
+        records = DynamoDBOutbox("outbox").load()
+
+        assert records == [("2", Event({}, event_type="B"))]
+
+    def test__remove__deletes_records(self, mocked_dynamodb: MagicMock) -> None:
+        mocked_dynamodb.batch_write_item.return_value = {}
+
+        DynamoDBOutbox("outbox").remove(["1"])
+
+        mocked_dynamodb.batch_write_item.assert_called_once_with(
+            RequestItems={"outbox": [{"DeleteRequest": {"Key": {"id": {"S": "1"}}}}]}
+        )
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+import pytest
+
+from lbz.events.schema import EventSchemaRegistry, event_schemas
+from lbz.exceptions import SchemaValidationError
+
+
+@dataclass
+class Payload:
+    x: int
+
+
+class TestEventSchemaRegistry:
+    def teardown_method(self) -> None:
+        event_schemas.unregister("REGISTRY_TEST_EVENT")
+
+    def test_registry_is_a_singleton(self) -> None:
+        assert EventSchemaRegistry() is event_schemas
+
+    def test__register__compiles_schema_for_event_type(self) -> None:
+        event_schemas.register("REGISTRY_TEST_EVENT", Payload)
+
+        assert "REGISTRY_TEST_EVENT" in event_schemas
+        assert event_schemas.get("REGISTRY_TEST_EVENT").schema is Payload  # type: ignore
+
+    def test__decode__decodes_data_with_registered_schema(self) -> None:
+        event_schemas.register("REGISTRY_TEST_EVENT", Payload)
+
+        assert event_schemas.decode("REGISTRY_TEST_EVENT", {"x": 1}) == Payload(x=1)
+        with pytest.raises(SchemaValidationError, match="x: Expected integer"):
+            event_schemas.decode("REGISTRY_TEST_EVENT", {"x": "1"})
+
+    def test__decode__passes_data_through_when_no_schema_registered(self) -> None:
+        data = {"x": "1"}
+
+        assert event_schemas.decode("REGISTRY_TEST_EVENT", data) is data
+
+    def test__unregister__removes_schema(self) -> None:
+        event_schemas.register("REGISTRY_TEST_EVENT", Payload)
+
+        event_schemas.unregister("REGISTRY_TEST_EVENT")
+
+        assert "REGISTRY_TEST_EVENT" not in event_schemas
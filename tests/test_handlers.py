@@ -5,6 +5,7 @@ import pytest
 from pytest import LogCaptureFixture
 
 from lbz.handlers import BaseHandler
+from lbz.tracing import InMemoryExporter, tracer
 from lbz.type_defs import LambdaContext
 
 
@@ -51,3 +52,21 @@ def test__react__only_logs_error_when_post_handle_fails(
     post_handle.assert_called_once()
 
     assert caplog.record_tuples == [("lbz.handlers", logging.ERROR, "xxxx")]
+
+
+def test__react__traces_the_handler_phases() -> None:
+    exporter = InMemoryExporter()
+    tracer.set_exporter(exporter)
+
+    MyBaseHandler({}, LambdaContext()).react()
+
+    assert [span.name for span in exporter.spans] == ["handle", "post_handle", "MyBaseHandler"]
+    assert exporter.spans[0].parent_id == exporter.spans[2].span_id
+
+
+def test__react__creates_no_spans_when_untraced() -> None:
+    with patch.object(tracer, "span") as span:
+        response = MyBaseHandler({}, LambdaContext()).react()
+
+    assert response == "something"
+    span.assert_not_called()
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = ("boto3", "botocore", "jose")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True, timeout=60
+    )
+
+
+def test_importing_resource_does_not_import_heavy_dependencies() -> None:
+    result = run_python(
+        "-c",
+        "import sys, lbz.resource, lbz.authz, lbz.events; "
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))",
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_importing_the_package_imports_no_other_modules() -> None:
+    result = run_python(
+        "-c",
+        "import sys; before = set(sys.modules); import lbz; "
+        "print(','.join(sorted(set(sys.modules) - before)))",
+    )
+
+    assert result.stdout.strip() == "lbz"
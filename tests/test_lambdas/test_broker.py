@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import logging
+from unittest.mock import MagicMock
 
 from pytest import LogCaptureFixture
 
+from lbz.deadline import get_deadline
 from lbz.exceptions import NotFound
 from lbz.lambdas import LambdaBroker, LambdaResponse, LambdaResult, lambda_ok_response
+from lbz.lambdas.broker import CONTAINER_STATS_OP
+from lbz.tracing import InMemoryExporter, tracer
 from lbz.type_defs import LambdaContext
 
 
@@ -129,3 +133,47 @@ class TestEventBroker:
                 'Unexpected error in "func" function!',
             )
         ]
+
+
+def test_broker_continues_the_trace_of_the_caller() -> None:
+    exporter = InMemoryExporter()
+    tracer.set_exporter(exporter)
+    context = LambdaContext()
+    context.client_context = MagicMock(
+        custom={"trace_header": "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8"}
+    )
+
+    LambdaBroker({"x": simple_func}, {"op": "x"}, context).react()
+
+    (span,) = exporter.get_spans("LambdaBroker")
+    assert span.trace_id == "5759e988bd862e3fe1be46a994272793"
+    assert span.parent_id == "53995c3f42cd8ad8"
+
+
+def test_broker_returns_container_stats_on_the_built_in_op() -> None:
+    response = LambdaBroker({}, {"op": CONTAINER_STATS_OP}, LambdaContext()).react()
+
+    assert response["result"] == LambdaResult.OK
+    assert response["data"]["invocations"] == 1
+    assert response["data"]["cold_start"] is True
+
+
+def test_broker_prefers_the_mapped_handler_of_the_container_stats_op() -> None:
+    response = LambdaBroker(
+        {CONTAINER_STATS_OP: simple_func}, {"op": CONTAINER_STATS_OP}, LambdaContext()
+    ).react()
+
+    assert response == {"result": LambdaResult.OK}
+
+
+def test_broker_responds_with_server_error_when_deadline_expired() -> None:
+    handler = MagicMock(__name__="handler")
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = 100
+
+    resp = LambdaBroker({"x": handler}, {"op": "x"}, context).react()
+
+    assert resp["result"] == LambdaResult.SERVER_ERROR
+    assert resp["message"] == "The request could not be completed in time"
+    handler.assert_not_called()
+    assert get_deadline() is None
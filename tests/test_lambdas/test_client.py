@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import base64
 import json
 import logging
 from io import BytesIO
-from unittest.mock import ANY, MagicMock
+from os import environ
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 from pytest import LogCaptureFixture
@@ -11,6 +13,10 @@ from pytest_mock import MockerFixture
 
 from lbz.aws_boto3 import Boto3Client
 from lbz.lambdas import LambdaClient, LambdaError, LambdaResult, LambdaSource
+from lbz.rest import APIGatewayEvent
+from lbz.tracing import InMemoryExporter, tracer
+
+TRACE_HEADER = "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8;Sampled=1"
 
 
 @pytest.fixture(name="lambda_client")
@@ -359,3 +365,57 @@ def test__request__uses_all_parameters_provided_from_outside_to_get_response(
         "resource": "/{pid}",
         "stageVariables": {},
     }
+
+
+@patch.dict(environ, {"_X_AMZN_TRACE_ID": TRACE_HEADER})
+def test__invoke__passes_the_trace_header_in_the_client_context(lambda_client: MagicMock) -> None:
+    lambda_client.invoke.return_value = {
+        "Payload": BytesIO(json.dumps({"result": LambdaResult.OK}).encode("utf-8"))
+    }
+
+    LambdaClient.invoke("test-func", "test-op", {"x": 1})
+
+    kwargs = lambda_client.invoke.call_args.kwargs
+    assert json.loads(kwargs["Payload"]) == {
+        "invoke_type": LambdaSource.DIRECT,
+        "op": "test-op",
+        "data": {"x": 1},
+    }
+    assert json.loads(base64.b64decode(kwargs["ClientContext"])) == {
+        "custom": {"trace_header": TRACE_HEADER}
+    }
+
+
+@patch.dict(environ, {"_X_AMZN_TRACE_ID": TRACE_HEADER})
+def test__invoke__does_not_pass_client_context_asynchronously(lambda_client: MagicMock) -> None:
+    LambdaClient.invoke("test-func", "test-op", {"x": 1}, asynchronous=True)
+
+    assert "ClientContext" not in lambda_client.invoke.call_args.kwargs
+
+
+@patch.dict(environ, {"_X_AMZN_TRACE_ID": TRACE_HEADER})
+def test__request__does_not_modify_the_event(lambda_client: MagicMock) -> None:
+    lambda_client.invoke.return_value = rest_response_factory()
+    event = APIGatewayEvent(method="GET", resource_path="/home", headers={"Authz": "yolo"})
+
+    LambdaClient._invoke("test-function", event)  # pylint: disable=protected-access
+
+    assert event["headers"] == {"Authz": "yolo"}
+    payload = json.loads(lambda_client.invoke.call_args.kwargs["Payload"])
+    assert payload["headers"] == {"Authz": "yolo", "X-Amzn-Trace-Id": TRACE_HEADER}
+
+
+def test__request__passes_the_trace_header_of_the_span_in_headers(
+    lambda_client: MagicMock,
+) -> None:
+    lambda_client.invoke.return_value = rest_response_factory()
+    exporter = InMemoryExporter()
+    tracer.set_exporter(exporter)
+
+    LambdaClient.request("test-function", "GET", "/home", headers={"Authz": "yolo"})
+
+    (span,) = exporter.get_spans("lambda.invoke")
+    payload = json.loads(lambda_client.invoke.call_args.kwargs["Payload"])
+    assert payload["headers"] == {"Authz": "yolo", "X-Amzn-Trace-Id": ANY}
+    assert f"Parent={span.span_id}" in payload["headers"]["X-Amzn-Trace-Id"]
+    assert span.attributes == {"function_name": "test-function", "asynchronous": False}
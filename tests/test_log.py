@@ -0,0 +1,114 @@
+import json
+import logging
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lbz.log import (
+    JsonFormatter,
+    SamplingFilter,
+    enable_request_context,
+    get_request_context,
+    is_request_context_enabled,
+    reset_request_context,
+    set_request_context,
+    setup_logging,
+    update_request_context,
+)
+
+
+def make_record(level: int = logging.INFO, **extra: object) -> logging.LogRecord:
+    record = logging.LogRecord("lbz.test", level, __file__, 1, "Hello %s", ("world",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestRequestContext:
+    def test_context_is_restored_by_the_token(self) -> None:
+        token = set_request_context(request_id="1", route="/")
+        update_request_context(user="jane")
+
+        assert get_request_context() == {"request_id": "1", "route": "/", "user": "jane"}
+
+        reset_request_context(token)
+        assert get_request_context() == {}
+
+    def test_is_enabled_by_json_formatter(self) -> None:
+        assert not is_request_context_enabled()
+
+        JsonFormatter()
+
+        assert is_request_context_enabled()
+        enable_request_context(False)
+        assert not is_request_context_enabled()
+
+
+class TestJsonFormatter:
+    def test__format__includes_the_request_context_and_extras(self) -> None:
+        token = set_request_context(request_id="req-1", route="/items")
+        try:
+            output = JsonFormatter().format(make_record(payload={"a": 1}, obj=object))
+        finally:
+            reset_request_context(token)
+
+        document = json.loads(output)
+        assert document.pop("timestamp").endswith("+00:00")
+        assert document == {
+            "level": "INFO",
+            "logger": "lbz.test",
+            "message": "Hello world",
+            "request_id": "req-1",
+            "route": "/items",
+            "payload": {"a": 1},
+            "obj": repr(object),
+        }
+        assert "\n" not in output
+
+    def test__format__includes_the_exception(self) -> None:
+        try:
+            raise ZeroDivisionError
+        except ZeroDivisionError:
+            record = make_record(logging.ERROR)
+            record.exc_info = sys.exc_info()
+
+        document = json.loads(JsonFormatter().format(record))
+
+        assert "ZeroDivisionError" in document["exception"]
+
+
+class TestSamplingFilter:
+    @patch("lbz.log.random.random", side_effect=[0.05, 0.5])
+    def test_keeps_the_given_fraction_of_records(self, _random: MagicMock) -> None:
+        sampling_filter = SamplingFilter(0.1)
+
+        assert sampling_filter.filter(make_record(logging.WARNING))
+        assert not sampling_filter.filter(make_record(logging.WARNING))
+
+    def test_records_above_max_level_always_pass(self) -> None:
+        assert SamplingFilter(0).filter(make_record(logging.ERROR))
+
+    @pytest.mark.parametrize("rate", [-0.1, 1.5])
+    def test_rejects_invalid_rates(self, rate: float) -> None:
+        with pytest.raises(ValueError):
+            SamplingFilter(rate)
+
+
+class TestSetupLogging:
+    def test_adds_stdout_handler_when_there_is_none(self) -> None:
+        with patch.object(logging.getLogger(), "handlers", []):
+            setup_logging()
+
+            (handler,) = logging.getLogger().handlers
+            assert isinstance(handler.formatter, JsonFormatter)
+
+    def test_replaces_previous_sampling_filter(self) -> None:
+        handler = logging.NullHandler()
+        with patch.object(logging.getLogger(), "handlers", [handler]):
+            setup_logging(json_format=False, sampling_rate=0.5)
+            setup_logging(json_format=False, sampling_rate=0.2)
+
+        assert len(handler.filters) == 1
+        assert isinstance(handler.filters[0], SamplingFilter)
+        assert handler.filters[0].rate == 0.2
+        assert handler.formatter is None
@@ -0,0 +1,139 @@
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pytest import LogCaptureFixture
+
+from lbz.metrics import (
+    EMFSink,
+    InMemorySink,
+    PhaseTimer,
+    RequestMetrics,
+    RequestTimings,
+    request_metrics,
+)
+
+
+def timings(total: float = 10.0, **phases: float) -> RequestTimings:
+    return RequestTimings("/items/{id}", "GET", 200, phases, total)
+
+
+class TestRequestTimings:
+    def test__repr__(self) -> None:
+        assert repr(timings(total=1.5)) == (
+            "<RequestTimings GET /items/{id} status=200 total=1.500ms>"
+        )
+
+    def test_unmatched_route_is_named(self) -> None:
+        assert RequestTimings(None, "GET", 404, {}, 1.0).route == "<unmatched>"
+
+
+class TestEMFSink:
+    @patch("lbz.metrics.time.time", return_value=1700000000.123)
+    def test__record__writes_embedded_metric_format_document(self, _time: MagicMock) -> None:
+        stream = io.StringIO()
+
+        EMFSink(namespace="Service", stream=stream).record(timings(total=3.0, handler=2.0))
+
+        assert json.loads(stream.getvalue()) == {
+            "_aws": {
+                "Timestamp": 1700000000123,
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": "Service",
+                        "Dimensions": [["Route", "Method"]],
+                        "Metrics": [
+                            {"Name": "handler_duration", "Unit": "Milliseconds"},
+                            {"Name": "total_duration", "Unit": "Milliseconds"},
+                            {"Name": "cold_start", "Unit": "Count"},
+                        ],
+                    }
+                ],
+            },
+            "Route": "/items/{id}",
+            "Method": "GET",
+            "StatusCode": 200,
+            "handler_duration": 2.0,
+            "total_duration": 3.0,
+            "cold_start": 0,
+        }
+        assert stream.getvalue().count("\n") == 1
+
+    def test__record__writes_to_stdout_by_default(self, capsys: pytest.CaptureFixture) -> None:
+        EMFSink().record(timings())
+
+        assert json.loads(capsys.readouterr().out)["total_duration"] == 10.0
+
+
+class TestInMemorySink:
+    def test__summary__aggregates_every_phase_and_the_total(self) -> None:
+        sink = InMemorySink()
+        for duration in range(1, 21):
+            sink.record(timings(total=duration * 2, handler=float(duration)))
+
+        summary = sink.summary()
+
+        assert summary["handler"] == {
+            "count": 20,
+            "min": 1.0,
+            "max": 20.0,
+            "mean": 10.5,
+            "p50": 10.0,
+            "p95": 19.0,
+        }
+        assert summary["total"]["max"] == 40
+
+    def test__clear__drops_the_records(self) -> None:
+        sink = InMemorySink()
+        sink.record(timings())
+
+        sink.clear()
+
+        assert not sink.records
+        assert not sink.summary()
+
+
+class TestPhaseTimer:
+    @patch("lbz.metrics.time.perf_counter", side_effect=[1.0, 1.001, 1.003, 1.004, 1.010])
+    def test_measures_phases_until_the_next_one_starts(self, _perf_counter: MagicMock) -> None:
+        sink = InMemorySink()
+        timer = PhaseTimer(sink)
+
+        timer.start("authentication")
+        timer.start("handler")
+        timer.start("authentication")
+        timer.finish("/", "GET", 200)
+
+        (recorded,) = sink.records
+        assert recorded.phases == {
+            "authentication": pytest.approx(2.0 + 6.0),
+            "handler": pytest.approx(1.0),
+        }
+        assert recorded.total == pytest.approx(10.0)
+
+    def test_failing_sink_is_logged(self, caplog: LogCaptureFixture) -> None:
+        sink = MagicMock(record=MagicMock(side_effect=RuntimeError))
+
+        PhaseTimer(sink).finish("/", "GET", 200)
+
+        assert "Recording the request metrics" in caplog.text
+
+
+class TestRequestMetrics:
+    def test_is_singleton(self) -> None:
+        assert RequestMetrics() is request_metrics
+
+    def test__timer__is_none_without_sink(self) -> None:
+        assert request_metrics.sink is None
+        assert request_metrics.timer() is None
+
+    def test__timer__records_into_the_sink(self) -> None:
+        sink = InMemorySink()
+        request_metrics.set_sink(sink)
+
+        timer = request_metrics.timer()
+        assert timer is not None
+        timer.finish("/", "GET", 200)
+
+        assert len(sink.records) == 1
@@ -1,11 +1,16 @@
 # coding=utf-8
+import logging
+import sys
 from collections.abc import MutableMapping
+from types import ModuleType
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 from pytest import LogCaptureFixture
 
 from lbz.misc import (
+    LazyModule,
     MultiDict,
     NestedDict,
     Singleton,
@@ -13,6 +18,7 @@ from lbz.misc import (
     deprecated,
     error_catcher,
     get_logger,
+    lazy_exports,
 )
 
 
@@ -67,6 +73,15 @@ def test_get_logger(caplog: LogCaptureFixture) -> None:
         assert "ZeroDivisionError" in caplog.text
 
 
+def test_get_logger_sets_the_level_only_when_it_differs() -> None:
+    get_logger("lbz.test.level")
+
+    with patch.object(logging.Logger, "setLevel") as set_level:
+        get_logger("lbz.test.level")
+
+    set_level.assert_not_called()
+
+
 def test_error_catcher(caplog: LogCaptureFixture) -> None:
     @error_catcher
     def zero_division() -> float:
@@ -209,3 +224,32 @@ def test__deprecated__logs_warning_for_method() -> None:
 
     with pytest.deprecated_call(match=expected_warning):
         SMTH().smth()
+
+
+class TestLazyModule:
+    def test__getattr__imports_the_module_on_first_access(self) -> None:
+        lazy_json = LazyModule("json")
+
+        assert repr(lazy_json) == "<LazyModule json loaded=False>"
+        assert lazy_json.dumps({"a": 1}) == '{"a": 1}'
+        assert repr(lazy_json) == "<LazyModule json loaded=True>"
+
+    def test__getattr__raises_when_attribute_is_missing(self) -> None:
+        with pytest.raises(AttributeError):
+            getattr(LazyModule("json"), "missing")
+
+
+class TestLazyExports:
+    def test__getattr__imports_and_caches_the_exported_name(self) -> None:
+        module = ModuleType("lazy_package")
+        with patch.dict(sys.modules, {"lazy_package": module}):
+            module_getattr = lazy_exports("lazy_package", {"MultiDict": "lbz.misc"})
+
+            assert module_getattr("MultiDict") is MultiDict
+            assert getattr(module, "MultiDict") is MultiDict
+
+    def test__getattr__raises_for_not_exported_names(self) -> None:
+        module_getattr = lazy_exports("lazy_package", {})
+
+        with pytest.raises(AttributeError, match="module 'lazy_package' has no attribute 'x'"):
+            module_getattr("x")
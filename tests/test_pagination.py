@@ -0,0 +1,50 @@
+from os import environ
+from unittest.mock import patch
+
+import pytest
+
+from lbz._cfg import PAGINATION_CURSOR_SECRET
+from lbz.exceptions import MissingConfigValue
+from lbz.pagination import Cursor, decode_cursor, encode_cursor
+
+
+class TestCursor:
+    @pytest.mark.parametrize(
+        "cursor",
+        [Cursor({"pk": "item#1"}), Cursor({"pk": "item#1"}, backward=True), Cursor(1)],
+    )
+    def test_decoding_encoded_cursor_returns_the_same_cursor(self, cursor: Cursor) -> None:
+        token = encode_cursor(cursor)
+
+        assert decode_cursor(token) == cursor
+        assert "=" not in token
+
+    def test_tokens_do_not_expose_the_state_as_plain_text(self) -> None:
+        assert "item" not in encode_cursor(Cursor({"pk": "item#1"}))
+
+    @pytest.mark.parametrize("token", ["", "abc", "e30.AAAA", "e30.ą", "!!.AAAA"])
+    def test_decoding_malformed_token_raises_value_error(self, token: str) -> None:
+        with pytest.raises(ValueError):
+            decode_cursor(token)
+
+    def test_decoding_tampered_token_raises_value_error(self) -> None:
+        token = encode_cursor(Cursor({"pk": "item#1"}))
+        forged = encode_cursor(Cursor({"pk": "item#2"})).split(".")[0]
+
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            decode_cursor(f"{forged}.{token.split('.')[1]}")
+
+    def test_decoding_token_signed_with_other_secret_raises_value_error(self) -> None:
+        token = encode_cursor(Cursor({"pk": "item#1"}))
+
+        with patch.dict(environ, {"PAGINATION_CURSOR_SECRET": "other"}):
+            PAGINATION_CURSOR_SECRET.reset()
+            with pytest.raises(ValueError, match="Invalid pagination cursor"):
+                decode_cursor(token)
+
+    @patch.dict(environ, {}, clear=True)
+    def test_encoding_requires_the_secret(self) -> None:
+        PAGINATION_CURSOR_SECRET.reset()
+
+        with pytest.raises(MissingConfigValue):
+            encode_cursor(Cursor({}))
@@ -0,0 +1,59 @@
+from typing import Any
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+
+import lbz
+from lbz.aws_boto3 import Boto3Client
+from lbz.configuration import EnvValue
+from lbz.prewarm import is_warmer_ping, warmer_ping_aware, warmup
+from lbz.resource import Resource
+
+
+class TestWarmup:
+    def test_is_exported_from_the_package(self) -> None:
+        assert lbz.warmup is warmup
+
+    def test_resolves_config_values_creates_clients_and_warms_up_resources(self) -> None:
+        config_value = EnvValue("LBZ_WARMUP_TEST_VALUE", default="x")
+        resource = MagicMock(spec=Resource)
+
+        with patch.object(Boto3Client, "dynamodb", new_callable=PropertyMock) as mocked_dynamodb:
+            warmup(clients=["dynamodb"], config_values=[config_value], resources=[resource])
+
+        mocked_dynamodb.assert_called_once_with()
+        assert config_value._value == "x"  # pylint: disable=protected-access
+        resource.warmup.assert_called_once_with()
+
+    def test_raises_on_unknown_client(self) -> None:
+        with pytest.raises(AttributeError):
+            warmup(clients=["unknown"])
+
+
+class TestWarmerPing:
+    @pytest.mark.parametrize(
+        "event, expected",
+        [
+            ({"warmer": True}, True),
+            ({"source": "serverless-plugin-warmup"}, True),
+            ({"warmer": "true"}, False),
+            ({"source": "aws.events"}, False),
+            ([], False),
+        ],
+    )
+    def test__is_warmer_ping__detects_warmer_events(self, event: Any, expected: bool) -> None:
+        assert is_warmer_ping(event) is expected
+
+    def test__warmer_ping_aware__short_circuits_warmer_pings(self) -> None:
+        handler = MagicMock(return_value={"statusCode": 200})
+        wrapped = warmer_ping_aware(handler)
+
+        assert wrapped({"warmer": True}, MagicMock()) == {"warmer": True}
+        handler.assert_not_called()
+
+    def test__warmer_ping_aware__passes_other_events_to_the_handler(self) -> None:
+        handler = MagicMock(return_value={"statusCode": 200})
+        context = MagicMock()
+
+        assert warmer_ping_aware(handler)({"path": "/"}, context) == {"statusCode": 200}
+        handler.assert_called_once_with({"path": "/"}, context)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from lbz.handlers import BaseHandler
+from lbz.recording import (
+    REDACTED,
+    EventRecord,
+    InMemoryStore,
+    JSONLinesStore,
+    event_recorder,
+    read_records,
+    redact,
+)
+from lbz.resource import Resource
+from lbz.rest import APIGatewayEvent
+from lbz.type_defs import LambdaContext
+
+
+def test_redact_replaces_sensitive_values_at_any_depth_and_in_json_strings() -> None:
+    event = {
+        "headers": {"Authorization": "Bearer x", "Accept": "*/*"},
+        "body": json.dumps({"user": {"email": "joe@example.com", "id": 1}}),
+        "items": [{"Password": "p"}, "text"],
+        "comment": "{not json",
+    }
+
+    assert redact(event) == {
+        "headers": {"Authorization": REDACTED, "Accept": "*/*"},
+        "body": json.dumps({"user": {"email": REDACTED, "id": 1}}, separators=(",", ":")),
+        "items": [{"Password": REDACTED}, "text"],
+        "comment": "{not json",
+    }
+
+
+def test_resource_records_redacted_events_and_responses(sample_resource: type[Resource]) -> None:
+    store = InMemoryStore()
+    event_recorder.set_store(store, redacted_keys=["authorization", "message"])
+    event = APIGatewayEvent(
+        method="GET", resource_path="/", headers={"Authorization": "secret", "Accept": "*/*"}
+    )
+
+    sample_resource(event)()
+
+    (record,) = store.records
+    assert (record.kind, record.name) == ("resource", "helloworld")
+    assert record.event["headers"] == {"Authorization": REDACTED, "Accept": "*/*"}
+    assert event["headers"]["Authorization"] == "secret"
+    assert record.response["statusCode"] == 200
+    assert record.response["body"] == f'{{"message":"{REDACTED}"}}'
+    assert record.duration > 0
+
+
+def test_handler_records_events_and_responses() -> None:
+    class Handler(BaseHandler[dict]):
+        def handle(self) -> dict:
+            return {"ok": True, "token": "t"}
+
+    store = InMemoryStore()
+    event_recorder.set_store(store)
+
+    Handler({"detail": {"email": "e"}}, MagicMock(spec=LambdaContext)).react()
+
+    (record,) = store.records
+    assert (record.kind, record.name) == ("handler", "Handler")
+    assert record.event == {"detail": {"email": REDACTED}}
+    assert record.response == {"ok": True, "token": REDACTED}
+
+
+def test_events_out_of_the_sample_are_not_recorded(sample_resource: type[Resource]) -> None:
+    store = InMemoryStore()
+    event_recorder.set_store(store, sample_rate=0.5)
+
+    with patch("lbz.recording.random.random", side_effect=[0.7, 0.2]):
+        sample_resource(APIGatewayEvent(method="GET", resource_path="/"))()
+        sample_resource(APIGatewayEvent(method="GET", resource_path="/"))()
+
+    assert len(store.records) == 1
+
+
+def test_failing_store_does_not_break_the_request(sample_resource: type[Resource]) -> None:
+    store = MagicMock(write=MagicMock(side_effect=OSError))
+    event_recorder.set_store(store)
+
+    response = sample_resource(APIGatewayEvent(method="GET", resource_path="/"))()
+
+    assert response.status_code == 200
+    store.write.assert_called_once()
+
+
+def test_json_lines_store_appends_compressed_records(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl.gz"
+    store = JSONLinesStore(path)
+
+    store.write(EventRecord("resource", "a", {"path": "/"}, {"statusCode": 200}, 1.5, "t1"))
+    store.write(EventRecord("handler", "b", {}, None, 2.0, "t2"))
+
+    with gzip.open(path, "rt") as file:
+        assert len(file.readlines()) == 2
+    assert [record.to_dict() for record in read_records(path)] == [
+        {
+            "kind": "resource",
+            "name": "a",
+            "event": {"path": "/"},
+            "response": {"statusCode": 200},
+            "duration": 1.5,
+            "recorded_at": "t1",
+        },
+        {
+            "kind": "handler",
+            "name": "b",
+            "event": {},
+            "response": None,
+            "duration": 2.0,
+            "recorded_at": "t2",
+        },
+    ]
@@ -1,11 +1,12 @@
 # coding=utf-8
 
+from unittest.mock import patch
+
 import pytest
 from multidict import CIMultiDict
 
 from lbz.exceptions import BadRequestError
-from lbz.misc import MultiDict
-from lbz.request import Request
+from lbz.request import Headers, QueryParams, Request
 
 
 class TestRequestInit:
@@ -21,7 +22,7 @@ class TestRequestInit:
             is_base64_encoded=False,
             user=None,
         )
-        assert isinstance(req.query_params, MultiDict)
+        assert isinstance(req.query_params, QueryParams)
         assert isinstance(req.headers, CIMultiDict)
         assert isinstance(req.uri_params, dict)
         assert isinstance(req.uri_params, dict)
@@ -127,3 +128,118 @@ class TestRequestToDict:
             "uri_params": {},
             "user": f"User username={sample_request_with_user.user.username}",  # type: ignore
         }
+
+
+class TestQueryParams:
+    def test_returns_last_values_and_keeps_all_of_them(self) -> None:
+        params = QueryParams({"a": ["1", "2"], "b": ["x"], "empty": []})
+
+        assert dict(params) == {"a": "2", "b": "x"}
+        assert "empty" not in params
+        assert params.getlist("a") == ("1", "2")
+        assert params.lists == {"a": ("1", "2"), "b": ("x",), "empty": ()}
+        assert repr(params) == "QueryParams({'a': ('1', '2'), 'b': ('x',), 'empty': ()})"
+
+    def test_is_read_only(self) -> None:
+        # pylint: disable=unsupported-assignment-operation
+        params = QueryParams({"a": ["1"]})
+
+        with pytest.raises(TypeError):
+            params["a"] = "2"  # type: ignore[index]
+        with pytest.raises(TypeError):
+            params.lists["a"] = ("2",)  # type: ignore[index]
+
+    def test_typed_accessors_convert_values_or_return_defaults(self) -> None:
+        params = QueryParams({"limit": ["5"], "ratio": ["0.5"], "active": ["TRUE"], "ids": ["1"]})
+
+        assert params.get_int("limit") == 5
+        assert params.get_int("offset", 0) == 0
+        assert params.get_float("ratio") == 0.5
+        assert params.get_bool("active") is True
+        assert params.get_bool("deleted") is None
+        assert params.get_list("ids") == ("1",)
+        assert params.get_list("tags") == ()
+
+    @pytest.mark.parametrize(
+        "accessor, message",
+        [
+            ("get_int", "Query parameter 'x' has to be an integer"),
+            ("get_float", "Query parameter 'x' has to be a number"),
+            ("get_bool", "Query parameter 'x' has to be a boolean"),
+        ],
+    )
+    def test_typed_accessors_raise_bad_request_on_invalid_values(
+        self, accessor: str, message: str
+    ) -> None:
+        with pytest.raises(BadRequestError, match=message):
+            getattr(QueryParams({"x": ["abc"]}), accessor)("x")
+
+    def test__original_items__skips_given_keys(self) -> None:
+        params = QueryParams({"a": ["1"], "offset": ["2"], "limit": ["3"]})
+
+        assert params.original_items(keys_to_skip={"offset", "limit"}) == [("a", ("1",))]
+        assert params.original_items() == [("a", ("1",)), ("offset", ("2",)), ("limit", ("3",))]
+
+
+class TestHeaders:
+    def test__getitem__ignores_the_case_of_the_name(self) -> None:
+        headers = Headers({"Content-Type": "application/json", "x-api-key": "key"})
+
+        assert headers["content-type"] == "application/json"
+        assert headers["CoNtEnT-TyPe"] == "application/json"
+        assert headers["X-Api-Key"] == "key"
+        assert headers.get("Origin") is None
+        assert "X-API-KEY" in headers
+        assert "Origin" not in headers
+
+    def test__getitem__prefers_the_last_of_multi_value_headers(self) -> None:
+        headers = Headers({"Accept": "b"}, {"Accept": ["a", "b"], "cookie": ["x=1", "y=2"]})
+
+        assert headers["accept"] == "b"
+        assert headers["Cookie"] == "y=2"
+        assert headers.getall("COOKIE") == ["x=1", "y=2"]
+        assert headers.getall("Accept") == ["a", "b"]
+
+    def test__get__returns_the_default_for_missing_header(self) -> None:
+        headers = Headers({"Accept": "a"}, {"Cookie": []})
+
+        assert headers.get("Origin", "none") == "none"
+        assert headers.get("cookie") is None
+        assert headers.get("ACCEPT") == "a"
+
+    def test_missing_headers_are_not_looked_up_in_the_index(self) -> None:
+        headers = Headers({"X-Custom": "1", "Host": "example.com"}, {"Accept": ["a"]})
+
+        with patch.object(Headers, "_get_index", side_effect=AssertionError):
+            assert headers.get("Authentication") is None
+            assert "X-Amzn-Trace-Id" not in headers
+        assert headers.get("x-CUSTOM") == "1"
+        headers["Authentication"] = "token"
+        assert headers.get("AUTHENTICATION") == "token"
+
+    def test__getall__raises_key_error_for_missing_header(self) -> None:
+        with pytest.raises(KeyError):
+            Headers({"Accept": "a"}).getall("Origin")
+
+    def test_merges_names_of_both_sources_once(self) -> None:
+        headers = Headers({"Host": "example.com", "Accept": "b"}, {"accept": ["a", "b"]})
+
+        assert len(headers) == 2
+        assert dict(headers) == {"Host": "example.com", "accept": "b"}
+
+    def test_event_headers_are_not_copied_until_modified(self) -> None:
+        event_headers = {"Content-Type": "application/json", "origin": "example.com"}
+        headers = Headers(event_headers, {"Origin": ["example.com"]})
+
+        headers["ORIGIN"] = "other.com"
+        del headers["content-type"]
+
+        assert dict(headers) == {"ORIGIN": "other.com"}
+        assert event_headers == {"Content-Type": "application/json", "origin": "example.com"}
+
+    def test__delitem__raises_key_error_for_missing_header(self) -> None:
+        with pytest.raises(KeyError):
+            del Headers()["Origin"]
+
+    def test__repr__(self) -> None:
+        assert repr(Headers({"Accept": "a"})) == "Headers({'Accept': 'a'})"
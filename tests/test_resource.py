@@ -9,16 +9,21 @@ from os import environ
 from typing import Any
 from unittest.mock import ANY, MagicMock, patch
 
+import pytest
 from jose import jwt
 from multidict import CIMultiDict
 from pytest import LogCaptureFixture
 
+from lbz._cfg import CORS_HEADERS, CORS_ORIGIN
 from lbz.authentication import User
 from lbz.collector import AuthzCollector
+from lbz.deadline import Deadline, reset_deadline, set_deadline
 from lbz.events.api import EventAPI
-from lbz.exceptions import NotFound, ServerError
-from lbz.misc import MultiDict
-from lbz.request import Request
+from lbz.exceptions import BadRequestError, NotFound, ServerError
+from lbz.log import enable_request_context, get_request_context
+from lbz.metrics import InMemorySink, request_metrics
+from lbz.pagination import Cursor, encode_cursor
+from lbz.request import QueryParams, Request
 from lbz.resource import (
     ALLOW_ORIGIN_HEADER,
     CORSResource,
@@ -29,6 +34,7 @@ from lbz.resource import (
 from lbz.response import Response
 from lbz.rest import APIGatewayEvent
 from lbz.router import Router, add_route
+from lbz.tracing import InMemoryExporter, tracer
 from tests.fixtures.rsa_pair import SAMPLE_PUBLIC_KEY
 
 # TODO: Use fixtures yielded from conftest.py
@@ -109,11 +115,135 @@ class TestResource:
         }
         get_user.assert_called_once_with({})
 
+    def test_request_headers_merge_multi_value_headers(self) -> None:
+        resource = Resource(
+            {
+                **event,
+                "headers": {"Accept": "text/html", "Origin": "example.com"},
+                "multiValueHeaders": {"Accept": ["application/json", "text/html"]},
+            }
+        )
+
+        assert resource.request.headers["origin"] == "example.com"
+        assert resource.request.headers.getall("accept") == ["application/json", "text/html"]
+
+    def test_request_headers_accept_missing_headers(self) -> None:
+        resource = Resource({**event, "headers": None})
+
+        assert not resource.request.headers
+
     def test_not_found_returned_when_path_not_defined(self) -> None:
         response = Resource(event_wrong_uri)()
         assert isinstance(response, Response)
         assert response.status_code == HTTPStatus.NOT_FOUND
 
+    def test_not_found_does_not_dump_the_router_above_debug_level(
+        self, caplog: LogCaptureFixture
+    ) -> None:
+        with caplog.at_level(logging.INFO, logger="lbz.resource"):
+            Resource(event_wrong_uri)()
+
+        assert "Couldn't find" in caplog.text
+        assert "Current paths" not in caplog.text
+
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_request_context_is_set_while_handling_the_request_once_enabled(
+        self, enabled: bool
+    ) -> None:
+        contexts = []
+
+        class XResource(Resource):
+            @add_route("/")
+            def test_method(self) -> Response:
+                contexts.append(dict(get_request_context()))
+                return Response({})
+
+        enable_request_context(enabled)
+        XResource(event)()
+
+        expected = {"request_id": event["requestContext"]["requestId"], "route": "/"}
+        assert contexts == [{**expected, "method": "GET"} if enabled else {}]
+        assert not get_request_context()
+
+    def test_request_is_traced_continuing_the_trace_header(self) -> None:
+        class XResource(Resource):
+            @add_route("/")
+            def test_method(self) -> Response:
+                return Response({})
+
+        exporter = InMemoryExporter()
+        tracer.set_exporter(exporter)
+        trace_header = "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8"
+
+        XResource({**event, "headers": {"X-Amzn-Trace-Id": trace_header}})()
+
+        assert [span.name for span in exporter.spans] == [
+            "authentication",
+            "handler",
+            "post_request_hook",
+            "resource",
+        ]
+        resource_span = exporter.spans[-1]
+        assert resource_span.parent_id == "53995c3f42cd8ad8"
+        assert resource_span.attributes == {
+            "route": "/",
+            "method": "GET",
+            "cold_start": True,
+            "status_code": 200,
+        }
+        assert exporter.spans[1].attributes == {"endpoint": "test_method"}
+        assert {span.parent_id for span in exporter.spans[:-1]} == {resource_span.span_id}
+
+    def test_untraced_request_creates_no_spans(self) -> None:
+        class XResource(Resource):
+            @add_route("/")
+            def test_method(self) -> Response:
+                return Response({})
+
+        with patch.object(tracer, "extract") as extract, patch.object(tracer, "span") as span:
+            response = XResource(event)()
+
+        assert response.status_code == HTTPStatus.OK
+        extract.assert_not_called()
+        span.assert_not_called()
+
+    def test_phase_durations_are_recorded_when_sink_is_set(self) -> None:
+        class XResource(Resource):
+            @add_route("/")
+            def test_method(self) -> Response:
+                return Response({"message": "x"})
+
+        sink = InMemorySink()
+        request_metrics.set_sink(sink)
+
+        XResource(event)()
+
+        (timings,) = sink.records
+        assert (timings.route, timings.method, timings.status_code) == ("/", "GET", 200)
+        assert list(timings.phases) == [
+            "pre_request_hook",
+            "routing",
+            "authentication",
+            "handler",
+            "post_request_hook",
+        ]
+        assert timings.total >= sum(timings.phases.values())
+
+    def test_error_handling_duration_is_recorded_for_failed_requests(self) -> None:
+        sink = InMemorySink()
+        request_metrics.set_sink(sink)
+
+        Resource(event_wrong_uri)()
+
+        (timings,) = sink.records
+        assert timings.status_code == HTTPStatus.NOT_FOUND
+        assert list(timings.phases) == [
+            "pre_request_hook",
+            "routing",
+            "error_handling",
+            "post_request_hook",
+        ]
+
     def test_request_id_added_when_frameworks_exception_raised(self) -> None:
         class TestAPI(Resource):
             @add_route("/")
@@ -259,6 +389,55 @@ class TestResource:
             "request_id": ANY,
         }
 
+    def test_503_returned_when_deadline_expired_before_the_handler(self) -> None:
+        handler = MagicMock()
+
+        class XResource(Resource):
+            @add_route("/")
+            def test_method(self) -> None:
+                handler()
+
+        token = set_deadline(Deadline(0.1, reserved=0.5))
+        try:
+            resp = XResource(event)()
+        finally:
+            reset_deadline(token)
+
+        handler.assert_not_called()
+        assert resp.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert json.loads(resp.to_dict()["body"]) == {
+            "message": "The request could not be completed in time",
+            "request_id": ANY,
+        }
+
+    def test_503_returned_when_handler_fails_after_deadline_expired(self) -> None:
+        class XResource(Resource):
+            @add_route("/")
+            def test_method(self) -> None:
+                deadline.expires_at -= 10
+                raise TimeoutError("Read timeout")
+
+        deadline = Deadline(5, reserved=0.5)
+        token = set_deadline(deadline)
+        try:
+            resp = XResource(event)()
+        finally:
+            reset_deadline(token)
+
+        assert resp.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+    @patch("lbz.prewarm.warmup")
+    def test__warmup__initializes_declared_clients_and_config_values(
+        self, mocked_warmup: MagicMock
+    ) -> None:
+        class XResource(Resource):
+            warmup_clients = ("dynamodb",)
+            warmup_config_values = (CORS_ORIGIN,)
+
+        XResource.warmup()
+
+        mocked_warmup.assert_called_once_with(clients=("dynamodb",), config_values=(CORS_ORIGIN,))
+
     def test__get_name__uses_custom_name_attribute(self) -> None:
         class XResource(Resource):
             _name = "test"
@@ -334,6 +513,12 @@ class TestCORSResource:
         cors_handler = self.make_cors_handler(origins=["*"], req_origin="http://localhost:3000")
         assert cors_handler.resp_headers_json[ALLOW_ORIGIN_HEADER] == "*"
 
+    @patch("lbz.prewarm.warmup")
+    def test__warmup__resolves_cors_configuration(self, mocked_warmup: MagicMock) -> None:
+        CORSResource.warmup()
+
+        mocked_warmup.assert_called_with(config_values=[CORS_HEADERS, CORS_ORIGIN])
+
     def test_all_headers(self) -> None:
         content_type = "image/jpeg"
 
@@ -410,7 +595,7 @@ class TestPagination:
         self.resource = PaginatedCORSResource({}, [])
         self.resource.path = "/test/path"
         self.resource.urn = "/test/path"
-        req.query_params = MultiDict(
+        req.query_params = QueryParams(
             {
                 "test": ["param"],
                 "another": ["example"],
@@ -432,7 +617,7 @@ class TestPagination:
 
     def test_get_pagination_multifield_query_params(self) -> None:
         expected_prefix = "/test/path?test=param&another=example&another=example2"
-        req.query_params = MultiDict(
+        req.query_params = QueryParams(
             {
                 "test": ["param"],
                 "another": ["example", "example2"],
@@ -459,17 +644,71 @@ class TestPagination:
         assert "next" not in links
 
     def test_pagination_uri_with_existing_pagination_query_params(self) -> None:
-        self.resource.request.query_params = MultiDict({"offset": "3", "limit": "42"})
+        self.resource.request.query_params = QueryParams({"offset": ["3"], "limit": ["42"]})
         expected = "/test/path?offset={offset}&limit={limit}"
         assert self.resource._pagination_uri == expected  # pylint: disable=protected-access
 
     def test_pagination_uri_without_query_params(self) -> None:
-        self.resource.request.query_params = MultiDict({})
+        self.resource.request.query_params = QueryParams({})
         expected = "/test/path?offset={offset}&limit={limit}"
         assert self.resource._pagination_uri == expected  # pylint: disable=protected-access
 
 
+class TestCursorPagination:
+    @patch.object(PaginatedCORSResource, "__init__", return_value=None)
+    def setup_method(self, _test_method: Callable, _init_mock: MagicMock) -> None:
+        # pylint: disable=attribute-defined-outside-init
+        self.resource = PaginatedCORSResource({}, [])
+        self.resource.urn = "/test/path"
+        self.resource.request = req
+        req.query_params = QueryParams({"test": ["param"], "limit": ["5"]})
+
+    def test__get_cursor__returns_none_on_the_first_page(self) -> None:
+        assert self.resource.get_cursor() is None
+
+    def test__get_cursor__decodes_the_cursor_from_the_query(self) -> None:
+        token = encode_cursor(Cursor({"pk": "item#5"}, backward=True))
+        req.query_params = QueryParams({"cursor": [token]})
+
+        assert self.resource.get_cursor() == Cursor({"pk": "item#5"}, backward=True)
+
+    def test__get_cursor__raises_bad_request_on_invalid_cursor(self) -> None:
+        req.query_params = QueryParams({"cursor": ["forged"]})
+
+        with pytest.raises(BadRequestError, match="Invalid pagination cursor"):
+            self.resource.get_cursor()
+
+    def test__get_cursor_pagination__links_pages_without_total_count(self) -> None:
+        current_token = encode_cursor(Cursor({"pk": "item#5"}))
+        req.query_params = QueryParams({"test": ["param"], "cursor": [current_token]})
+
+        pagination = self.resource.get_cursor_pagination(
+            limit=5, next_state={"pk": "item#10"}, prev_state={"pk": "item#6"}
+        )
+
+        next_token = encode_cursor(Cursor({"pk": "item#10"}))
+        prev_token = encode_cursor(Cursor({"pk": "item#6"}, backward=True))
+        assert pagination == {
+            "links": {
+                "current": f"/test/path?test=param&cursor={current_token}&limit=5",
+                "next": f"/test/path?test=param&cursor={next_token}&limit=5",
+                "prev": f"/test/path?test=param&cursor={prev_token}&limit=5",
+            }
+        }
+
+    def test__get_cursor_pagination__skips_missing_pages(self) -> None:
+        pagination = self.resource.get_cursor_pagination(limit=10)
+
+        assert pagination == {"links": {"current": "/test/path?test=param&limit=10"}}
+
+
 class TestEventAwareResource:
+    @patch("lbz.prewarm.warmup")
+    def test__warmup__creates_eventbridge_client(self, mocked_warmup: MagicMock) -> None:
+        EventAwareResource.warmup()
+
+        mocked_warmup.assert_called_with(clients=["eventbridge"])
+
     def test_initializes_completely_new_event_api_when_building_resource(self) -> None:
         class XResource(EventAwareResource):
             pass
@@ -1,9 +1,15 @@
 # coding=utf-8
+# pylint: disable=consider-alternative-union-syntax
 import json
+from dataclasses import dataclass, field
+from typing import Optional
 
 import pytest
 
+from lbz.dev.test import Client
 from lbz.misc import NestedDict
+from lbz.resource import Resource
+from lbz.response import Response
 from lbz.router import Router, add_route
 
 
@@ -63,3 +69,78 @@ class TestAddRoute:
         assert len(router) == 1
         assert router["/"] == {"GET": "random_method"}
         assert router["/"]["GET"] == "random_method"
+
+
+@dataclass
+class Item:
+    name: str
+    quantity: int = 1
+
+
+@dataclass
+class ItemsQuery:
+    limit: int = 10
+    tags: list[str] = field(default_factory=list)
+    active: Optional[bool] = None
+
+
+class ItemsResource(Resource):
+    @add_route("/items", method="POST", body=Item)
+    def create(self, body: Item) -> Response:
+        return Response({"name": body.name, "quantity": body.quantity})
+
+    @add_route("/items", method="GET", query=ItemsQuery)
+    def list(self, query: ItemsQuery) -> Response:
+        return Response({"limit": query.limit, "tags": query.tags, "active": query.active})
+
+
+class TestAddRouteSchemas:
+    def setup_method(self) -> None:
+        # routes are registered when the class is created while the router is cleared after tests
+        Router().add_route("/items", "POST", "create")
+        Router().add_route("/items", "GET", "list")
+        self.client = Client(ItemsResource)  # pylint: disable=attribute-defined-outside-init
+
+    def test_handler_receives_decoded_body(self) -> None:
+        response = self.client.post("/items", body={"name": "x", "quantity": 2})
+
+        assert response.status_code == 200
+        assert json.loads(response.to_dict()["body"]) == {"name": "x", "quantity": 2}
+
+    def test_invalid_body_fields_end_with_unprocessable_entity(self) -> None:
+        response = self.client.post("/items", body={"quantity": "2"})
+
+        assert response.status_code == 422
+        assert json.loads(response.to_dict()["body"])["message"] == (
+            "name: Field required; quantity: Expected integer"
+        )
+
+    def test_body_not_being_an_object_ends_with_bad_request(self) -> None:
+        response = self.client.post("/items", body="[]")  # type: ignore[arg-type]
+
+        assert response.status_code == 400
+        assert json.loads(response.to_dict()["body"])["message"] == "$: Expected object"
+
+    def test_handler_receives_query_converted_to_declared_types(self) -> None:
+        response = self.client.get(
+            "/items", query_params={"limit": "5", "tags": ["a", "b"], "active": "false"}
+        )
+
+        assert response.status_code == 200
+        assert json.loads(response.to_dict()["body"]) == {
+            "limit": 5,
+            "tags": ["a", "b"],
+            "active": False,
+        }
+
+    def test_invalid_query_ends_with_bad_request(self) -> None:
+        response = self.client.get("/items", query_params={"limit": "many"})
+
+        assert response.status_code == 400
+        assert json.loads(response.to_dict()["body"])["message"] == (
+            "Invalid query parameters - limit: Expected integer"
+        )
+
+    def test_schemas_are_compiled_when_route_is_added(self) -> None:
+        with pytest.raises(TypeError, match="Query schema has to be a dataclass or TypedDict"):
+            add_route("/", query=int)
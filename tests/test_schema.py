@@ -0,0 +1,189 @@
+# pylint: disable=consider-alternative-union-syntax
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Literal, Optional, TypedDict, Union
+
+import pytest
+
+from lbz.exceptions import SchemaValidationError
+from lbz.schema import CompiledQuerySchema, CompiledSchema, compile_query_schema, compile_schema
+
+
+class Color(Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+@dataclass
+class Address:
+    city: str
+    zip_code: Optional[str] = None
+
+
+@dataclass
+class Person:
+    name: str
+    age: int
+    address: Address
+    tags: list[str] = field(default_factory=list)
+    color: Color = Color.RED
+
+
+class Item(TypedDict):
+    sku: str
+    quantity: int
+
+
+class Order(TypedDict, total=False):
+    items: list[Item]
+    note: str
+
+
+@dataclass
+class Node:
+    value: int
+    children: list[Node] = field(default_factory=list)
+
+
+@dataclass
+class Unsupported:
+    value: complex
+
+
+@dataclass
+class UnsupportedNode:
+    value: complex
+    children: list[UnsupportedNode] = field(default_factory=list)
+
+
+class TestCompileSchema:
+    def test_returns_the_same_compiled_schema_for_the_same_type(self) -> None:
+        assert compile_schema(Person) is compile_schema(Person)
+        assert isinstance(compile_schema(Person), CompiledSchema)
+
+    def test_raises_on_unsupported_annotations_during_compilation(self) -> None:
+        with pytest.raises(TypeError, match="Unsupported schema type: <class 'complex'>"):
+            compile_schema(Unsupported)
+
+
+class TestCompiledSchema:
+    def test__decode__builds_nested_dataclasses(self) -> None:
+        person = compile_schema(Person).decode(
+            {
+                "name": "Ala",
+                "age": 30,
+                "address": {"city": "Cracow"},
+                "color": "green",
+                "unknown": "ignored",
+            }
+        )
+
+        assert person == Person(
+            name="Ala", age=30, address=Address(city="Cracow"), color=Color.GREEN
+        )
+
+    def test__decode__reports_all_errors_at_once(self) -> None:
+        with pytest.raises(SchemaValidationError) as exc_info:
+            compile_schema(Person).decode(
+                {"age": True, "address": {"zip_code": 1}, "tags": ["a", 2], "color": "blue"}
+            )
+
+        assert exc_info.value.errors == {
+            "name": "Field required",
+            "age": "Expected integer",
+            "address.city": "Field required",
+            "address.zip_code": "Expected string",
+            "tags[1]": "Expected string",
+            "color": "Expected one of: 'red', 'green'",
+        }
+
+    def test__decode__validates_typed_dicts_respecting_required_keys(self) -> None:
+        schema = compile_schema(Order)
+
+        assert schema.decode({}) == {}
+        assert schema.decode({"items": [{"sku": "x", "quantity": 1}]}) == {
+            "items": [{"sku": "x", "quantity": 1}]
+        }
+        with pytest.raises(SchemaValidationError, match=re.escape("items[0].quantity: Field")):
+            schema.decode({"items": [{"sku": "x"}]})
+
+    def test__decode__supports_recursive_schemas(self) -> None:
+        node = compile_schema(Node).decode({"value": 1, "children": [{"value": 2}]})
+
+        assert node == Node(value=1, children=[Node(value=2)])
+
+    def test_failed_recursive_schema_is_not_left_half_compiled(self) -> None:
+        for _ in range(2):
+            with pytest.raises(TypeError, match="Unsupported schema type"):
+                compile_schema(UnsupportedNode)
+
+    def test__decode__reports_root_errors_under_root_path(self) -> None:
+        with pytest.raises(SchemaValidationError) as exc_info:
+            compile_schema(Person).decode([])
+
+        assert exc_info.value.errors == {"$": "Expected object"}
+        assert str(exc_info.value) == "$: Expected object"
+
+    @pytest.mark.parametrize(
+        "schema, value, expected",
+        [
+            (float, 1, 1.0),
+            (Union[int, str], "x", "x"),
+            (Optional[int], None, None),
+            (Literal["a", "b"], "b", "b"),
+            (tuple[int, str], [1, "x"], (1, "x")),
+            (tuple[int, ...], [1, 2], (1, 2)),
+            (set[int], [1, 1], {1}),
+            (dict[str, int], {"a": 1}, {"a": 1}),
+            (Any, object, object),
+        ],
+    )
+    def test__decode__supports_annotations(self, schema: Any, value: Any, expected: Any) -> None:
+        assert CompiledSchema(schema).decode(value) == expected
+
+    @pytest.mark.parametrize(
+        "schema, value, error",
+        [
+            (float, "1", "Expected number"),
+            (Union[int, str], 1.5, "Value does not match any of the allowed types"),
+            (Literal["a", "b"], "c", "Expected one of: 'a', 'b'"),
+            (tuple[int, str], [1], "Expected array of 2 items"),
+            (list[int], {"a": 1}, "Expected array"),
+            (dict[str, int], [], "Expected object"),
+        ],
+    )
+    def test__decode__rejects_invalid_values(self, schema: Any, value: Any, error: str) -> None:
+        with pytest.raises(SchemaValidationError) as exc_info:
+            CompiledSchema(schema).decode(value)
+
+        assert exc_info.value.errors == {"$": error}
+
+
+@dataclass
+class Query:
+    limit: int = 10
+    ratio: float = 1.0
+    active: Optional[bool] = None
+    colors: list[Color] = field(default_factory=list)
+
+
+class TestCompiledQuerySchema:
+    def test_returns_the_same_compiled_schema_for_the_same_type(self) -> None:
+        assert compile_query_schema(Query) is compile_query_schema(Query)
+        assert isinstance(compile_query_schema(Query), CompiledQuerySchema)
+
+    def test__decode_params__converts_strings_into_declared_types(self) -> None:
+        query = compile_query_schema(Query).decode_params(
+            {"limit": ["1", "5"], "ratio": ["0.5"], "active": ["TRUE"], "colors": ["red", "green"]}
+        )
+
+        assert query == Query(limit=5, ratio=0.5, active=True, colors=[Color.RED, Color.GREEN])
+
+    def test__decode_params__reports_values_that_cannot_be_converted(self) -> None:
+        with pytest.raises(SchemaValidationError) as exc_info:
+            compile_query_schema(Query).decode_params({"limit": ["x"], "active": ["maybe"]})
+
+        assert exc_info.value.errors == {"limit": "Expected integer", "active": "Expected boolean"}
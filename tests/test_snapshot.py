@@ -0,0 +1,120 @@
+import sys
+from unittest.mock import MagicMock, patch
+
+from pytest import LogCaptureFixture
+
+from lbz.aws_boto3 import client
+from lbz.aws_secretsmanager import SecretsManager
+from lbz.aws_ssm import SSM
+from lbz.collector import authz_collector
+from lbz.configuration import SecretsManagerValue, SSMValue
+from lbz.events.api import EventAPI
+from lbz.events.event import Event
+from lbz.snapshot import (  # pylint: disable=import-private-name
+    SnapshotHooks,
+    _register_in_runtime,
+    snapshot_hooks,
+)
+
+
+class TestSnapshotHooks:
+    def setup_method(self) -> None:
+        self.hooks = SnapshotHooks()  # pylint: disable=attribute-defined-outside-init
+        self.before = MagicMock()  # pylint: disable=attribute-defined-outside-init
+        self.after = MagicMock()  # pylint: disable=attribute-defined-outside-init
+        self.hooks.register_before_snapshot(self.before)
+        self.hooks.register_after_restore(self.after)
+
+    def teardown_method(self) -> None:
+        self.hooks.unregister(self.before)
+        self.hooks.unregister(self.after)
+
+    def test_is_singleton(self) -> None:
+        assert SnapshotHooks() is snapshot_hooks
+
+    def test__run_before_snapshot__runs_only_before_snapshot_hooks(self) -> None:
+        self.hooks.run_before_snapshot()
+
+        self.before.assert_called_once_with()
+        self.after.assert_not_called()
+
+    def test__run_after_restore__runs_only_after_restore_hooks(self) -> None:
+        self.hooks.run_after_restore()
+
+        self.after.assert_called_once_with()
+        self.before.assert_not_called()
+
+    def test__run_after_restore__runs_remaining_hooks_when_one_fails(
+        self, caplog: LogCaptureFixture
+    ) -> None:
+        failing = self.hooks.register_after_restore(MagicMock(side_effect=ValueError))
+        try:
+            self.hooks.run_before_snapshot()
+            self.hooks.run_after_restore()
+        finally:
+            self.hooks.unregister(failing)
+
+        self.after.assert_called_once_with()
+        assert "Running the snapshot hook" in caplog.text
+
+    def test__unregister__removes_the_hook(self) -> None:
+        self.hooks.unregister(self.after)
+        self.hooks.run_after_restore()
+
+        self.after.assert_not_called()
+
+
+class TestRegisteredHooks:
+    def test_boto3_clients_are_recreated_after_restore(self) -> None:
+        client.reset()
+        with patch("lbz.aws_boto3.boto3") as mocked_boto3:
+            mocked_boto3.client.side_effect = lambda *args, **kwargs: MagicMock()
+            old_client = client.ssm
+            snapshot_hooks.run_after_restore()
+            new_client = client.ssm
+        client.reset()
+
+        assert new_client is not old_client
+        assert mocked_boto3.client.call_count == 2
+
+    def test_ssm_values_are_refreshed_after_restore(self) -> None:
+        ssm_value = SSMValue[str]("param")
+        fetched = [{"param": "old"}, {"param": "new"}]
+
+        with patch.object(SSM, "get_parameters", side_effect=fetched):
+            assert ssm_value.value == "old"
+            snapshot_hooks.run_after_restore()
+            assert ssm_value.value == "new"
+
+    def test_secrets_are_fetched_again_after_restore(self) -> None:
+        secret = SecretsManagerValue[str]("api")
+
+        with patch.object(SecretsManager, "get_secret", side_effect=["old", "new"]):
+            assert secret.value == "old"
+            snapshot_hooks.run_after_restore()
+            assert secret.value == "new"
+
+    def test_request_state_is_cleared_before_snapshot(self) -> None:
+        authz_collector.set_resource("resource")
+        EventAPI().register(Event({"id": 1}, event_type="X"))
+
+        snapshot_hooks.run_before_snapshot()
+
+        assert authz_collector.resource_name == ""
+        assert not EventAPI().pending_events
+
+    def test_event_api_hook_is_registered_once(self) -> None:
+        hooks = repr(snapshot_hooks)
+        EventAPI()._del()  # type: ignore # pylint: disable=protected-access
+        EventAPI()
+
+        assert repr(snapshot_hooks) == hooks
+
+
+def test_hooks_are_registered_in_the_runtime_when_available() -> None:
+    runtime = MagicMock()
+    with patch.dict(sys.modules, {"snapshot_restore_py": runtime}):
+        _register_in_runtime()
+
+    runtime.register_before_snapshot.assert_called_once_with(snapshot_hooks.run_before_snapshot)
+    runtime.register_after_restore.assert_called_once_with(snapshot_hooks.run_after_restore)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from os import environ
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pytest import LogCaptureFixture
+
+from lbz.tracing import (
+    InMemoryExporter,
+    RecordingSpan,
+    Span,
+    TraceContext,
+    Tracer,
+    XRayExporter,
+    tracer,
+)
+
+TRACE_ID = "5759e988bd862e3fe1be46a994272793"
+HEADER = "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8;Sampled=1"
+
+
+@pytest.fixture(name="exporter")
+def exporter_fixture() -> InMemoryExporter:
+    exporter = InMemoryExporter()
+    tracer.set_exporter(exporter)
+    return exporter
+
+
+class TestTraceContext:
+    def test__from_header__parses_xray_header(self) -> None:
+        assert TraceContext.from_header(HEADER) == TraceContext(TRACE_ID, "53995c3f42cd8ad8")
+
+    def test__from_header__reads_the_sampling_decision(self) -> None:
+        context = TraceContext.from_header(f"Root=1-5759e988-{TRACE_ID[8:]};Sampled=0")
+
+        assert context == TraceContext(TRACE_ID, None, sampled=False)
+
+    @pytest.mark.parametrize("header", [None, "", "Root=abc", "Parent=53995c3f42cd8ad8"])
+    def test__from_header__ignores_invalid_headers(self, header: str | None) -> None:
+        assert TraceContext.from_header(header) is None
+
+    def test__to_header__creates_xray_header(self) -> None:
+        assert TraceContext(TRACE_ID, "53995c3f42cd8ad8").to_header() == HEADER
+
+    @patch("lbz.tracing.time.time", return_value=0x5759E988)
+    def test__new__starts_trace_id_with_epoch_time(self, _time: MagicMock) -> None:
+        trace_id = TraceContext.new().trace_id
+
+        assert trace_id.startswith("5759e988")
+        assert len(trace_id) == 32
+
+
+class TestTracer:
+    def test_is_singleton(self) -> None:
+        assert Tracer() is tracer
+
+    def test__span__does_nothing_without_exporter(self) -> None:
+        with tracer.span("anything", attribute=1) as span:
+            span.set_attribute("other", 2)
+
+        assert type(span) is Span  # pylint: disable=unidiomatic-typecheck
+
+    def test__span__nests_spans_of_one_trace(self, exporter: InMemoryExporter) -> None:
+        with tracer.span("outer", TraceContext(TRACE_ID, "53995c3f42cd8ad8")) as outer:
+            with tracer.span("inner", key="value") as inner:
+                pass
+
+        assert exporter.spans == [inner, outer]
+        assert isinstance(inner, RecordingSpan) and isinstance(outer, RecordingSpan)
+        assert (outer.trace_id, outer.parent_id) == (TRACE_ID, "53995c3f42cd8ad8")
+        assert (inner.trace_id, inner.parent_id) == (TRACE_ID, outer.span_id)
+        assert inner.attributes == {"key": "value"}
+        assert inner.duration is not None and inner.duration >= 0
+
+    def test__span__records_the_error(self, exporter: InMemoryExporter) -> None:
+        with pytest.raises(ValueError), tracer.span("failing"):
+            raise ValueError("boom")
+
+        assert exporter.get_spans("failing")[0].error == "ValueError('boom')"
+
+    @patch.dict(environ, {"_X_AMZN_TRACE_ID": HEADER})
+    def test__span__continues_the_lambda_invocation_segment(
+        self, exporter: InMemoryExporter
+    ) -> None:
+        with tracer.span("call"):
+            pass
+
+        assert (exporter.spans[0].trace_id, exporter.spans[0].parent_id) == (
+            TRACE_ID,
+            "53995c3f42cd8ad8",
+        )
+
+    @pytest.mark.usefixtures("exporter")
+    def test__span__starts_new_trace_without_any_parent(self) -> None:
+        with tracer.span("root") as span:
+            assert isinstance(span, RecordingSpan)
+            assert span.parent_id is None
+
+    @patch.dict(environ, {"_X_AMZN_TRACE_ID": HEADER})
+    def test__trace_header__falls_back_to_the_lambda_invocation_segment(self) -> None:
+        assert tracer.trace_header() == HEADER
+
+    @pytest.mark.usefixtures("exporter")
+    def test__trace_header__points_at_the_current_span(self) -> None:
+        with tracer.span("call", TraceContext(TRACE_ID)) as span:
+            assert isinstance(span, RecordingSpan)
+            assert tracer.trace_header() == TraceContext(TRACE_ID, span.span_id).to_header()
+        assert tracer.trace_header() is None
+
+    def test__extract__prefers_the_lambda_invocation_segment(self) -> None:
+        other_header = f"Root=1-00000000-{'0' * 24};Parent=0000000000000000"
+        assert tracer.extract(other_header) == TraceContext("0" * 32, "0" * 16)
+
+        with patch.dict(environ, {"_X_AMZN_TRACE_ID": HEADER}):
+            assert tracer.extract(other_header) == TraceContext(TRACE_ID, "53995c3f42cd8ad8")
+
+    def test_failing_exporter_is_logged(self, caplog: LogCaptureFixture) -> None:
+        tracer.set_exporter(MagicMock(export=MagicMock(side_effect=RuntimeError)))
+
+        with tracer.span("call"):
+            pass
+
+        assert "Exporting the span" in caplog.text
+
+
+class TestXRayExporter:
+    @patch("lbz.tracing.socket.socket")
+    def test__export__sends_subsegment_to_the_daemon(self, socket_mock: MagicMock) -> None:
+        exporter = XRayExporter("169.254.79.129:2000")
+        tracer.set_exporter(exporter)
+
+        with (
+            pytest.raises(RuntimeError),
+            tracer.span("call", TraceContext(TRACE_ID, "53995c3f42cd8ad8"), key="value") as span,
+        ):
+            raise RuntimeError
+
+        data, address = socket_mock.return_value.sendto.call_args.args
+        header, document = data.split(b"\n")
+        assert address == ("169.254.79.129", 2000)
+        assert json.loads(header) == {"format": "json", "version": 1}
+        assert isinstance(span, RecordingSpan)
+        assert json.loads(document) == {
+            "type": "subsegment",
+            "name": "call",
+            "id": span.span_id,
+            "trace_id": "1-5759e988-bd862e3fe1be46a994272793",
+            "parent_id": "53995c3f42cd8ad8",
+            "start_time": span.start_time,
+            "end_time": span.end_time,
+            "fault": True,
+            "metadata": {"lbz": {"key": "value"}},
+            "cause": {"exceptions": [{"message": "RuntimeError()"}]},
+        }
+
+    @patch("lbz.tracing.socket.socket")
+    def test__export__skips_not_sampled_traces(self, socket_mock: MagicMock) -> None:
+        tracer.set_exporter(XRayExporter())
+
+        with tracer.span("call", TraceContext(TRACE_ID, sampled=False)):
+            pass
+
+        socket_mock.return_value.sendto.assert_not_called()